@@ -0,0 +1,78 @@
+"""Benchmark per-document compile time with and without a preamble format.
+
+Needs pdflatex (and the mylatexformat package for the format run). Run
+from the repository root:
+
+    python benchmarks/compile_format.py [--runs N]
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cv_builder.cli import get_package_templates_dir
+from cv_builder.core import build_variant, load_json, run_pdflatex
+from cv_builder.texformat import ensure_format
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def time_compiles(tex_file: Path, template_dir: Path, runs: int, fmt_file=None):
+    """Wall time of ``runs`` single-pass compiles, each in a fresh workdir."""
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            start = time.perf_counter()
+            result = run_pdflatex(
+                tex_file,
+                template_dir,
+                Path(workdir),
+                max_passes=1,
+                fmt_file=fmt_file,
+            )
+            timings.append(time.perf_counter() - start)
+        if not result.ok:
+            sys.exit(f"compile failed: {result.error}\n{result.log[-2000:]}")
+        if fmt_file is not None and not result.used_format:
+            sys.exit("compile with the format failed and fell back to normal")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if shutil.which("pdflatex") is None:
+        sys.exit("pdflatex not found; install TeX Live to run this benchmark")
+
+    template_dir = get_package_templates_dir() / "resume"
+    cv_data = load_json(ROOT / "data" / "resume" / "resume.json")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        tex_file = build_variant(template_dir, tmp, "resume", cv_data)
+
+        start = time.perf_counter()
+        fmt_file = ensure_format(tex_file, template_dir, tmp / "formats")
+        dump_seconds = time.perf_counter() - start
+        if fmt_file is None:
+            sys.exit("could not build the format (is mylatexformat installed?)")
+
+        plain = time_compiles(tex_file, template_dir, args.runs)
+        with_fmt = time_compiles(tex_file, template_dir, args.runs, fmt_file)
+
+    plain_ms = statistics.median(plain) * 1000
+    fmt_ms = statistics.median(with_fmt) * 1000
+    print(f"format dump (once per template): {dump_seconds * 1000:8.0f} ms")
+    print(f"without format (median):         {plain_ms:8.0f} ms")
+    print(f"with format (median):            {fmt_ms:8.0f} ms")
+    print(f"speedup:                         {plain_ms / fmt_ms:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
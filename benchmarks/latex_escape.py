@@ -0,0 +1,77 @@
+"""Benchmark latex_escape against the previous regex implementation.
+
+Run from the repository root:
+
+    python benchmarks/latex_escape.py
+"""
+
+import re
+import timeit
+
+from cv_builder.core import latex_escape
+
+
+def legacy_latex_escape(text: str) -> str:
+    """The regex + replace implementation used before the single-pass scanner."""
+    if not isinstance(text, str):
+        return text
+
+    pattern = r"/latex\{((?:[^{}]|\{(?:[^{}]|\{[^{}]*\})*\})*)\}"
+    raw_sections = []
+
+    def store_raw(match):
+        idx = len(raw_sections)
+        raw_sections.append(match.group(1))
+        return f"\x00\x01{idx}\x02\x00"
+
+    text = re.sub(pattern, store_raw, text)
+    replacements = {
+        "&": r"\&",
+        "%": r"\%",
+        "$": r"\$",
+        "#": r"\#",
+        "_": r"\_",
+        "{": r"\{",
+        "}": r"\}",
+        "~": r"\textasciitilde{}",
+        "^": r"\textasciicircum{}",
+    }
+    for char, escape in replacements.items():
+        text = text.replace(char, escape)
+    for i, raw in enumerate(raw_sections):
+        text = text.replace(f"\x00\x01{i}\x02\x00", raw)
+    return text
+
+
+CASES = {
+    "short field": "Tech Corp & Partners",
+    "long description": (
+        "Designed 100% of the data_pipeline for R&D, cutting costs by $2M; "
+        r"see /latex{\href{https://example.com}{\underline{report}}} #1. "
+    )
+    * 200,
+    "heavy /latex{}": r"Python /latex{\&} SQL /latex{\textbf{x}} ~ " * 500,
+    # Unclosed openings followed by balanced groups: every opening has to be
+    # scanned to the end before it can be rejected.
+    "adversarial braces": "/latex{" * 2000 + "{}" * 2000,
+    "adversarial x4": "/latex{" * 8000 + "{}" * 8000,
+}
+
+
+def main() -> None:
+    print(f"{'case':<22}{'len':>8}{'legacy (us)':>14}{'new (us)':>12}{'speedup':>10}")
+    for name, text in CASES.items():
+        assert latex_escape(text) == legacy_latex_escape(text)
+        number = 20 if len(text) > 10_000 else 2_000
+        legacy = min(
+            timeit.repeat(lambda: legacy_latex_escape(text), number=number, repeat=3)
+        )
+        new = min(timeit.repeat(lambda: latex_escape(text), number=number, repeat=3))
+        print(
+            f"{name:<22}{len(text):>8}{legacy / number * 1e6:>14.1f}"
+            f"{new / number * 1e6:>12.1f}{legacy / new:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark CLI start-up and check it against an import-time budget.
+
+Each scenario runs ``cv-build`` under ``python -X importtime`` in a fresh
+interpreter. The median cumulative import time of ``cv_builder.cli`` is
+compared with ``--budget-ms``, and heavy modules that a scenario must not
+load (e.g. jsonschema for ``--skip-validation``) are reported. Exits with
+status 1 when a scenario is over budget or loads a forbidden module. Run
+from the repository root:
+
+    python benchmarks/startup.py [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINT = "from cv_builder.cli import main; main()"
+SAMPLE = {
+    "personalInfo": {"name": "Ada Lovelace"},
+    "experience": [],
+}
+
+
+def scenarios(data_dir: Path) -> dict[str, tuple[list[str], set[str]]]:
+    """CLI arguments of each scenario and the modules it must not import."""
+    heavy = {"jinja2", "jsonschema", "subprocess", "http.server"}
+    return {
+        "--help": (["--help"], heavy),
+        "argument error": (["--max-passes", "many"], heavy),
+        "missing data file": (["--data", str(data_dir / "missing")], heavy),
+        "render, --skip-validation": (
+            ["--data", str(data_dir), "--skip-validation", "--force"],
+            {"jsonschema", "subprocess", "http.server"},
+        ),
+    }
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[12:].split("|"))
+        if cum.isdigit():
+            cumulative[name] = int(cum)
+    return cumulative
+
+
+def run_once(args: list[str], cwd: Path) -> tuple[float, dict[str, int]]:
+    """Wall time and import times of one ``cv-build`` invocation."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", ENTRY_POINT, *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env=env,
+    )
+    return time.perf_counter() - start, parse_importtime(completed.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=120.0,
+        help="Maximum median import time of cv_builder.cli (default: 120)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        (data_dir / "resume").mkdir(parents=True)
+        (data_dir / "resume" / "resume.json").write_text(json.dumps(SAMPLE))
+
+        for name, (cli_args, forbidden) in scenarios(data_dir).items():
+            walls, imports, loaded = [], [], set()
+            for _ in range(args.runs):
+                wall, modules = run_once(cli_args, Path(tmp))
+                walls.append(wall)
+                imports.append(modules.get("cv_builder.cli", 0))
+                loaded |= forbidden & modules.keys()
+            import_ms = statistics.median(imports) / 1000
+            over = import_ms > args.budget_ms
+            failed |= over or bool(loaded)
+            results[name] = {
+                "wall_ms": round(statistics.median(walls) * 1000, 1),
+                "cli_import_ms": round(import_ms, 1),
+                "forbidden_loaded": sorted(loaded),
+                "over_budget": over,
+            }
+
+    if args.json:
+        print(json.dumps({"budget_ms": args.budget_ms, "results": results}, indent=2))
+    else:
+        print(f"{'scenario':<28}{'wall (ms)':>10}{'import (ms)':>13}  notes")
+        for name, result in results.items():
+            notes = []
+            if result["over_budget"]:
+                notes.append(f"over {args.budget_ms:g} ms budget")
+            if result["forbidden_loaded"]:
+                notes.append("loaded " + ", ".join(result["forbidden_loaded"]))
+            print(
+                f"{name:<28}{result['wall_ms']:>10.1f}"
+                f"{result['cli_import_ms']:>13.1f}  {'; '.join(notes) or 'ok'}"
+            )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
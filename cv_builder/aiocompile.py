@@ -0,0 +1,214 @@
+"""asyncio counterpart of the pdflatex driver.
+
+Compiles run as asyncio subprocesses, so async services can await them
+without tying up threads. Each job has a wall-clock timeout; on timeout or
+cancellation the whole pdflatex process group is killed. Console output
+can be streamed to a log file as it arrives; only its tail is kept in
+memory.
+"""
+
+import asyncio
+import os
+import signal
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from .core import (
+    COMPILE_FAILED,
+    DEFAULT_MAX_PASSES,
+    CompileResult,
+    add_failed_attempt,
+    aux_digest,
+    cached_preamble_format,
+    format_failed,
+    install_outputs,
+    next_pass,
+    pdflatex_command,
+    scratch_root,
+    texinputs_env,
+)
+from .texformat import format_env
+
+DEFAULT_TIMEOUT = 120.0
+# Console output kept in memory per pass; pdflatex prints its rerun
+# requests at the end
+LOG_TAIL_BYTES = 64 * 1024
+
+
+def _kill_group(proc: asyncio.subprocess.Process) -> None:
+    """Kill pdflatex and anything it spawned (its own session)."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:  # pragma: no cover - Windows
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _run_pass(
+    command: list[str], build_dir: Path, env: dict, log_file: Path | None
+) -> tuple[int, str]:
+    """Run one pass, appending its console output to ``log_file`` if given.
+
+    Returns the exit status and the last ``LOG_TAIL_BYTES`` of the output.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=build_dir,
+        env=env,
+        start_new_session=True,
+    )
+    tail = bytearray()
+    out = open(log_file, "ab") if log_file is not None else None
+    try:
+        while chunk := await proc.stdout.read(1 << 16):
+            if out is not None:
+                out.write(chunk)
+                out.flush()
+            tail += chunk
+            del tail[:-LOG_TAIL_BYTES]
+        returncode = await proc.wait()
+    except BaseException:
+        # Timed out or cancelled: don't leave pdflatex running
+        _kill_group(proc)
+        await proc.wait()
+        raise
+    finally:
+        if out is not None:
+            out.close()
+    return returncode, tail.decode("utf-8", errors="replace")
+
+
+async def _passes(
+    result: CompileResult,
+    build_dir: Path,
+    env: dict,
+    fmt_file: Path | None,
+    max_passes: int,
+    log_file: Path | None,
+) -> None:
+    tex_file = result.tex_file
+    aux = aux_digest(build_dir, tex_file.stem)
+    draft = False
+    while draft is not None:
+        command = pdflatex_command(tex_file, build_dir, fmt_file, draft)
+        returncode, result.log = await _run_pass(command, build_dir, env, log_file)
+        result.passes += 1
+        if returncode != 0:
+            result.error = COMPILE_FAILED
+            return
+        draft, aux = next_pass(result, build_dir, aux, draft, max_passes)
+
+
+async def compile_async(
+    tex_file: Path,
+    template_dir: Path,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    fmt_file: Path | None = None,
+    keep_log: bool = False,
+    timeout: float | None = DEFAULT_TIMEOUT,
+    log_file: Path | None = None,
+) -> CompileResult:
+    """Compile a .tex file to PDF like ``core.run_pdflatex``, asynchronously.
+
+    ``timeout`` bounds the wall-clock time of all passes together; when it
+    expires pdflatex's process group is killed and an error result is
+    returned. Cancelling the awaiting task kills it too, then re-raises.
+    Console output of every pass is appended to ``log_file`` when given;
+    ``result.log`` holds the tail of the last pass. Outputs are installed
+    on a worker thread, as that waits for the output directory lock.
+    """
+    start = time.perf_counter()
+    tex_file = tex_file.resolve()
+    result = CompileResult(tex_file=tex_file)
+    max_passes = max(1, max_passes)
+
+    env = texinputs_env(template_dir, tex_file.parent)
+    if fmt_file is not None:
+        env = format_env(fmt_file, env)
+        result.used_format = True
+
+    with tempfile.TemporaryDirectory(
+        prefix="cv-build-", dir=scratch_root()
+    ) as scratch:
+        build_dir = Path(scratch).resolve()
+        try:
+            await asyncio.wait_for(
+                _passes(result, build_dir, env, fmt_file, max_passes, log_file),
+                timeout,
+            )
+        except FileNotFoundError:
+            result.error = "pdflatex not found. Install TeX Live or MacTeX."
+        except asyncio.TimeoutError:
+            result.error = f"Compilation timed out after {timeout:g}s"
+
+        if format_failed(result):
+            elapsed = time.perf_counter() - start
+            remaining = None if timeout is None else max(0.0, timeout - elapsed)
+            fallback = await compile_async(
+                tex_file,
+                template_dir,
+                max_passes,
+                keep_log=keep_log,
+                timeout=remaining,
+                log_file=log_file,
+            )
+            return add_failed_attempt(fallback, result, start)
+
+        install = asyncio.ensure_future(
+            asyncio.to_thread(install_outputs, result, build_dir, keep_log)
+        )
+        try:
+            await asyncio.shield(install)
+        except asyncio.CancelledError:
+            await install  # finish before the scratch directory goes
+            raise
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+async def compile_many_async(
+    tex_files: Iterable[Path],
+    template_dir: Path,
+    jobs: int | None = None,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    preamble_format: bool = False,
+    keep_log: bool = False,
+    timeout: float | None = DEFAULT_TIMEOUT,
+    semaphore: asyncio.Semaphore | None = None,
+) -> list[CompileResult]:
+    """Compile many .tex files with at most ``jobs`` pdflatex runs at once.
+
+    Pass a shared ``semaphore`` to bound compiles across several calls
+    (``jobs`` is then ignored). Results are in the order of ``tex_files``;
+    unexpected errors end up in the result's ``error``, so one document
+    never aborts the rest.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, jobs or os.cpu_count() or 1))
+
+    async def job(tex_file: Path) -> CompileResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                fmt_file = None
+                if preamble_format:
+                    fmt_file = await asyncio.to_thread(
+                        cached_preamble_format, tex_file, template_dir
+                    )
+                return await compile_async(
+                    tex_file, template_dir, max_passes, fmt_file, keep_log, timeout
+                )
+            except Exception as e:
+                return CompileResult(
+                    tex_file=tex_file,
+                    error=f"{type(e).__name__}: {e}",
+                    seconds=time.perf_counter() - start,
+                )
+
+    return list(await asyncio.gather(*(job(tex_file) for tex_file in tex_files)))
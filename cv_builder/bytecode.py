@@ -0,0 +1,67 @@
+"""Size-bounded on-disk cache of compiled Jinja2 template bytecode."""
+
+import os
+from pathlib import Path
+
+from jinja2 import FileSystemBytecodeCache
+
+
+class BoundedBytecodeCache(FileSystemBytecodeCache):
+    """On-disk Jinja bytecode cache with a total size cap.
+
+    Entries are touched when loaded, and the least recently used ones are
+    deleted whenever a new entry pushes the cache above ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = 64 * 1024 * 1024,
+        pattern: str = "__cv_builder_%s.cache",
+    ) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory), pattern)
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return Path(self.directory) / (self.pattern % key)
+
+    def load_bytecode(self, bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            try:
+                os.utime(self._entry(bucket.key))
+            except OSError:
+                pass
+
+    def dump_bytecode(self, bucket) -> None:
+        super().dump_bytecode(bucket)
+        self.prune()
+
+    def prune(self) -> int:
+        """Evict least recently used entries above the size cap.
+
+        Returns the number of entries removed.
+        """
+        entries = []
+        for path in Path(self.directory).glob(self.pattern % "*"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -1,10 +1,45 @@
 """CLI entry point for CV Builder."""
 
 import argparse
+import contextlib
 import sys
+import tempfile
+import time
 from pathlib import Path
 
-from .core import build_variant, compile_pdf, load_json, validate_cv
+from .core import (
+    DEFAULT_ESCAPE_CACHE_SIZE,
+    DEFAULT_MAX_PASSES,
+    DEFAULT_STREAM_BUFFER,
+    batch_output_files,
+    build_batch,
+    build_variant,
+    compile_many,
+    compile_pdf,
+    configure_escape_cache,
+    default_bytecode_cache_dir,
+    default_pdf_cache_dir,
+    describe_passes,
+    enable_bytecode_cache,
+    enable_pdf_cache,
+    escape_cache_stats,
+    find_data_files,
+    get_validator,
+    load_json,
+    validate_cv,
+)
+from .manifest import ManifestStore, file_digest
+from .ndjson import DEFAULT_NAME_KEY, RejectLog, build_ndjson, is_ndjson
+from .sinks import archive_kind, open_sink
+from .timings import Timings, profiled, timed
+from .viewmodel import LazyView
+
+# The serve and watch modules (http.server, watchfiles) are imported by the
+# commands that use them; these mirror serve.DEFAULT_HOST and DEFAULT_PORT.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_PDF_CACHE_MIB = 512
+MIB = 1024 * 1024
 
 
 def get_package_templates_dir() -> Path:
@@ -12,18 +47,183 @@ def get_package_templates_dir() -> Path:
     return Path(__file__).parent / "templates"
 
 
-def main() -> None:
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
-        prog="cv-build",
-        description="Build CV variant from JSON data and Jinja2 templates",
-    )
-    parser.add_argument(
+def _add_common_arguments(
+    parser: argparse.ArgumentParser, subcommand: bool = False
+) -> None:
+    """Options shared by the single build and the batch command.
+
+    On a ``subcommand`` parser the options have no defaults, so options
+    given before the subcommand (``cv-build --compile batch ...``) are
+    kept instead of being reset.
+    """
+
+    def add(*names, **kwargs) -> None:
+        if subcommand:
+            kwargs["default"] = argparse.SUPPRESS
+        parser.add_argument(*names, **kwargs)
+
+    add(
         "--template",
         "-t",
         default="resume",
-        help="Template to build (default: resume)",
+        help="Template(s) to build, comma-separated (default: resume)",
+    )
+    add(
+        "--compile",
+        "-c",
+        action="store_true",
+        help="Compile to PDF after generating",
+    )
+    add(
+        "--max-passes",
+        type=int,
+        default=DEFAULT_MAX_PASSES,
+        metavar="N",
+        help=(
+            "Maximum pdflatex passes when the log asks for a rerun "
+            f"(default: {DEFAULT_MAX_PASSES}). Passes from the third up to "
+            "the last but one skip writing the PDF (-draftmode), so draft "
+            "passes need N >= 4"
+        ),
+    )
+    add(
+        "--keep-log",
+        action="store_true",
+        help="Keep the pdflatex .log next to the PDF",
+    )
+    add(
+        "--preamble-format",
+        action="store_true",
+        help=(
+            "Compile against a cached precompiled format of the template "
+            "preamble (needs mylatexformat; falls back to a normal compile)"
+        ),
+    )
+    add(
+        "--skip-validation",
+        action="store_true",
+        help="Skip JSON schema validation",
+    )
+    add(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Rebuild even if the build manifest says outputs are up to date",
+    )
+    add(
+        "--plan",
+        "--dry-run",
+        dest="plan",
+        action="store_true",
+        help="Show what would be rebuilt and why, without building",
+    )
+    add(
+        "--watch",
+        "-w",
+        action="store_true",
+        help="Keep running and rebuild whenever the data or template changes",
+    )
+    add(
+        "--bytecode-cache",
+        nargs="?",
+        type=Path,
+        const=default_bytecode_cache_dir(),
+        default=None,
+        metavar="DIR",
+        help=(
+            "Cache compiled templates on disk "
+            "(default DIR: ~/.cache/cv-builder/bytecode)"
+        ),
+    )
+    add(
+        "--pdf-cache",
+        nargs="?",
+        type=Path,
+        const=default_pdf_cache_dir(),
+        default=None,
+        metavar="DIR",
+        help=(
+            "Reuse the PDF of any document compiled before with the same "
+            ".tex, styles and TeX version (default DIR: ~/.cache/cv-builder/pdf)"
+        ),
+    )
+    add(
+        "--pdf-cache-size",
+        type=int,
+        default=DEFAULT_PDF_CACHE_MIB,
+        metavar="MIB",
+        help=(
+            "Evict least recently used PDFs above MIB mebibytes "
+            f"(default: {DEFAULT_PDF_CACHE_MIB})"
+        ),
+    )
+    add(
+        "--escape-cache-size",
+        type=int,
+        default=DEFAULT_ESCAPE_CACHE_SIZE,
+        metavar="N",
+        help=(
+            "Remember the LaTeX escaping of up to N distinct strings; "
+            f"0 disables (default: {DEFAULT_ESCAPE_CACHE_SIZE})"
+        ),
+    )
+    add(
+        "--timings",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="FILE",
+        help=(
+            "Report wall and CPU time per stage and document "
+            "(load, validate, render, write, compile); "
+            "prints a table, or writes JSON to FILE"
+        ),
+    )
+    add(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=Path("cv-build.prof"),
+        default=None,
+        metavar="FILE",
+        help=(
+            "Profile the run with cProfile (default FILE: cv-build.prof) "
+            "and report peak traced memory"
+        ),
+    )
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser whose options with an optional value skip subcommands.
+
+    ``cv-build --timings batch src`` would otherwise time into a file named
+    ``batch``; such an option directly before a subcommand name is given
+    its ``const`` explicitly instead.
+    """
+
+    def parse_known_args(self, args=None, namespace=None):
+        args = sys.argv[1:] if args is None else list(args)
+        commands, optional = set(), {}
+        for action in self._actions:
+            if action.nargs == argparse.PARSER:
+                commands.update(action.choices)
+            elif action.nargs == argparse.OPTIONAL and action.option_strings:
+                optional.update(dict.fromkeys(action.option_strings, action))
+        for i, arg in enumerate(args[:-1]):
+            if arg in commands:
+                break
+            if arg in optional and args[i + 1] in commands:
+                args[i] = f"{arg}={optional[arg].const}"
+        return super().parse_known_args(args, namespace)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for ``cv-build``."""
+    parser = _ArgumentParser(
+        prog="cv-build",
+        description="Build CV variant from JSON data and Jinja2 templates",
     )
+    _add_common_arguments(parser)
     parser.add_argument(
         "--data",
         "-d",
@@ -32,59 +232,690 @@ def main() -> None:
         help="Path to data directory (default: ./data)",
     )
     parser.add_argument(
-        "--compile",
-        "-c",
-        action="store_true",
-        help="Compile to PDF after generating",
+        "--data-file",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help=(
+            "One data file for every template "
+            "(default: <data>/<template>/<template>.json)"
+        ),
     )
     parser.add_argument(
+        "--all-templates",
+        action="store_true",
+        help="Build every template in the package",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="Build many CV data files through one warm pipeline",
+        description=(
+            "Render every JSON data file matched by SOURCE with one template. "
+            "The schema and template are loaded once for the whole batch."
+        ),
+    )
+    batch.add_argument(
+        "source",
+        help=(
+            "Data file, directory (searched recursively), glob pattern, "
+            "or an NDJSON file (.ndjson/.jsonl) with one CV per line"
+        ),
+    )
+    _add_common_arguments(batch, subcommand=True)
+    batch.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=None,
+        help=(
+            "Output directory (default: next to each data file), an archive "
+            "(.tar, .tar.gz, .tar.zst, .zip) to collect every output in, "
+            "or '-' to stream the documents to stdout"
+        ),
+    )
+    batch.add_argument(
+        "--buffer-size",
+        type=int,
+        default=DEFAULT_STREAM_BUFFER,
+        metavar="N",
+        help=(
+            "Render in chunks of about N characters "
+            f"(default: {DEFAULT_STREAM_BUFFER})"
+        ),
+    )
+    batch.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Parallel pdflatex jobs with --compile (default: CPU count)",
+    )
+    batch.add_argument(
+        "--name-key",
+        default=DEFAULT_NAME_KEY,
+        metavar="KEY",
+        help=(
+            "NDJSON input: dotted key that names each output "
+            f"(default: {DEFAULT_NAME_KEY})"
+        ),
+    )
+    batch.add_argument(
+        "--reject",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help=(
+            "NDJSON input: where to write rejected records with their line "
+            "numbers (default: <source>.rejects.ndjson)"
+        ),
+    )
+
+    server = subparsers.add_parser(
+        "serve",
+        help="Run a render daemon on a local HTTP port or Unix socket",
+        description=(
+            "Keep templates and validators warm and render CV JSON posted to "
+            "/render/<template> (add ?format=pdf for a PDF). "
+            "GET /health reports status."
+        ),
+    )
+    server.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Address to listen on (default: {DEFAULT_HOST})",
+    )
+    server.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"TCP port to listen on (default: {DEFAULT_PORT})",
+    )
+    server.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Listen on a Unix socket instead of TCP",
+    )
+    server.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Maximum concurrent renders and compiles (default: CPU count)",
+    )
+    # Also top-level options: no defaults here, so values given before
+    # the subcommand (``cv-build --skip-validation serve``) are kept
+    server.add_argument(
+        "--max-passes",
+        type=int,
+        default=argparse.SUPPRESS,
+        metavar="N",
+        help=f"Maximum pdflatex passes (default: {DEFAULT_MAX_PASSES})",
+    )
+    server.add_argument(
+        "--preamble-format",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Compile against cached precompiled preamble formats",
+    )
+    server.add_argument(
         "--skip-validation",
         action="store_true",
+        default=argparse.SUPPRESS,
         help="Skip JSON schema validation",
     )
-    args = parser.parse_args()
 
-    templates_dir = get_package_templates_dir()
-    data_dir = args.data
+    precompile = subparsers.add_parser(
+        "precompile",
+        help="Compile the package templates to Python modules ahead of time",
+        description=(
+            "Compile every template under the package templates directory "
+            "into importable modules (or a zip), which later runs import "
+            "instead of compiling the templates while they are newer than "
+            "the sources."
+        ),
+    )
+    precompile.add_argument(
+        "--template",
+        "-t",
+        default=None,
+        help="Template(s) to compile, comma-separated (default: all)",
+    )
+    precompile.add_argument(
+        "--zip",
+        action="store_true",
+        help="Write one zip per template instead of a module directory",
+    )
+    precompile.add_argument(
+        "--clean",
+        action="store_true",
+        help="Remove compiled templates instead of writing them",
+    )
 
-    # Paths for this template
-    template_variant_dir = templates_dir / args.template
-    data_variant_dir = data_dir / args.template
-    data_file = data_variant_dir / f"{args.template}.json"
-    schema_file = template_variant_dir / "schema.json"
+    cache = subparsers.add_parser(
+        "cache",
+        help="Show, prune or clear the cache of compiled PDFs",
+        description=(
+            "Manage the content-addressed PDF cache used with --pdf-cache: "
+            "'stats' shows its size, 'prune' evicts least recently used "
+            "PDFs above --max-size, 'clear' deletes every PDF."
+        ),
+    )
+    cache.add_argument("action", choices=["stats", "prune", "clear"])
+    cache.add_argument(
+        "--dir",
+        type=Path,
+        default=None,
+        help="Cache directory (default: ~/.cache/cv-builder/pdf)",
+    )
+    cache.add_argument(
+        "--max-size",
+        type=int,
+        default=None,
+        metavar="MIB",
+        help=f"Size to prune to (default: {DEFAULT_PDF_CACHE_MIB})",
+    )
 
-    if not template_variant_dir.exists():
-        print(f"✗ Template '{args.template}' not found at {template_variant_dir}")
+    return parser
+
+
+def run_precompile(args: argparse.Namespace) -> None:
+    """Compile (or with --clean remove) ahead-of-time template modules."""
+    from .precompiled import clean_compiled, precompile_template
+
+    if args.template is None:
+        args.all_templates = True
+    failed = False
+    for name in template_names(args):
+        template_dir = get_package_templates_dir() / name
+        if not (template_dir / "template.tex.j2").exists():
+            print(f"✗ Template not found: {name}")
+            failed = True
+            continue
+        if args.clean:
+            for path in clean_compiled(template_dir):
+                print(f"✓ Removed {path}")
+            continue
+        try:
+            target = precompile_template(template_dir, zip=args.zip)
+        except Exception as e:  # e.g. a TemplateSyntaxError
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+            failed = True
+            continue
+        print(f"✓ Compiled {name} -> {target}")
+    if failed:
         sys.exit(1)
 
+
+def run_cache(args: argparse.Namespace) -> None:
+    """Show, prune or clear the PDF cache."""
+    from .pdfcache import PdfCache
+
+    max_size = DEFAULT_PDF_CACHE_MIB if args.max_size is None else args.max_size
+    cache = PdfCache(args.dir or default_pdf_cache_dir(), max_size * MIB)
+    if args.action == "stats":
+        stats = cache.stats()
+        print(f"PDF cache: {stats['directory']}")
+        print(
+            f"  {stats['entries']} PDF(s), {stats['bytes'] / MIB:.1f} MiB "
+            f"of {stats['max_bytes'] / MIB:.0f} MiB"
+        )
+    elif args.action == "prune":
+        removed, freed = cache.prune()
+        print(f"✓ Pruned {removed} PDF(s), {freed / MIB:.1f} MiB freed")
+    else:
+        print(f"✓ Removed {cache.clear()} PDF(s) from {cache.directory}")
+
+
+def run_serve(args: argparse.Namespace) -> None:
+    """Run the render daemon until interrupted."""
+    from .serve import RenderService, serve
+
+    service = RenderService(
+        get_package_templates_dir(),
+        workers=args.workers,
+        validate=not args.skip_validation,
+        max_passes=args.max_passes,
+        preamble_format=args.preamble_format,
+    )
+    try:
+        serve(service, args.host, args.port, args.socket)
+    except FileExistsError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+
+def run_watch(
+    args: argparse.Namespace,
+    template_dir: Path,
+    documents: list[tuple[Path, Path]],
+) -> None:
+    """Rebuild ``documents`` on every change until interrupted."""
+    from .watch import WatchSession
+
+    session = WatchSession(
+        template_dir,
+        documents,
+        validate=not args.skip_validation,
+        compile=args.compile,
+        max_passes=args.max_passes,
+        preamble_format=args.preamble_format,
+        keep_log=args.keep_log,
+    )
+    print(f"Watching {len(documents)} document(s), press Ctrl+C to stop")
+    try:
+        session.run()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def template_names(args: argparse.Namespace) -> list[str]:
+    """Templates selected by ``--template a,b,c`` or ``--all-templates``."""
+    if getattr(args, "all_templates", False):
+        return sorted(
+            path.parent.name
+            for path in get_package_templates_dir().glob("*/template.tex.j2")
+        )
+    names = [name.strip() for name in args.template.split(",")]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class _SharedInputs:
+    """Data parsed once per file and validated once per distinct schema.
+
+    Templates rendering the same data file also share its view model.
+    """
+
+    def __init__(self, timings: Timings | None = None) -> None:
+        self._data: dict[Path, dict] = {}
+        self._views: dict[Path, LazyView] = {}
+        self._valid: dict[tuple[Path, str], bool] = {}
+        self.timings = timings
+
+    def load(self, data_file: Path) -> dict:
+        key = data_file.resolve()
+        if key not in self._data:
+            with timed(self.timings, "load", str(data_file)):
+                self._data[key] = load_json(data_file)
+        return self._data[key]
+
+    def view(self, data_file: Path) -> LazyView:
+        key = data_file.resolve()
+        if key not in self._views:
+            self._views[key] = LazyView(self.load(data_file))
+        return self._views[key]
+
+    def validate(self, data_file: Path, schema_file: Path) -> bool:
+        key = (data_file.resolve(), file_digest(schema_file))
+        if key in self._valid:
+            if self._valid[key]:
+                print("✓ CV data validates against schema (already checked)")
+            else:
+                print("✗ Schema validation failed (see errors above)")
+        else:
+            cv_data = self.load(data_file)
+            with timed(self.timings, "validate", str(data_file)):
+                self._valid[key] = validate_cv(cv_data, get_validator(schema_file))
+        return self._valid[key]
+
+
+def _template_paths(
+    args: argparse.Namespace, template: str
+) -> tuple[Path, Path, Path] | None:
+    """Template dir, data file and output file of a template, if they exist."""
+    template_variant_dir = get_package_templates_dir() / template
+    data_variant_dir = args.data / template
+    data_file = args.data_file or data_variant_dir / f"{template}.json"
+
+    if not template_variant_dir.exists():
+        print(f"✗ Template '{template}' not found at {template_variant_dir}")
+        return None
+
     if not data_file.exists():
         print(f"✗ Data file not found at {data_file}")
-        sys.exit(1)
+        return None
+
+    return template_variant_dir, data_file, data_variant_dir / f"{template}.tex"
+
+
+def _build_template(
+    args: argparse.Namespace, template: str, shared: _SharedInputs
+) -> bool:
+    """Build ``<data>/<template>/<template>.tex``; returns False on failure."""
+    paths = _template_paths(args, template)
+    if paths is None:
+        return False
+    template_variant_dir, data_file, output_file = paths
+    data_variant_dir = output_file.parent
+    schema_file = template_variant_dir / "schema.json"
+
+    # Incremental build: skip if every input is unchanged
+    manifest = ManifestStore(template_variant_dir, require_pdf=args.compile)
+    reason = "forced" if args.force else manifest.stale_reason(data_file, output_file)
+    if args.plan:
+        if reason is None:
+            print(f"Up to date: {output_file}")
+        else:
+            print(f"Would rebuild: {output_file} ({reason})")
+        return True
+    if reason is None:
+        print(f"✓ {output_file} is up to date")
+        return True
 
     # Ensure data directory exists (for output)
     data_variant_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load data
-    print(f"Building template: {args.template}")
-    cv_data = load_json(data_file)
+    # Load data (once per file across templates)
+    print(f"Building template: {template}")
+    cv_data = shared.load(data_file)
 
-    # Validate
-    if not args.skip_validation:
-        schema = load_json(schema_file)
-        if not validate_cv(cv_data, schema):
-            sys.exit(1)
+    # Validate (once per data file and schema)
+    if not args.skip_validation and not shared.validate(data_file, schema_file):
+        return False
 
     # Build
     tex_file = build_variant(
-        template_variant_dir, data_variant_dir, args.template, cv_data
+        template_variant_dir,
+        data_variant_dir,
+        template,
+        cv_data,
+        shared.timings,
+        view=shared.view(data_file),
     )
+    manifest.record(data_file, tex_file)
 
-    # Compile
+    # Compile (pdflatex's CPU time is not the CLI's, so only wall time counts)
+    ok = True
     if args.compile:
-        if not compile_pdf(tex_file, template_variant_dir):
+        with timed(shared.timings, "compile", str(tex_file), cpu=False):
+            ok = compile_pdf(
+                tex_file,
+                template_variant_dir,
+                args.max_passes,
+                args.preamble_format,
+                args.keep_log,
+            )
+        if ok:
+            manifest.record_pdf(tex_file)
+
+    manifest.save()
+    return ok
+
+
+def run_build(args: argparse.Namespace, timings: Timings | None = None) -> None:
+    """Build ``<data>/<template>/<template>.json`` for each selected template.
+
+    The data is parsed once per file and validated once per distinct schema,
+    however many templates render it. Stage times are recorded in
+    ``timings``: loading and validation under the data file, the rest under
+    each output .tex.
+    """
+    templates = template_names(args)
+    if not templates:
+        print(f"✗ No templates found in {get_package_templates_dir()}")
+        sys.exit(1)
+
+    if args.watch:
+        if len(templates) > 1:
+            print("✗ --watch builds one template at a time")
+            sys.exit(1)
+        paths = _template_paths(args, templates[0])
+        if paths is None:
+            sys.exit(1)
+        template_variant_dir, data_file, output_file = paths
+        run_watch(args, template_variant_dir, [(data_file, output_file)])
+        return
+
+    shared = _SharedInputs(timings)
+    results = [_build_template(args, template, shared) for template in templates]
+    if not all(results):
+        sys.exit(1)
+    if not args.plan:
+        print("\nDone!")
+
+
+def run_batch(
+    args: argparse.Namespace, stream=None, timings: Timings | None = None
+) -> None:
+    """Build every data file matched by ``args.source``.
+
+    An NDJSON source is streamed record by record instead; failed records
+    go to a reject file. With a binary ``stream`` the documents are written
+    to it instead of files, and with an archive ``--output`` every output
+    is appended to that archive. Stage times of every document are
+    recorded in ``timings``.
+    """
+    if stream is not None and (args.compile or args.watch):
+        print("✗ --compile and --watch need an output directory, not '-'")
+        sys.exit(1)
+
+    if "," in args.template or getattr(args, "all_templates", False):
+        print("✗ batch builds one template at a time")
+        sys.exit(1)
+    template_variant_dir = get_package_templates_dir() / args.template
+    if not template_variant_dir.exists():
+        print(f"✗ Template '{args.template}' not found at {template_variant_dir}")
+        sys.exit(1)
+
+    ndjson = is_ndjson(args.source)
+    if ndjson and (args.watch or args.plan):
+        print("✗ --watch and --plan need JSON data files, not NDJSON")
+        sys.exit(1)
+
+    data_files = [Path(args.source)] if ndjson else find_data_files(args.source)
+    if not data_files:
+        print(f"✗ No data files found for {args.source}")
+        sys.exit(1)
+
+    archive = args.output if archive_kind(args.output or "") else None
+    if archive is not None and (args.watch or args.plan):
+        print("✗ --watch and --plan need an output directory, not an archive")
+        sys.exit(1)
+
+    if args.watch:
+        output_files = batch_output_files(data_files, args.output)
+        run_watch(args, template_variant_dir, list(zip(data_files, output_files)))
+        return
+
+    manifest = ManifestStore(template_variant_dir, require_pdf=args.compile)
+    output_dir = args.output
+    sink = None
+    staging = contextlib.nullcontext()
+    if archive is not None:
+        # Outputs are named below a scratch directory, where the .tex files
+        # are also kept for pdflatex with --compile
+        staging = tempfile.TemporaryDirectory(prefix="cv-build-")
+        output_dir = Path(staging.name)
+        try:
+            sink = open_sink(archive, output_dir, keep_files=args.compile)
+        except ImportError as e:
+            staging.cleanup()
+            print(f"✗ {e}")
             sys.exit(1)
+        manifest = None
+    if args.plan:
+        stale = 0
+        for data_file, output_file in zip(
+            data_files, batch_output_files(data_files, args.output)
+        ):
+            if stream is not None:
+                output_file, reason = "stdout", "streamed"
+            elif args.force:
+                reason = "forced"
+            else:
+                reason = manifest.stale_reason(data_file, output_file)
+            if reason is not None:
+                stale += 1
+                print(f"Would rebuild: {data_file} -> {output_file} ({reason})")
+        print(f"\n{stale} to rebuild, {len(data_files) - stale} up to date")
+        return
+
+    rejects = None
+    if ndjson:
+        source = data_files[0]
+        rejects = RejectLog(args.reject or source.with_suffix(".rejects.ndjson"))
+        print(f"Building records of {source} with template: {args.template}")
+        results = build_ndjson(
+            template_variant_dir,
+            source,
+            output_dir=output_dir,
+            name_key=args.name_key,
+            validate=not args.skip_validation,
+            rejects=rejects,
+            stream=stream,
+            buffer_size=args.buffer_size,
+            timings=timings,
+            sink=sink,
+        )
+    else:
+        print(
+            f"Building {len(data_files)} document(s) with template: {args.template}"
+        )
+        results = build_batch(
+            template_variant_dir,
+            data_files,
+            output_dir=output_dir,
+            validate=not args.skip_validation,
+            manifest=manifest,
+            force=args.force,
+            stream=stream,
+            buffer_size=args.buffer_size,
+            timings=timings,
+            sink=sink,
+        )
+
+    start = time.perf_counter()
+    built = []  # kept only to compile them, so NDJSON runs stay flat
+    succeeded = 0
+    total = 0
+    skipped = 0
+    failed = 0
+    # The sink is closed (the archive finished) before staging is removed
+    with staging, sink or contextlib.nullcontext():
+        with rejects or contextlib.nullcontext():
+            for result in results:
+                total += 1
+                if result.skipped:
+                    skipped += 1
+                    print(f"- {result.label}: up to date")
+                elif result.ok:
+                    succeeded += 1
+                    if args.compile:
+                        built.append(result.output)
+                    note = "" if result.changed else ", unchanged"
+                    if result.output is None:
+                        location = "stdout"
+                    elif sink is not None:
+                        location = sink.location(result.output)
+                    else:
+                        location = result.output
+                    print(
+                        f"✓ {result.label} -> {location} "
+                        f"({result.seconds * 1000:.1f} ms{note})"
+                    )
+                else:
+                    failed += 1
+                    print(f"✗ {result.label}: {result.error}")
+        if rejects is not None and rejects.count:
+            print(f"{rejects.count} record(s) rejected, see {rejects.path}")
+
+        if args.compile and built:
+            print(f"\nCompiling {len(built)} document(s)...")
+            for tex_file, result in zip(
+                built,
+                compile_many(
+                    built,
+                    template_variant_dir,
+                    jobs=args.jobs,
+                    max_passes=args.max_passes,
+                    preamble_format=args.preamble_format,
+                    keep_log=args.keep_log,
+                    sink=sink,
+                ),
+            ):
+                if timings is not None:
+                    document = str(tex_file)
+                    if sink is not None:
+                        document = sink.location(tex_file)
+                    timings.add("compile", document, result.seconds)
+                if result.ok:
+                    if manifest is not None:
+                        manifest.record_pdf(result.tex_file)
+                    location = result.pdf_file
+                    if sink is not None:
+                        location = sink.location(result.pdf_file)
+                    print(
+                        f"✓ Compiled {location} "
+                        f"({result.seconds:.1f} s, {describe_passes(result)})"
+                    )
+                else:
+                    failed += 1
+                    print(f"✗ {result.tex_file}: {result.error}")
+                    if result.log:
+                        print(result.log[-2000:])
+    if sink is not None:
+        print(f"✓ Wrote {len(sink.entries)} file(s) and a manifest to {archive}")
+
+    if manifest is not None:
+        manifest.save()
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"\nBuilt {succeeded}/{total} document(s) in {elapsed:.2f}s "
+        f"({rate:.1f} docs/s), {skipped} up to date, {failed} failed"
+    )
+    if failed:
+        sys.exit(1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main CLI entry point."""
+    args = build_parser().parse_args(argv)
+
+    if args.bytecode_cache:
+        enable_bytecode_cache(args.bytecode_cache)
+    if args.escape_cache_size != DEFAULT_ESCAPE_CACHE_SIZE:
+        configure_escape_cache(args.escape_cache_size)
+    pdf_cache = None
+    if args.pdf_cache:
+        pdf_cache = enable_pdf_cache(args.pdf_cache, args.pdf_cache_size * MIB)
+
+    stream = None
+    messages = contextlib.nullcontext()
+    if args.command == "batch" and args.output == Path("-"):
+        # Documents go to stdout, so progress messages go to stderr
+        stream = sys.stdout.buffer
+        messages = contextlib.redirect_stdout(sys.stderr)
 
-    print("\nDone!")
+    timings = Timings() if args.timings else None
+    profile = profiled(args.profile) if args.profile else contextlib.nullcontext()
+    with messages, profile:
+        try:
+            if args.command == "batch":
+                run_batch(args, stream, timings)
+            elif args.command == "serve":
+                run_serve(args)
+            elif args.command == "precompile":
+                run_precompile(args)
+            elif args.command == "cache":
+                run_cache(args)
+            else:
+                run_build(args, timings)
+        finally:
+            # Also report when the build fails (sys.exit) part-way
+            if timings is not None and timings.records:
+                timings.counters["escape cache"] = escape_cache_stats()
+                if pdf_cache is not None:
+                    timings.counters["pdf cache"] = {
+                        "hits": pdf_cache.hits,
+                        "misses": pdf_cache.misses,
+                    }
+                timings.report(args.timings)
 
 
 if __name__ == "__main__":
@@ -1,82 +1,260 @@
-"""Core CV building functionality."""
+"""Core CV building functionality.
 
-import json
-import subprocess
+jinja2, jsonschema and subprocess are imported by the functions that use
+them, so the CLI starts without loading them for ``--help``, argument
+errors or (for jsonschema) ``--skip-validation`` builds.
+"""
+
+import functools
+import glob
+import os
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
-import jsonschema
-from jinja2 import Environment, FileSystemLoader
+from .jsonio import load_json
+from .outputs import install_file, write_chunks_if_changed
+from .timings import timed, timed_render
 
+if TYPE_CHECKING:
+    import subprocess
 
-def load_json(path: Path) -> dict:
-    """Load and parse JSON file."""
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    import jsonschema
+    from jinja2 import BytecodeCache, Environment, Template
 
+    from .bytecode import BoundedBytecodeCache
+    from .manifest import ManifestStore
+    from .pdfcache import PdfCache
+    from .sinks import OutputSink
+    from .timings import Timings
+    from .viewmodel import LazyView
 
-def validate_cv(cv_data: dict, schema: dict) -> bool:
-    """Validate CV data against JSON schema."""
-    try:
-        jsonschema.validate(instance=cv_data, schema=schema)
+
+def __getattr__(name: str):
+    # BoundedBytecodeCache subclasses a jinja2 class; load it on first use
+    if name == "BoundedBytecodeCache":
+        from .bytecode import BoundedBytecodeCache
+
+        return BoundedBytecodeCache
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_validator(schema: dict) -> "jsonschema.protocols.Validator":
+    """Build a reusable validator for a schema.
+
+    The schema itself is checked once here, and a format checker is
+    attached so ``format`` keywords (e.g. ``email``) are enforced.
+    """
+    import jsonschema
+
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema, format_checker=jsonschema.FormatChecker())
+
+
+# Process-wide cache: resolved schema path -> ((mtime, size), validator)
+_VALIDATOR_CACHE: dict[
+    Path, tuple[tuple[int, int], "jsonschema.protocols.Validator"]
+] = {}
+_VALIDATOR_CACHE_LOCK = threading.Lock()
+
+
+def get_validator(schema_file: Path) -> "jsonschema.protocols.Validator":
+    """Return the cached validator for a ``schema.json`` file.
+
+    The validator is rebuilt only when the file's mtime or size changes.
+    """
+    key = schema_file.resolve()
+    st = key.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _VALIDATOR_CACHE_LOCK:
+        cached = _VALIDATOR_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    validator = create_validator(load_json(key))
+    with _VALIDATOR_CACHE_LOCK:
+        _VALIDATOR_CACHE[key] = (stamp, validator)
+    return validator
+
+
+def collect_validation_errors(
+    cv_data: dict, validator: "jsonschema.protocols.Validator"
+) -> "list[jsonschema.ValidationError]":
+    """Collect every schema error of a document in a single pass."""
+    return sorted(
+        validator.iter_errors(cv_data),
+        key=lambda e: [str(p) for p in e.absolute_path],
+    )
+
+
+def format_validation_error(error: "jsonschema.ValidationError") -> str:
+    """One-line description of a validation error including its path."""
+    path = " -> ".join(str(p) for p in error.absolute_path)
+    return f"{error.message} (at {path})" if path else error.message
+
+
+def validate_cv(
+    cv_data: dict, schema: "dict | jsonschema.protocols.Validator"
+) -> bool:
+    """Validate CV data against JSON schema.
+
+    ``schema`` is either the schema itself or a validator from
+    ``get_validator``/``create_validator``. All errors are reported.
+    """
+    validator = create_validator(schema) if isinstance(schema, dict) else schema
+    errors = collect_validation_errors(cv_data, validator)
+    if not errors:
         print("✓ CV data validates against schema")
         return True
-    except jsonschema.ValidationError as e:
-        print(f"✗ Schema validation failed: {e.message}")
-        print(f"  Path: {' -> '.join(str(p) for p in e.absolute_path)}")
-        return False
+
+    print(f"✗ Schema validation failed with {len(errors)} error(s):")
+    for e in errors:
+        print(f"  - {e.message}")
+        print(f"    Path: {' -> '.join(str(p) for p in e.absolute_path)}")
+    return False
+
+
+# Character escapes for text outside /latex{...} sections. Chained
+# str.replace calls are C-level scans and beat str.translate, which does a
+# Python dict lookup per character once any mapping is longer than one char.
+_LATEX_ESCAPES = (
+    ("&", r"\&"),
+    ("%", r"\%"),
+    ("$", r"\$"),
+    ("#", r"\#"),
+    ("_", r"\_"),
+    ("{", r"\{"),
+    ("}", r"\}"),
+    ("~", r"\textasciitilde{}"),
+    ("^", r"\textasciicircum{}"),
+)
+_LATEX_RAW_OPEN = "/latex{"
+_BRACE_PATTERN = re.compile(r"[{}]")
+
+
+def _matching_braces(text: str) -> dict[int, int]:
+    """Map the index of every balanced ``{`` to its matching ``}``."""
+    closing = {}
+    stack = []
+    for index in [m.start() for m in _BRACE_PATTERN.finditer(text)]:
+        if text[index] == "{":
+            stack.append(index)
+        elif stack:
+            closing[stack.pop()] = index
+    return closing
+
+
+def _escape_text(text: str) -> str:
+    """Escape special characters in text without raw sections."""
+    for char, escape in _LATEX_ESCAPES:
+        if char in text:
+            text = text.replace(char, escape)
+    return text
 
 
 def latex_escape(text: str) -> str:
     """Escape special LaTeX characters.
 
     Supports raw LaTeX passthrough using /latex{...} syntax.
-    Content inside /latex{...} will not be escaped.
+    Content inside /latex{...} will not be escaped. Braces inside the raw
+    section may be nested to any depth; an unbalanced /latex{ is escaped
+    like ordinary text.
 
     Example:
         "Python /latex{\\&} SQL" -> "Python & SQL"
         "Use /latex{\\textbf{bold}} text" -> "Use \\textbf{bold} text"
     """
-    import re
+    if not isinstance(text, str):
+        return text
+
+    start = text.find(_LATEX_RAW_OPEN)
+    if start == -1:
+        return _escape_text(text)
+
+    # Single left-to-right pass: text between raw sections is escaped,
+    # raw sections are copied verbatim. No placeholders, no restore passes.
+    closing = _matching_braces(text)
+    parts = []
+    pos = 0
+    while start != -1:
+        brace = start + len(_LATEX_RAW_OPEN) - 1
+        end = closing.get(brace)
+        if end is None:
+            start = text.find(_LATEX_RAW_OPEN, brace + 1)
+            continue
+        parts.append(_escape_text(text[pos:start]))
+        parts.append(text[brace + 1 : end])
+        pos = end + 1
+        start = text.find(_LATEX_RAW_OPEN, pos)
+    parts.append(_escape_text(text[pos:]))
+    return "".join(parts)
 
+
+DEFAULT_ESCAPE_CACHE_SIZE = 8192
+# Long strings (descriptions, bullet points) rarely repeat verbatim; they
+# are escaped directly so the memo's memory stays bounded.
+DEFAULT_ESCAPE_MAX_LENGTH = 200
+
+_escape_memo = functools.lru_cache(maxsize=DEFAULT_ESCAPE_CACHE_SIZE)(latex_escape)
+_escape_max_length = DEFAULT_ESCAPE_MAX_LENGTH
+_escape_bypassed = 0
+
+
+def cached_latex_escape(text: str) -> str:
+    """``latex_escape`` through a process-wide LRU memo.
+
+    Names, companies, locations and skills repeat across the documents of
+    a batch, so most escapes become a dictionary lookup. Strings longer
+    than the configured maximum length bypass the memo.
+    """
+    global _escape_bypassed
     if not isinstance(text, str):
         return text
+    if len(text) <= _escape_max_length:
+        return _escape_memo(text)
+    _escape_bypassed += 1
+    return latex_escape(text)
+
 
-    # Pattern to match /latex{...} with balanced braces (up to two levels deep),
-    # so nested commands like \href{url}{\underline{text}} pass through unescaped.
-    pattern = r"/latex\{((?:[^{}]|\{(?:[^{}]|\{[^{}]*\})*\})*)\}"
-
-    # Find all raw LaTeX sections and store them with placeholders
-    raw_sections = []
-
-    def store_raw(match):
-        idx = len(raw_sections)
-        raw_sections.append(match.group(1))
-        # Use null bytes as placeholder - won't appear in normal text
-        return f"\x00\x01{idx}\x02\x00"
-
-    # Replace raw LaTeX sections with placeholders
-    text = re.sub(pattern, store_raw, text)
-
-    # Escape the remaining text
-    replacements = {
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\textasciicircum{}",
+def configure_escape_cache(
+    maxsize: int = DEFAULT_ESCAPE_CACHE_SIZE,
+    max_length: int = DEFAULT_ESCAPE_MAX_LENGTH,
+) -> None:
+    """Resize the escape memo (0 disables it) and reset its counters."""
+    global _escape_memo, _escape_max_length, _escape_bypassed
+    _escape_memo = functools.lru_cache(maxsize=max(0, maxsize))(latex_escape)
+    _escape_max_length = max_length
+    _escape_bypassed = 0
+
+
+def escape_cache_stats() -> dict:
+    """Hit, miss and bypass counters of the escape memo.
+
+    Counts are process-wide; the bypass count is approximate when several
+    threads render at once.
+    """
+    info = _escape_memo.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "bypassed": _escape_bypassed,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "max_length": _escape_max_length,
     }
-    for char, escape in replacements.items():
-        text = text.replace(char, escape)
 
-    # Restore raw LaTeX sections
-    for i, raw in enumerate(raw_sections):
-        text = text.replace(f"\x00\x01{i}\x02\x00", raw)
 
-    return text
+def clear_escape_cache() -> None:
+    """Empty the escape memo and reset its counters."""
+    global _escape_bypassed
+    _escape_memo.cache_clear()
+    _escape_bypassed = 0
 
 
 def format_date_range(start: str, end: str | None) -> str:
@@ -101,10 +279,27 @@ def get_responsibilities(item: dict) -> list:
     return [r["value"] for r in responsibilities if r.get("inResume", True)]
 
 
-def create_jinja_env(variant_dir: Path) -> Environment:
-    """Create Jinja2 environment with custom filters."""
+def create_jinja_env(
+    variant_dir: Path,
+    bytecode_cache: "BytecodeCache | None" = None,
+    precompiled: bool = True,
+) -> "Environment":
+    """Create Jinja2 environment with custom filters.
+
+    With ``precompiled``, templates compiled ahead of time by
+    ``cv-build precompile`` are imported when newer than their sources.
+    """
+    from jinja2 import Environment, FileSystemLoader
+
+    if precompiled:
+        from .precompiled import template_loader
+
+        loader = template_loader(variant_dir)
+    else:
+        loader = FileSystemLoader(variant_dir)
     env = Environment(
-        loader=FileSystemLoader(variant_dir),
+        loader=loader,
+        bytecode_cache=bytecode_cache,
         autoescape=False,  # LaTeX, not HTML
         block_start_string="<%",
         block_end_string="%>",
@@ -117,7 +312,7 @@ def create_jinja_env(variant_dir: Path) -> Environment:
     )
 
     # Custom filters
-    env.filters["latex"] = latex_escape
+    env.filters["latex"] = cached_latex_escape
     env.filters["date_range"] = lambda item: format_date_range(
         item.get("startDate", ""), item.get("endDate")
     )
@@ -127,57 +322,860 @@ def create_jinja_env(variant_dir: Path) -> Environment:
     return env
 
 
+def get_cache_dir() -> Path:
+    """Root directory for persistent caches.
+
+    ``$CV_BUILDER_CACHE_DIR`` wins, then ``$XDG_CACHE_HOME/cv-builder``,
+    then ``~/.cache/cv-builder``.
+    """
+    if os.environ.get("CV_BUILDER_CACHE_DIR"):
+        return Path(os.environ["CV_BUILDER_CACHE_DIR"])
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "cv-builder"
+
+
+# Process-wide cache: resolved template dir -> (fingerprint, environment)
+_ENV_CACHE: dict[Path, tuple[tuple, "Environment"]] = {}
+_ENV_CACHE_LOCK = threading.Lock()
+_bytecode_cache: "BytecodeCache | None" = None
+
+
+def default_bytecode_cache_dir() -> Path:
+    """``<cache dir>/bytecode``."""
+    return get_cache_dir() / "bytecode"
+
+
+def enable_bytecode_cache(
+    directory: Path | None = None, max_bytes: int = 64 * 1024 * 1024
+) -> "BoundedBytecodeCache":
+    """Persist compiled template bytecode on disk (opt-in).
+
+    Defaults to ``default_bytecode_cache_dir()``. Cold processes then skip
+    template compilation as long as the template source is unchanged.
+    """
+    from .bytecode import BoundedBytecodeCache
+
+    global _bytecode_cache
+    cache = BoundedBytecodeCache(directory or default_bytecode_cache_dir(), max_bytes)
+    with _ENV_CACHE_LOCK:
+        _bytecode_cache = cache
+        _ENV_CACHE.clear()
+    return cache
+
+
+def disable_bytecode_cache() -> None:
+    """Stop using the on-disk bytecode cache."""
+    global _bytecode_cache
+    with _ENV_CACHE_LOCK:
+        _bytecode_cache = None
+        _ENV_CACHE.clear()
+
+
+_pdf_cache: "PdfCache | None" = None
+
+
+def default_pdf_cache_dir() -> Path:
+    """``<cache dir>/pdf``."""
+    return get_cache_dir() / "pdf"
+
+
+def enable_pdf_cache(
+    directory: Path | None = None, max_bytes: int | None = None
+) -> "PdfCache":
+    """Reuse compiled PDFs of identical documents (opt-in).
+
+    Defaults to ``default_pdf_cache_dir()``. Compiles then look up the
+    rendered .tex, template styles and engine version before running
+    pdflatex, and store what they produce.
+    """
+    from .pdfcache import DEFAULT_MAX_BYTES, PdfCache
+
+    global _pdf_cache
+    _pdf_cache = PdfCache(
+        directory or default_pdf_cache_dir(),
+        DEFAULT_MAX_BYTES if max_bytes is None else max_bytes,
+    )
+    return _pdf_cache
+
+
+def disable_pdf_cache() -> None:
+    """Always run pdflatex again."""
+    global _pdf_cache
+    _pdf_cache = None
+
+
+def pdf_cache() -> "PdfCache | None":
+    """The PDF cache in use, if any."""
+    return _pdf_cache
+
+
+def clear_template_cache() -> None:
+    """Drop every cached Jinja environment and compiled template."""
+    with _ENV_CACHE_LOCK:
+        _ENV_CACHE.clear()
+
+
+def _template_fingerprint(template_dir: Path) -> tuple:
+    """Names, mtimes and sizes of the files in a template directory."""
+    try:
+        paths = sorted(template_dir.iterdir())
+    except OSError:
+        return ()
+    entries = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((path.name, st.st_mtime_ns, st.st_size))
+    return tuple(entries)
+
+
+def get_jinja_env(template_dir: Path) -> "Environment":
+    """Return the cached Jinja environment for a template directory.
+
+    The same environment (and therefore the same compiled templates) is
+    returned until a file in the directory changes.
+    """
+    key = template_dir.resolve()
+    fingerprint = _template_fingerprint(key)
+    with _ENV_CACHE_LOCK:
+        cached = _ENV_CACHE.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        env = create_jinja_env(template_dir, bytecode_cache=_bytecode_cache)
+        # The fingerprint already tracks changes; skip per-render stat calls.
+        env.auto_reload = False
+        _ENV_CACHE[key] = (fingerprint, env)
+        return env
+
+
+def load_template(template_dir: Path) -> "Template":
+    """Load the compiled ``template.tex.j2`` of a template directory."""
+    return get_jinja_env(template_dir).get_template("template.tex.j2")
+
+
+def render_context(cv_data: dict, view: "LazyView | None" = None) -> dict:
+    """Template variables: the data as ``cv`` and its view model as ``view``.
+
+    The view is built on first use; pass the same ``view`` to renders of
+    the same data to build it once.
+    """
+    if view is None:
+        from .viewmodel import LazyView
+
+        view = LazyView(cv_data)
+    return {"cv": cv_data, "view": view}
+
+
+def render_variant(
+    template: "Template", cv_data: dict, view: "LazyView | None" = None
+) -> str:
+    """Render an already loaded template with CV data."""
+    return template.render(render_context(cv_data, view))
+
+
+DEFAULT_STREAM_BUFFER = 64 * 1024
+
+
+def iter_rendered(
+    template: "Template",
+    cv_data: dict,
+    buffer_size: int = DEFAULT_STREAM_BUFFER,
+    view: "LazyView | None" = None,
+) -> Iterator[bytes]:
+    """Render a template incrementally as UTF-8 chunks.
+
+    Output of ``template.generate()`` is gathered into chunks of about
+    ``buffer_size`` characters, so the whole document is never held in
+    memory at once.
+    """
+    pending: list[str] = []
+    size = 0
+    for piece in template.generate(render_context(cv_data, view)):
+        pending.append(piece)
+        size += len(piece)
+        if size >= buffer_size:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def stream_variant(
+    template: "Template",
+    cv_data: dict,
+    out: BinaryIO,
+    buffer_size: int = DEFAULT_STREAM_BUFFER,
+) -> int:
+    """Render straight into a binary stream (stdout, a pipe, an archive member).
+
+    Each chunk is flushed as soon as it is produced so consumers can start
+    before rendering finishes. Returns the number of bytes written.
+    """
+    return _write_stream(out, iter_rendered(template, cv_data, buffer_size))
+
+
+def _write_stream(out: BinaryIO, chunks: Iterable[bytes]) -> int:
+    written = 0
+    for chunk in chunks:
+        out.write(chunk)
+        out.flush()
+        written += len(chunk)
+    return written
+
+
 def build_variant(
-    template_dir: Path, output_dir: Path, variant_name: str, cv_data: dict
+    template_dir: Path,
+    output_dir: Path,
+    variant_name: str,
+    cv_data: dict,
+    timings: "Timings | None" = None,
+    sink: "OutputSink | None" = None,
+    view: "LazyView | None" = None,
 ) -> Path:
-    """Render a variant template with CV data."""
-    env = create_jinja_env(template_dir)
-    template = env.get_template("template.tex.j2")
+    """Render a variant template with CV data.
 
-    # Render
-    output = template.render(cv=cv_data)
+    The document goes to ``sink`` (e.g. an archive) if one is given.
+    ``view`` is the data's view model when it is shared with other renders.
+    """
+    template = load_template(template_dir)
 
-    # Write output to output directory
+    # Render into the output directory (left alone if unchanged)
     output_file = output_dir / f"{variant_name}.tex"
-    output_file.write_text(output, encoding="utf-8")
-
-    print(f"✓ Generated {output_file}")
+    with timed_render(
+        timings, str(output_file), iter_rendered(template, cv_data, view=view)
+    ) as chunks:
+        if sink is not None:
+            changed = sink.write(output_file, chunks, source=variant_name)
+        else:
+            changed = write_chunks_if_changed(output_file, chunks)
+    location = output_file if sink is None else sink.location(output_file)
+    if changed:
+        print(f"✓ Generated {location}")
+    else:
+        print(f"✓ Generated {location} (unchanged)")
     return output_file
 
 
-def compile_pdf(tex_file: Path, template_dir: Path) -> bool:
-    """Compile LaTeX to PDF using pdflatex."""
-    tex_file = tex_file.resolve()
-    output_dir = tex_file.parent.resolve()
-    print(f"  Compiling {tex_file.name}...")
+@dataclass
+class BuildResult:
+    """Outcome of building a single document in a batch."""
 
-    # Copy .sty file to output directory for compilation
-    import shutil
-    for sty_file in template_dir.glob("*.sty"):
-        shutil.copy(sty_file, output_dir / sty_file.name)
+    source: Path
+    output: Path | None = None
+    error: str | None = None
+    seconds: float = 0.0
+    skipped: bool = False
+    changed: bool = False
+    reason: str | None = None
+    line: int | None = None
 
-    try:
-        result = subprocess.run(
-            [
-                "pdflatex",
-                "-interaction=nonstopmode",
-                "-output-directory",
-                str(output_dir),
-                str(tex_file),
-            ],
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def label(self) -> str:
+        """The source, with the line number for NDJSON records."""
+        return str(self.source if self.line is None else f"{self.source}:{self.line}")
+
+
+def find_data_files(source: Path | str) -> list[Path]:
+    """Resolve a data file, directory or glob pattern to JSON data files.
+
+    Directories are searched recursively for ``*.json`` files; hidden
+    files (such as build bookkeeping) are ignored. The result is sorted so
+    batches are processed in a stable order.
+    """
+    path = Path(source)
+    if path.is_file():
+        return [path]
+    if path.is_dir():
+        candidates = path.rglob("*.json")
+    else:
+        candidates = (Path(p) for p in glob.glob(str(source), recursive=True))
+    return sorted(
+        p for p in candidates
+        if p.is_file() and p.suffix == ".json" and not p.name.startswith(".")
+    )
+
+
+def batch_output_files(
+    data_files: list[Path], output_dir: Path | None = None
+) -> list[Path]:
+    """Output .tex path of every data file in a batch.
+
+    Outputs go next to their data file, or into ``output_dir`` mirroring
+    the layout below the data files' common parent directory.
+    """
+    if output_dir is None:
+        return [data_file.with_suffix(".tex") for data_file in data_files]
+    if not data_files:
+        return []
+    base_dir = Path(os.path.commonpath([p.parent for p in data_files]))
+    return [
+        (output_dir / data_file.relative_to(base_dir)).with_suffix(".tex")
+        for data_file in data_files
+    ]
+
+
+def render_document(
+    result: BuildResult,
+    template: "Template",
+    validator: "jsonschema.protocols.Validator | None",
+    cv_data: dict,
+    stream: BinaryIO | None = None,
+    buffer_size: int = DEFAULT_STREAM_BUFFER,
+    timings: "Timings | None" = None,
+    document: str | None = None,
+    sink: "OutputSink | None" = None,
+) -> None:
+    """Validate and render one batch document to ``result.output`` or ``stream``.
+
+    With ``sink`` the document is written through it to ``result.output``.
+    Validation errors are stored in ``result.error``; other errors propagate.
+    Stage timings are recorded under ``document`` (default: the output).
+    """
+    document = document or str(result.output or result.label)
+    errors = []
+    if validator is not None:
+        with timed(timings, "validate", document):
+            errors = collect_validation_errors(cv_data, validator)
+    if errors:
+        result.error = "; ".join(format_validation_error(e) for e in errors)
+        return
+    with timed_render(
+        timings, document, iter_rendered(template, cv_data, buffer_size)
+    ) as chunks:
+        if stream is not None:
+            _write_stream(stream, chunks)
+            result.changed = True
+        elif sink is not None:
+            result.changed = sink.write(result.output, chunks, source=result.label)
+        else:
+            result.changed = write_chunks_if_changed(result.output, chunks)
+
+
+def build_batch(
+    template_dir: Path,
+    data_files: Iterable[Path],
+    output_dir: Path | None = None,
+    validate: bool = True,
+    manifest: "ManifestStore | None" = None,
+    force: bool = False,
+    output_files: list[Path] | None = None,
+    stream: BinaryIO | None = None,
+    buffer_size: int = DEFAULT_STREAM_BUFFER,
+    timings: "Timings | None" = None,
+    sink: "OutputSink | None" = None,
+) -> Iterator[BuildResult]:
+    """Build many CV data files through one warm pipeline.
+
+    The schema and compiled template are loaded once, then every data file
+    is streamed through validate -> render -> write. One result is yielded
+    per document as soon as it is done; a failing document does not stop
+    the batch. With a ``manifest``, documents whose inputs are unchanged
+    are skipped (unless ``force``) and fresh outputs are recorded in it.
+    ``output_files`` overrides the paths from ``batch_output_files``.
+
+    Documents are rendered in chunks of about ``buffer_size`` characters.
+    With ``stream`` they are written one after another to that binary
+    stream instead of to files, and the manifest is not consulted.
+    With ``timings``, every stage is recorded under the output path (the
+    data file when streaming, its location in the sink with a ``sink``).
+    With ``sink`` the outputs are written through it (pass no ``manifest``
+    when the sink is an archive).
+    """
+    data_files = list(data_files)
+    if stream is not None:
+        output_files = [None] * len(data_files)
+        manifest = None
+    elif output_files is None:
+        output_files = batch_output_files(data_files, output_dir)
+    template = load_template(template_dir)
+    validator = get_validator(template_dir / "schema.json") if validate else None
+
+    for data_file, output_file in zip(data_files, output_files):
+        start = time.perf_counter()
+        result = BuildResult(source=data_file, output=output_file)
+        if sink is not None and output_file is not None:
+            document = sink.location(output_file)
+        else:
+            document = str(output_file or data_file)
+        try:
+            if force:
+                result.reason = "forced"
+            elif manifest is not None:
+                result.reason = manifest.stale_reason(data_file, output_file)
+                if result.reason is None:
+                    result.skipped = True
+                    yield result
+                    continue
+            with timed(timings, "load", document):
+                cv_data = load_json(data_file)
+            render_document(
+                result,
+                template,
+                validator,
+                cv_data,
+                stream,
+                buffer_size,
+                timings,
+                document,
+                sink,
+            )
+            if result.ok and stream is None and manifest is not None:
+                manifest.record(data_file, output_file)
+        except Exception as e:  # one bad document must not abort the batch
+            result.error = f"{type(e).__name__}: {e}"
+        if result.error is not None:
+            result.output = None
+        result.seconds = time.perf_counter() - start
+        yield result
+
+
+@dataclass
+class CompileResult:
+    """Outcome of compiling a single .tex file to PDF."""
+
+    tex_file: Path
+    pdf_file: Path | None = None
+    error: str | None = None
+    log: str = ""
+    seconds: float = 0.0
+    passes: int = 0
+    converged: bool = True
+    used_format: bool = False
+    cancelled: bool = False
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+DEFAULT_MAX_PASSES = 3
+
+# Log messages asking for another LaTeX run (cross-references, hyperref
+# outlines and page labels, rerunfilecheck, ...)
+_RERUN_PATTERN = re.compile(
+    r"Rerun to get|Rerun LaTeX|Please \(?re\)?run|Label\(s\) may have changed"
+)
+# Auxiliary files whose changes between passes mean the output is stale
+_AUX_SUFFIXES = (".aux", ".out", ".toc", ".lof", ".lot")
+COMPILE_FAILED = "Compilation failed"
+
+
+def aux_digest(build_dir: Path, jobname: str) -> str | None:
+    """Digest of the auxiliary files of a job, or None if there are none."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    found = False
+    for suffix in _AUX_SUFFIXES:
+        try:
+            data = (build_dir / f"{jobname}{suffix}").read_bytes()
+        except OSError:
+            continue
+        found = True
+        digest.update(suffix.encode() + b"\0" + data + b"\0")
+    return digest.hexdigest() if found else None
+
+
+def scratch_root() -> Path | None:
+    """Parent directory for compile scratch space.
+
+    ``$CV_BUILDER_SCRATCH`` wins; otherwise the tmpfs at ``/dev/shm`` is used
+    when it is writable, and None (the system temp dir) elsewhere.
+    """
+    if os.environ.get("CV_BUILDER_SCRATCH"):
+        return Path(os.environ["CV_BUILDER_SCRATCH"])
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK | os.X_OK):
+        return shm
+    return None
+
+
+def texinputs_env(
+    template_dir: Path, tex_dir: Path, env: dict | None = None
+) -> dict:
+    """Environment letting TeX find template assets without copying them.
+
+    The template directory and the document's directory are searched first;
+    the trailing separator keeps TeX's default search path.
+    """
+    env = dict(os.environ if env is None else env)
+    paths = [str(template_dir.resolve()), str(tex_dir)]
+    if env.get("TEXINPUTS"):
+        paths.append(env["TEXINPUTS"].rstrip(os.pathsep))
+    env["TEXINPUTS"] = os.pathsep.join(paths) + os.pathsep
+    return env
+
+
+def pdflatex_command(
+    tex_file: Path, build_dir: Path, fmt_file: Path | None, draft: bool
+) -> list[str]:
+    """Command line of one pdflatex pass writing into ``build_dir``."""
+    command = ["pdflatex", "-interaction=nonstopmode"]
+    if fmt_file is not None:
+        command.append(f"-fmt={fmt_file.stem}")
+    if draft:
+        command.append("-draftmode")
+    return command + ["-output-directory", str(build_dir), str(tex_file)]
+
+
+def next_pass(
+    result: CompileResult,
+    build_dir: Path,
+    aux: str | None,
+    draft: bool,
+    max_passes: int,
+) -> tuple[bool | None, str | None]:
+    """Decide on another pass after a successful one.
+
+    A rerun is needed when the log (``result.log``) asks for it or the
+    auxiliary files changed. Returns whether the next pass is a draft, or
+    None when compiling is done, plus the new auxiliary digest.
+    """
+    new_aux = aux_digest(build_dir, result.tex_file.stem)
+    rerun = bool(_RERUN_PATTERN.search(result.log)) or (
+        aux is not None and new_aux != aux
+    )
+    if not draft and not rerun:
+        return None, new_aux
+    if result.passes >= max_passes:
+        result.converged = not rerun
+        return None, new_aux
+    return rerun and 2 <= result.passes < max_passes - 1, new_aux
+
+
+def format_failed(result: CompileResult) -> bool:
+    """Whether a compile failed against its preamble format.
+
+    The format may not fit this document, so it is compiled again the
+    normal way.
+    """
+    return result.used_format and result.error == COMPILE_FAILED
+
+
+def add_failed_attempt(
+    fallback: CompileResult, failed: CompileResult, start: float
+) -> CompileResult:
+    """Count the passes and time of the ``failed`` attempt in its fallback."""
+    fallback.passes += failed.passes
+    fallback.seconds = time.perf_counter() - start
+    return fallback
+
+
+def install_outputs(result: CompileResult, build_dir: Path, keep_log: bool) -> None:
+    """Move the PDF (and log) of a finished compile next to the .tex file."""
+    tex_file = result.tex_file
+    built_log = build_dir / f"{tex_file.stem}.log"
+    if keep_log and built_log.exists():
+        install_file(built_log, tex_file.with_suffix(".log"))
+
+    if result.ok:
+        pdf_file = tex_file.with_suffix(".pdf")
+        built_pdf = build_dir / pdf_file.name
+        if built_pdf.exists():
+            install_file(built_pdf, pdf_file)
+            result.pdf_file = pdf_file
+        else:
+            result.error = "pdflatex did not produce a PDF"
+
+
+class _Cancelled(Exception):
+    """Raised inside run_pdflatex when its cancel event is set."""
+
+
+def _run_pass(
+    command: list[str],
+    build_dir: Path,
+    env: dict,
+    cancel: threading.Event | None,
+) -> "subprocess.CompletedProcess":
+    """Run one pdflatex pass, killing it early if ``cancel`` gets set."""
+    import subprocess
+
+    # pdflatex wraps log lines at a byte count, splitting UTF-8 sequences
+    if cancel is None:
+        return subprocess.run(
+            command,
             capture_output=True,
             text=True,
-            cwd=output_dir,
+            errors="replace",
+            cwd=build_dir,
+            env=env,
         )
-        if result.returncode == 0:
-            pdf_file = tex_file.with_suffix(".pdf")
-            print(f"✓ Compiled {pdf_file}")
-            return True
-        else:
-            print("✗ Compilation failed")
-            output = result.stdout
-            print(output[-2000:] if len(output) > 2000 else output)
-            return False
+    with subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        cwd=build_dir,
+        env=env,
+    ) as proc:
+        while True:
+            try:
+                stdout, stderr = proc.communicate(timeout=0.05)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel.is_set():
+                    proc.kill()
+                    proc.communicate()
+                    raise _Cancelled from None
+    return subprocess.CompletedProcess(command, proc.returncode, stdout, stderr)
+
+
+def run_pdflatex(
+    tex_file: Path,
+    template_dir: Path,
+    workdir: Path | None = None,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    fmt_file: Path | None = None,
+    keep_log: bool = False,
+    cancel: threading.Event | None = None,
+) -> CompileResult:
+    """Compile a .tex file with pdflatex without printing anything.
+
+    pdflatex runs in a scratch directory (``workdir``, or a fresh one under
+    ``scratch_root()``), so .aux/.log/.out files never touch the output
+    directory and concurrent jobs never share files. Template assets such
+    as ``*.sty`` are found through ``TEXINPUTS`` instead of being copied.
+    Only the PDF (and the log with ``keep_log``) is moved next to the .tex.
+
+    Extra passes run only when the log asks for a rerun or the auxiliary
+    files changed, up to ``max_passes``. Intermediate passes of documents
+    that still have not settled after two passes use ``-draftmode``, which
+    skips PDF generation; the last pass always writes the PDF. Drafts thus
+    need ``max_passes >= 4``: with the default of 3 every pass is full,
+    since drafting the second pass would cost the common two-pass
+    document an extra full pass.
+
+    With ``fmt_file`` (see ``texformat.ensure_format``) the preamble is
+    loaded from a precompiled format; if that fails the document is
+    compiled again the normal way.
+
+    Setting the ``cancel`` event kills the running pdflatex and returns a
+    cancelled result without touching the outputs.
+    """
+    import tempfile
+
+    if workdir is None:
+        with tempfile.TemporaryDirectory(
+            prefix="cv-build-", dir=scratch_root()
+        ) as scratch:
+            return run_pdflatex(
+                tex_file,
+                template_dir,
+                Path(scratch),
+                max_passes,
+                fmt_file,
+                keep_log,
+                cancel,
+            )
+
+    start = time.perf_counter()
+    tex_file = tex_file.resolve()
+    build_dir = workdir.resolve()
+    result = CompileResult(tex_file=tex_file)
+    max_passes = max(1, max_passes)
+
+    env = texinputs_env(template_dir, tex_file.parent)
+    if fmt_file is not None:
+        from .texformat import format_env
+
+        env = format_env(fmt_file, env)
+        result.used_format = True
+
+    aux = aux_digest(build_dir, tex_file.stem)
+    draft = False
+    try:
+        while draft is not None:
+            command = pdflatex_command(tex_file, build_dir, fmt_file, draft)
+            completed = _run_pass(command, build_dir, env, cancel)
+            result.passes += 1
+            result.log = completed.stdout
+            if completed.returncode != 0:
+                result.error = COMPILE_FAILED
+                break
+            draft, aux = next_pass(result, build_dir, aux, draft, max_passes)
     except FileNotFoundError:
-        print("✗ pdflatex not found. Install TeX Live or MacTeX.")
-        return False
+        result.error = "pdflatex not found. Install TeX Live or MacTeX."
+    except _Cancelled:
+        result.error = "Compilation cancelled"
+        result.cancelled = True
+        result.seconds = time.perf_counter() - start
+        return result
+
+    if format_failed(result):
+        fallback = run_pdflatex(
+            tex_file,
+            template_dir,
+            max_passes=max_passes,
+            keep_log=keep_log,
+            cancel=cancel,
+        )
+        return add_failed_attempt(fallback, result, start)
+
+    install_outputs(result, build_dir, keep_log)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def cached_preamble_format(tex_file: Path, template_dir: Path) -> Path | None:
+    """Cached precompiled preamble format for a document, if one can be built."""
+    from .texformat import ensure_format
+
+    return ensure_format(tex_file, template_dir, get_cache_dir() / "formats")
+
+
+def compile_job(
+    tex_file: Path,
+    template_dir: Path,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    preamble_format: bool = False,
+    keep_log: bool = False,
+    cancel: threading.Event | None = None,
+) -> CompileResult:
+    """Compile one document of a batch in its own scratch directory.
+
+    With the PDF cache enabled, a cached PDF of the same document is
+    installed instead, and converged compiles are added to the cache.
+    Unexpected errors end up in the result's ``error``, so one document
+    never aborts the rest of a batch.
+    """
+    start = time.perf_counter()
+    try:
+        return _compile_document(
+            tex_file, template_dir, max_passes, preamble_format, keep_log, cancel
+        )
+    except Exception as e:
+        return CompileResult(
+            tex_file=tex_file,
+            error=f"{type(e).__name__}: {e}",
+            seconds=time.perf_counter() - start,
+        )
+
+
+def _compile_document(
+    tex_file: Path,
+    template_dir: Path,
+    max_passes: int,
+    preamble_format: bool,
+    keep_log: bool,
+    cancel: threading.Event | None,
+) -> CompileResult:
+    cache = _pdf_cache
+    key = None
+    if cache is not None:
+        from .pdfcache import pdf_key
+
+        start = time.perf_counter()
+        tex_file = tex_file.resolve()
+        key = pdf_key(tex_file, template_dir)
+        pdf_file = tex_file.with_suffix(".pdf")
+        if cache.get(key, pdf_file):
+            return CompileResult(
+                tex_file=tex_file,
+                pdf_file=pdf_file,
+                seconds=time.perf_counter() - start,
+                cached=True,
+            )
+
+    fmt_file = None
+    if preamble_format:
+        fmt_file = cached_preamble_format(tex_file, template_dir)
+    result = run_pdflatex(
+        tex_file,
+        template_dir,
+        max_passes=max_passes,
+        fmt_file=fmt_file,
+        keep_log=keep_log,
+        cancel=cancel,
+    )
+    if key is not None and result.ok and result.converged:
+        cache.put(key, result.pdf_file)
+    return result
+
+
+def sink_outputs(
+    result: CompileResult, sink: "OutputSink", keep_log: bool = False
+) -> None:
+    """Hand the PDF (and kept log) of a finished compile to an output sink."""
+    log_file = result.tex_file.with_suffix(".log")
+    if keep_log and log_file.exists():
+        sink.add_file(log_file, log_file)
+    if result.ok:
+        sink.add_file(result.pdf_file, result.pdf_file, seconds=result.seconds)
+
+
+def compile_many(
+    tex_files: Iterable[Path],
+    template_dir: Path,
+    jobs: int | None = None,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    preamble_format: bool = False,
+    keep_log: bool = False,
+    sink: "OutputSink | None" = None,
+) -> Iterator[CompileResult]:
+    """Compile many .tex files on a bounded pool of pdflatex workers.
+
+    ``jobs`` defaults to the CPU count. Every job gets its own scratch
+    directory. Results are yielded in the order of ``tex_files``,
+    regardless of which compile finishes first. With ``preamble_format``
+    documents are compiled against a cached precompiled preamble format.
+    With ``sink`` each PDF is added to it as its result is yielded.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    tex_files = list(tex_files)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=min(jobs, max(1, len(tex_files)))) as pool:
+        for result in pool.map(
+            lambda tex_file: compile_job(
+                tex_file, template_dir, max_passes, preamble_format, keep_log
+            ),
+            tex_files,
+        ):
+            if sink is not None:
+                sink_outputs(result, sink, keep_log)
+            yield result
+
+
+def describe_passes(result: CompileResult) -> str:
+    """Human readable pass count, e.g. ``1 pass`` or ``2 passes``."""
+    if result.cached:
+        return "cached"
+    text = f"{result.passes} pass" + ("" if result.passes == 1 else "es")
+    return text if result.converged else f"{text}, references may be stale"
+
+
+def compile_pdf(
+    tex_file: Path,
+    template_dir: Path,
+    max_passes: int = DEFAULT_MAX_PASSES,
+    preamble_format: bool = False,
+    keep_log: bool = False,
+    sink: "OutputSink | None" = None,
+) -> bool:
+    """Compile LaTeX to PDF using pdflatex (handing the PDF to ``sink``)."""
+    print(f"  Compiling {tex_file.name}...")
+    result = compile_job(
+        tex_file, template_dir, max_passes, preamble_format, keep_log
+    )
+    if sink is not None:
+        sink_outputs(result, sink, keep_log)
+    if result.ok:
+        location = result.pdf_file if sink is None else sink.location(result.pdf_file)
+        print(f"✓ Compiled {location} ({describe_passes(result)})")
+        return True
+
+    print(f"✗ {result.error}")
+    if result.log:
+        output = result.log
+        print(output[-2000:] if len(output) > 2000 else output)
+    return False
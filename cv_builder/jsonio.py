@@ -0,0 +1,108 @@
+"""JSON loading with an optional fast parser.
+
+``orjson`` or ``msgspec`` is used when installed: the file is parsed from
+bytes (memory-mapped when large) instead of being decoded to text first.
+Documents the fast parser rejects, or might read differently from the
+stdlib (integers wider than 64 bits), are parsed again with ``json``, so
+results and errors (``JSONDecodeError`` with line and column) are the same
+as ``json.load``. Set ``CV_BUILDER_JSON_BACKEND`` to ``json``, ``orjson``
+or ``msgspec`` to force a backend.
+"""
+
+import json
+import mmap
+import os
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+BACKENDS = ("orjson", "msgspec", "json")
+# Files at least this large are memory-mapped rather than read into bytes
+MMAP_THRESHOLD = 4 * 1024 * 1024
+# orjson turns integers beyond 64 bits into floats; leave those to the stdlib
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+_backend: tuple[str, Callable[[Any], Any] | None] | None = None
+
+
+def _decoder(name: str) -> Callable[[Any], Any] | None:
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads
+    if name == "msgspec":
+        import msgspec
+
+        return msgspec.json.decode
+    return None
+
+
+def _resolve() -> tuple[str, Callable[[Any], Any] | None]:
+    global _backend
+    if _backend is None:
+        requested = os.environ.get("CV_BUILDER_JSON_BACKEND", "auto")
+        set_json_backend(requested)
+    return _backend
+
+
+def set_json_backend(name: str | None = "auto") -> str:
+    """Select the JSON backend; ``auto`` picks the fastest one installed.
+
+    Returns the backend in use. Raises ``ValueError`` for an unknown name
+    and ``ImportError`` if the named backend is not installed.
+    """
+    global _backend
+    name = name or "auto"
+    if name == "auto":
+        for candidate in BACKENDS:
+            try:
+                _backend = (candidate, _decoder(candidate))
+                break
+            except ImportError:
+                continue
+    elif name in BACKENDS:
+        _backend = (name, _decoder(name))
+    else:
+        raise ValueError(
+            f"Unknown JSON backend {name!r} (choose from auto, {', '.join(BACKENDS)})"
+        )
+    return _backend[0]
+
+
+def json_backend() -> str:
+    """Name of the JSON backend ``load_json`` uses."""
+    return _resolve()[0]
+
+
+def _parse(data: bytes | memoryview, decode: Callable[[Any], Any] | None) -> Any:
+    if decode is not None and _LONG_DIGITS.search(data) is None:
+        try:
+            return decode(data)
+        except Exception:
+            pass  # re-parse below for the stdlib's result or exact error
+    # Same text json.load sees from a UTF-8 file opened in text mode
+    text = bytes(data).decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return json.loads(text)
+
+
+def loads(data: bytes) -> Any:
+    """Parse a JSON document from bytes, with the same guarantees as load_json."""
+    return _parse(data, _resolve()[1])
+
+
+def load_json(path: Path) -> dict:
+    """Load and parse JSON file."""
+    _, decode = _resolve()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if decode is not None and size and size >= MMAP_THRESHOLD:
+            with (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                memoryview(mapped) as view,
+            ):
+                return _parse(view, decode)
+        data = f.read()
+    return _parse(data, decode)
@@ -0,0 +1,134 @@
+"""Content-hash build manifest for incremental rebuilds."""
+
+import hashlib
+import json
+from pathlib import Path
+
+from . import __version__
+from .outputs import atomic_write, output_lock
+
+MANIFEST_NAME = ".cv-build-manifest.json"
+MANIFEST_FORMAT = 1
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def template_digests(template_dir: Path) -> dict:
+    """Digests of everything in a template directory that affects output."""
+    digests = {
+        "template": file_digest(template_dir / "template.tex.j2"),
+        "sty": {
+            sty.name: file_digest(sty) for sty in sorted(template_dir.glob("*.sty"))
+        },
+        "version": __version__,
+    }
+    schema_file = template_dir / "schema.json"
+    digests["schema"] = file_digest(schema_file) if schema_file.exists() else None
+    return digests
+
+
+class ManifestStore:
+    """Manifests of every output directory touched by a build.
+
+    Each output directory gets a ``.cv-build-manifest.json`` mapping output
+    names to the digests of the inputs they were built from. A document is
+    up to date when those digests are unchanged and its outputs exist.
+    """
+
+    def __init__(self, template_dir: Path, require_pdf: bool = False) -> None:
+        self.template = template_digests(template_dir)
+        self.require_pdf = require_pdf
+        self._manifests: dict[Path, dict] = {}
+        self._dirty: dict[Path, set[str]] = {}
+        self._data_digests: dict[Path, str] = {}
+
+    def _manifest(self, directory: Path) -> dict:
+        directory = directory.resolve()
+        if directory not in self._manifests:
+            manifest = {"format": MANIFEST_FORMAT, "entries": {}}
+            path = directory / MANIFEST_NAME
+            try:
+                loaded = json.loads(path.read_text(encoding="utf-8"))
+                if loaded.get("format") == MANIFEST_FORMAT:
+                    manifest = loaded
+            except (OSError, ValueError, AttributeError):
+                pass  # missing or corrupt manifest: rebuild everything
+            self._manifests[directory] = manifest
+        return self._manifests[directory]
+
+    def inputs(self, data_file: Path) -> dict:
+        """Digests of all inputs of one document."""
+        key = data_file.resolve()
+        if key not in self._data_digests:
+            self._data_digests[key] = file_digest(key)
+        return {"data": self._data_digests[key], **self.template}
+
+    def stale_reason(self, data_file: Path, output_file: Path) -> str | None:
+        """Why ``output_file`` must be rebuilt, or None if it is up to date."""
+        entry = self._manifest(output_file.parent)["entries"].get(output_file.name)
+        if entry is None:
+            return "not built before"
+        if not output_file.exists():
+            return "output missing"
+        if self.require_pdf and (
+            "pdf" not in entry.get("outputs", [])
+            or not output_file.with_suffix(".pdf").exists()
+        ):
+            return "PDF missing"
+
+        recorded = entry.get("inputs", {})
+        current = self.inputs(data_file)
+        for key, label in (
+            ("data", "data changed"),
+            ("template", "template changed"),
+            ("schema", "schema changed"),
+            ("sty", "styles changed"),
+            ("version", "cv-builder version changed"),
+        ):
+            if recorded.get(key) != current[key]:
+                return label
+        return None
+
+    def record(self, data_file: Path, output_file: Path) -> None:
+        """Record a freshly rendered .tex output."""
+        manifest = self._manifest(output_file.parent)
+        manifest["entries"][output_file.name] = {
+            "source": str(data_file),
+            "inputs": self.inputs(data_file),
+            "outputs": ["tex"],
+        }
+        self._mark_dirty(output_file)
+
+    def record_pdf(self, output_file: Path) -> None:
+        """Mark the PDF of a recorded output as successfully compiled."""
+        entry = self._manifest(output_file.parent)["entries"].get(output_file.name)
+        if entry is not None and "pdf" not in entry["outputs"]:
+            entry["outputs"].append("pdf")
+            self._mark_dirty(output_file)
+
+    def _mark_dirty(self, output_file: Path) -> None:
+        directory = output_file.parent.resolve()
+        self._dirty.setdefault(directory, set()).add(output_file.name)
+
+    def save(self) -> None:
+        """Write every modified manifest back to disk.
+
+        Under the directory lock, entries written by other builder processes
+        since we loaded the manifest are kept; only our entries are replaced.
+        """
+        for directory, names in sorted(self._dirty.items()):
+            ours = self._manifests[directory]["entries"]
+            with output_lock(directory):
+                self._manifests.pop(directory)
+                merged = self._manifest(directory)
+                merged["entries"].update({name: ours[name] for name in names})
+                data = json.dumps(merged, indent=2, sort_keys=True)
+                atomic_write(directory / MANIFEST_NAME, data.encode("utf-8"))
+        self._dirty.clear()
@@ -0,0 +1,175 @@
+"""Bulk builds from NDJSON (JSON Lines) exports: one CV object per line.
+
+Records are read, validated and rendered one at a time, so memory stays
+bounded by the largest record rather than the file; only the output name
+of each record is kept (a short string per record), so that repeated
+names get distinct files. Each output is named from a dotted key of its
+record (``personalInfo.name`` gives e.g. ``ada-lovelace.tex``). Records
+that cannot be parsed, named or validated are written to a reject file
+with their line number instead of stopping the run.
+"""
+
+import json
+import re
+import time
+import unicodedata
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, BinaryIO
+
+from .core import (
+    DEFAULT_STREAM_BUFFER,
+    BuildResult,
+    get_validator,
+    load_template,
+    render_document,
+)
+from .jsonio import loads
+from .timings import timed
+
+if TYPE_CHECKING:
+    from .sinks import OutputSink
+    from .timings import Timings
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+DEFAULT_NAME_KEY = "personalInfo.name"
+
+
+def is_ndjson(source: Path | str) -> bool:
+    """Whether ``source`` is an NDJSON file (by its suffix)."""
+    path = Path(source)
+    return path.suffix.lower() in NDJSON_SUFFIXES and path.is_file()
+
+
+def iter_lines(path: Path) -> Iterator[tuple[int, bytes]]:
+    """Non-blank lines of a file with their 1-based line numbers."""
+    with open(path, "rb") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip(b"\r\n")
+            if line.strip():
+                yield lineno, line
+
+
+def lookup(record: Any, key: str) -> Any:
+    """Value of a dotted key such as ``personalInfo.name``."""
+    value = record
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise ValueError(f"missing name key {key!r}")
+        value = value[part]
+    return value
+
+
+def output_name(value: Any) -> str:
+    """File-name-safe slug of a record's name, e.g. ``zoe-unal``."""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = text.encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower()
+
+
+class RejectLog:
+    """NDJSON file of rejected records, created on the first rejection.
+
+    Each line holds the record's line number, the error and the raw line.
+    A reject file left by an earlier run is removed up front, so a clean
+    run leaves none behind.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.unlink(missing_ok=True)
+        self.count = 0
+        self._file: IO[str] | None = None
+
+    def add(self, lineno: int, error: str, line: bytes) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+        entry = {
+            "line": lineno,
+            "error": error,
+            "record": line.decode("utf-8", errors="replace"),
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RejectLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def default_output_dir(source: Path) -> Path:
+    """``exports/hr.ndjson`` -> ``exports/hr/``."""
+    return source.with_suffix("")
+
+
+def build_ndjson(
+    template_dir: Path,
+    source: Path,
+    output_dir: Path | None = None,
+    name_key: str = DEFAULT_NAME_KEY,
+    validate: bool = True,
+    rejects: RejectLog | None = None,
+    stream: BinaryIO | None = None,
+    buffer_size: int = DEFAULT_STREAM_BUFFER,
+    timings: "Timings | None" = None,
+    sink: "OutputSink | None" = None,
+) -> Iterator[BuildResult]:
+    """Build every record of an NDJSON file, like ``core.build_batch``.
+
+    Outputs go to ``output_dir`` (default: a directory named after the
+    source) as ``<name>.tex``, where the name comes from ``name_key``;
+    repeated names get a ``-2``, ``-3``... suffix. With ``stream`` the
+    documents are written to that binary stream instead, and with ``sink``
+    through that sink. Failed records are added to ``rejects``.
+    """
+    output_dir = output_dir or default_output_dir(source)
+    template = load_template(template_dir)
+    validator = get_validator(template_dir / "schema.json") if validate else None
+    used: set[str] = set()  # only the names, to keep outputs from colliding
+
+    for lineno, line in iter_lines(source):
+        start = time.perf_counter()
+        result = BuildResult(source=source, line=lineno)
+        try:
+            with timed(timings, "load", result.label):
+                cv_data = loads(line)
+            if not isinstance(cv_data, dict):
+                raise ValueError("record is not a JSON object")
+            if stream is None:
+                name = output_name(lookup(cv_data, name_key))
+                if not name:
+                    raise ValueError(f"name key {name_key!r} gives an empty name")
+                unique, n = name, 1
+                while unique in used:
+                    n += 1
+                    unique = f"{name}-{n}"
+                used.add(unique)
+                result.output = output_dir / f"{unique}.tex"
+            render_document(
+                result,
+                template,
+                validator,
+                cv_data,
+                stream,
+                buffer_size,
+                timings,
+                document=result.label,
+                sink=sink,
+            )
+        except Exception as e:  # one bad record must not abort the run
+            result.error = f"{type(e).__name__}: {e}"
+        if result.error is not None:
+            result.output = None
+            if rejects is not None:
+                rejects.add(lineno, result.error, line)
+        result.seconds = time.perf_counter() - start
+        yield result
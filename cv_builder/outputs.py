@@ -0,0 +1,173 @@
+"""Safe output writing: write-if-changed, atomic replace and directory locks."""
+
+import hashlib
+import os
+import secrets
+import shutil
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_NAME = ".cv-build.lock"
+
+# flock() only excludes other processes reliably; threads of this process
+# are serialised per directory with ordinary locks.
+_THREAD_LOCKS: dict[Path, threading.Lock] = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+
+@contextmanager
+def output_lock(directory: Path) -> Iterator[None]:
+    """Hold the advisory lock of an output directory.
+
+    Every builder process (and thread) writing into the same directory
+    takes this lock, so several of them can share one data tree.
+    """
+    directory = directory.resolve()
+    with _THREAD_LOCKS_GUARD:
+        thread_lock = _THREAD_LOCKS.setdefault(directory, threading.Lock())
+
+    with thread_lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / LOCK_NAME, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:  # pragma: no cover - Windows
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:  # pragma: no cover - Windows
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_digest(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def same_content(path: Path, data: bytes) -> bool:
+    """Whether ``path`` already holds exactly ``data`` (size, then hash)."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return _file_digest(path) == hashlib.sha256(data).digest()
+    except OSError:
+        return False
+
+
+def temp_file(directory: Path, name: str) -> tuple[int, Path]:
+    """Create a new temp file for ``name`` in ``directory``, open for writing.
+
+    Unlike mkstemp's private 0600 files, it gets the permissions open()
+    would give (0666 less the umask, applied by the kernel).
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = Path(directory) / f".{name}.{secrets.token_hex(4)}.tmp"
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write ``data`` to a temp file beside ``path`` and rename it into place.
+
+    Readers see either the old or the new file, never a partial one.
+    """
+    fd, tmp = temp_file(path.parent, path.name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path: Path, content: str | bytes) -> bool:
+    """Atomically write ``content`` unless the file already has it.
+
+    Unchanged files keep their mtime, so file watchers and downstream
+    compiles are not triggered. Returns True if the file was written.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with output_lock(path.parent):
+        if same_content(path, data):
+            return False
+        atomic_write(path, data)
+        return True
+
+
+def write_chunks_if_changed(path: Path, chunks: Iterable[bytes]) -> bool:
+    """Streaming ``write_if_changed``: the content is never held in memory.
+
+    Chunks go to a temp file beside ``path`` while being hashed; the temp
+    file replaces ``path`` only if the result differs from it. Returns True
+    if the file was written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with output_lock(path.parent):
+        fd, tmp = temp_file(path.parent, path.name)
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                try:
+                    same = path.stat().st_size == size and (
+                        _file_digest(path) == digest.digest()
+                    )
+                except OSError:
+                    same = False
+                if not same:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if same:
+                tmp.unlink()
+                return False
+            os.replace(tmp, path)
+            return True
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def install_file(src: Path, dest: Path) -> None:
+    """Move a finished file (e.g. a PDF) into place atomically."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with output_lock(dest.parent):
+        try:
+            os.replace(src, dest)
+            return
+        except OSError:
+            pass  # different filesystem: copy next to dest, then rename
+        fd, tmp = temp_file(dest.parent, dest.name)
+        os.close(fd)
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        src.unlink(missing_ok=True)
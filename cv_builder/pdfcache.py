@@ -0,0 +1,169 @@
+"""Content-addressed cache of compiled PDFs.
+
+A PDF is stored under a hash of everything that decides it: the rendered
+``.tex``, every ``*.sty`` of the template directory and the TeX engine
+version. A document whose ``.tex`` was already compiled (by this or any
+other run sharing the cache directory) gets the cached PDF hardlinked, or
+copied across file systems, instead of running pdflatex again.
+
+Hits touch a ``.used`` file beside their entry, never the entry itself:
+outputs may be hardlinked to it and must keep their own mtime. The least
+recently used entries are deleted whenever the cache grows above its size
+cap.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from .outputs import output_lock, temp_file
+from .texformat import tex_engine_version
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+USED_SUFFIX = ".used"
+
+
+def pdf_key(tex_file: Path, template_dir: Path, engine: str = "pdflatex") -> str:
+    """Cache key of a document: its .tex, template styles and engine version."""
+    digest = hashlib.sha256()
+    with open(tex_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    for sty in sorted(template_dir.glob("*.sty")):
+        digest.update(b"\0" + sty.name.encode() + b"\0" + sty.read_bytes())
+    digest.update(b"\0" + (tex_engine_version(engine) or "").encode())
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Atomically make ``dest`` a hardlink to ``src``, or a copy of it."""
+    fd, tmp = temp_file(dest.parent, dest.name)
+    os.close(fd)
+    tmp.unlink()
+    try:
+        try:
+            os.link(src, tmp)
+        except OSError:  # another file system, or no hardlinks
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class PdfCache:
+    """Size-bounded directory of PDFs named by ``pdf_key``.
+
+    Safe to share between threads and processes: entries are written
+    atomically and a vanished entry is just a miss.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def entry(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def used_marker(self, key: str) -> Path:
+        """Empty file whose mtime is the last use of the entry for ``key``."""
+        return self.entry(key).with_suffix(USED_SUFFIX)
+
+    def _entries(self) -> list[tuple[int, int, Path]]:
+        """(last use, size, path) of every entry, least recently used first."""
+        entries = []
+        for path in self.directory.glob("*/*.pdf"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            try:
+                used = path.with_suffix(USED_SUFFIX).stat().st_mtime_ns
+            except OSError:  # not marked yet: stored at its mtime
+                used = st.st_mtime_ns
+            entries.append((used, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def _mark_used(self, key: str) -> None:
+        try:
+            self.used_marker(key).touch()
+        except OSError:  # a read-only cache still serves hits
+            pass
+
+    def get(self, key: str, dest: Path) -> bool:
+        """Install the cached PDF for ``key`` as ``dest``; False on a miss."""
+        entry = self.entry(key)
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            with output_lock(dest.parent):
+                _link_or_copy(entry, dest)
+        except OSError:  # missing (or unreadable) entries are misses
+            with self._lock:
+                self.misses += 1
+            return False
+        self._mark_used(key)
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key: str, pdf_file: Path) -> None:
+        """Store a freshly compiled PDF, then evict down to the size cap.
+
+        A cache that cannot be written to is skipped, not an error.
+        """
+        entry = self.entry(key)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(pdf_file, entry)
+        except OSError:
+            return
+        self._mark_used(key)
+        self.prune()
+
+    def prune(self, max_bytes: int | None = None) -> tuple[int, int]:
+        """Evict least recently used entries above ``max_bytes``.
+
+        Defaults to the cache's size cap. Returns the number of entries
+        removed and the bytes freed.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            else:
+                removed += 1
+                freed += size
+            path.with_suffix(USED_SUFFIX).unlink(missing_ok=True)
+            total -= size
+        return removed, freed
+
+    def clear(self) -> int:
+        """Delete every entry; returns how many there were."""
+        return self.prune(0)[0]
+
+    def stats(self) -> dict:
+        """Entries and bytes on disk, plus this process's hits and misses."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
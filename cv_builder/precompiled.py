@@ -0,0 +1,107 @@
+"""Ahead-of-time compiled templates.
+
+``cv-build precompile`` compiles the ``.j2`` templates of a template
+directory into Python modules (``__jinja<version>__/``) or a zip of them
+(``__jinja<version>__.zip``) with Jinja's ``compile_templates``. At run
+time a ``ModuleLoader`` over those artifacts is tried before the template
+sources, so a fresh process imports the template instead of lexing,
+parsing and compiling it. Artifacts older than any template source, or
+written by another Jinja version, are ignored.
+"""
+
+import shutil
+from pathlib import Path
+
+import jinja2
+from jinja2 import BaseLoader, ChoiceLoader, FileSystemLoader, ModuleLoader
+
+TEMPLATE_SUFFIX = ".j2"
+# Compiled modules only work with the Jinja version that generated them
+COMPILED_NAME = f"__jinja{jinja2.__version__}__"
+
+
+def compiled_paths(template_dir: Path) -> tuple[Path, Path]:
+    """Where the module directory and the zip of a template directory go."""
+    return template_dir / COMPILED_NAME, template_dir / f"{COMPILED_NAME}.zip"
+
+
+def _sources_mtime(template_dir: Path) -> int:
+    sources = template_dir.glob(f"*{TEMPLATE_SUFFIX}")
+    return max((path.stat().st_mtime_ns for path in sources), default=0)
+
+
+def _artifact_mtime(artifact: Path) -> int | None:
+    """Age of an artifact: the oldest module in a directory, or the zip."""
+    try:
+        if artifact.is_dir():
+            return min(
+                (path.stat().st_mtime_ns for path in artifact.glob("*.py")),
+                default=None,
+            )
+        return artifact.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def fresh_artifact(template_dir: Path) -> Path | None:
+    """The compiled artifact to load from, if one is newer than the sources.
+
+    The module directory wins when both exist and are fresh.
+    """
+    sources = _sources_mtime(template_dir)
+    for artifact in compiled_paths(template_dir):
+        mtime = _artifact_mtime(artifact)
+        if mtime is not None and mtime >= sources:
+            return artifact
+    return None
+
+
+def template_loader(template_dir: Path) -> BaseLoader:
+    """Loader for a template directory, preferring fresh compiled modules.
+
+    Templates missing from the artifact still load from source.
+    """
+    source = FileSystemLoader(template_dir)
+    artifact = fresh_artifact(Path(template_dir))
+    if artifact is None:
+        return source
+    return ChoiceLoader([ModuleLoader(artifact), source])
+
+
+def clean_compiled(template_dir: Path) -> list[Path]:
+    """Delete the compiled artifacts of a template directory.
+
+    Returns the paths that were removed.
+    """
+    removed = []
+    for artifact in compiled_paths(template_dir):
+        if artifact.is_dir():
+            shutil.rmtree(artifact)
+        elif artifact.exists():
+            artifact.unlink()
+        else:
+            continue
+        removed.append(artifact)
+    return removed
+
+
+def precompile_template(template_dir: Path, zip: bool = False) -> Path:
+    """Compile every ``.j2`` template of a directory ahead of time.
+
+    Writes ``__jinja<version>__/`` (or the ``.zip`` with ``zip``) inside
+    ``template_dir``, replacing earlier artifacts, and returns its path.
+    Template syntax errors are raised rather than skipped.
+    """
+    from .core import create_jinja_env
+
+    clean_compiled(template_dir)
+    modules, archive = compiled_paths(template_dir)
+    target = archive if zip else modules
+    env = create_jinja_env(template_dir, precompiled=False)
+    env.compile_templates(
+        str(target),
+        extensions=[TEMPLATE_SUFFIX.lstrip(".")],
+        zip="deflated" if zip else None,
+        ignore_errors=False,
+    )
+    return target
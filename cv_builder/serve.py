@@ -0,0 +1,268 @@
+"""Render daemon: serve CV rendering over local HTTP or a Unix socket.
+
+The process keeps the cached Jinja2 environments, compiled templates and
+schema validators resident, so a request pays only for rendering (and
+pdflatex when a PDF is asked for).
+
+Endpoints:
+
+``GET /health``
+    JSON status, 503 while draining.
+``POST /render/<template>[?format=pdf]``
+    CV JSON in the body; returns the ``.tex`` source or the PDF.
+"""
+
+import json
+import os
+import signal
+import socketserver
+import stat
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__, jsonio
+from .core import (
+    DEFAULT_MAX_PASSES,
+    collect_validation_errors,
+    compile_job,
+    format_validation_error,
+    get_validator,
+    load_template,
+    render_variant,
+    scratch_root,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class RenderService:
+    """Renders CVs with warm templates, at most ``workers`` at a time."""
+
+    def __init__(
+        self,
+        templates_dir: Path,
+        workers: int | None = None,
+        validate: bool = True,
+        max_passes: int = DEFAULT_MAX_PASSES,
+        preamble_format: bool = False,
+    ) -> None:
+        self.templates_dir = templates_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.validate = validate
+        self.max_passes = max_passes
+        self.preamble_format = preamble_format
+        self.draining = False
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently being rendered or compiled."""
+        with self._lock:
+            return self._in_flight
+
+    def templates(self) -> list[str]:
+        """Names of the templates this service can render."""
+        return sorted(
+            path.parent.name
+            for path in self.templates_dir.glob("*/template.tex.j2")
+        )
+
+    def health(self) -> tuple[int, dict]:
+        """Status code and body of the health endpoint."""
+        status = "draining" if self.draining else "ok"
+        return (503 if self.draining else 200), {
+            "status": status,
+            "version": __version__,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "templates": self.templates(),
+        }
+
+    def render(self, template: str, body: bytes, pdf: bool = False) -> tuple:
+        """Handle a render request.
+
+        Returns ``(status, content_type, payload)``; errors are JSON objects
+        with an ``error`` message (and ``errors`` for validation failures).
+        Unexpected render or compile errors are a 500, never an exception.
+        """
+        template_dir = self.templates_dir / template
+        if "/" in template or not (template_dir / "template.tex.j2").exists():
+            return _json_error(404, f"Template '{template}' not found")
+        try:
+            cv_data = jsonio.loads(body)
+        except ValueError as e:
+            return _json_error(400, f"Invalid JSON: {e}")
+        if not isinstance(cv_data, dict):
+            return _json_error(422, "CV data must be a JSON object")
+
+        with self._slots:
+            with self._lock:
+                self._in_flight += 1
+            try:
+                return self._render(template_dir, cv_data, pdf)
+            except Exception as e:
+                return _json_error(500, f"{type(e).__name__}: {e}")
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+    def _render(self, template_dir: Path, cv_data, pdf: bool) -> tuple:
+        if self.validate:
+            errors = collect_validation_errors(
+                cv_data, get_validator(template_dir / "schema.json")
+            )
+            if errors:
+                return _json_error(
+                    422,
+                    "Schema validation failed",
+                    errors=[format_validation_error(e) for e in errors],
+                )
+        tex = render_variant(load_template(template_dir), cv_data)
+        if not pdf:
+            return 200, "application/x-tex; charset=utf-8", tex.encode("utf-8")
+
+        with tempfile.TemporaryDirectory(
+            prefix="cv-serve-", dir=scratch_root()
+        ) as workdir:
+            tex_file = Path(workdir) / f"{template_dir.name}.tex"
+            tex_file.write_text(tex, encoding="utf-8")
+            result = compile_job(
+                tex_file, template_dir, self.max_passes, self.preamble_format
+            )
+            if not result.ok:
+                return _json_error(500, result.error, log=result.log[-2000:])
+            return 200, "application/pdf", result.pdf_file.read_bytes()
+
+
+def _json_error(status: int, message: str, **extra) -> tuple:
+    body = json.dumps({"error": message, **extra}).encode("utf-8")
+    return status, "application/json", body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = f"cv-builder/{__version__}"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _send(self, status: int, content_type: str, payload: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            self._send(*_json_error(404, "Not found"))
+            return
+        status, body = self.server.service.health()
+        self._send(status, "application/json", json.dumps(body).encode("utf-8"))
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        prefix = "/render/"
+        if not url.path.startswith(prefix):
+            self._send(*_json_error(404, "Not found"))
+            return
+        service = self.server.service
+        if service.draining:
+            self._send(*_json_error(503, "Server is shutting down"))
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send(*_json_error(400, "Invalid Content-Length"))
+            return
+        if length > MAX_BODY_BYTES:
+            self._send(*_json_error(413, "Request body too large"))
+            return
+        body = self.rfile.read(length)
+        pdf = parse_qs(url.query).get("format", ["tex"])[0] == "pdf"
+        self._send(*service.render(url.path[len(prefix):], body, pdf))
+
+
+def _is_socket(path: Path) -> bool:
+    try:
+        return stat.S_ISSOCK(path.lstat().st_mode)
+    except OSError:
+        return False
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = False
+
+
+def make_server(
+    service: RenderService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+) -> socketserver.BaseServer:
+    """Create a threaded HTTP server for ``service`` (not yet serving).
+
+    Request threads are not daemonic, so ``server_close()`` waits for
+    in-flight renders and compiles to finish. A stale socket at
+    ``socket_path`` is replaced; any other file there is a FileExistsError.
+    """
+    if socket_path is not None:
+        if _is_socket(socket_path):
+            socket_path.unlink()  # left over from an earlier server
+        elif os.path.lexists(socket_path):
+            raise FileExistsError(f"{socket_path} exists and is not a socket")
+        server = _UnixHTTPServer(str(socket_path), _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = False
+    server.service = service
+    return server
+
+
+def drain(server: socketserver.BaseServer) -> None:
+    """Stop accepting requests and wait for in-flight ones to finish.
+
+    Must not be called from the thread running ``serve_forever``.
+    """
+    server.service.draining = True
+    server.shutdown()
+
+
+def serve(
+    service: RenderService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+) -> None:
+    """Serve until SIGINT/SIGTERM, then drain in-flight requests and exit."""
+    server = make_server(service, host, port, socket_path)
+
+    def stop(signum, frame):
+        threading.Thread(target=drain, args=(server,)).start()
+
+    previous = {
+        sig: signal.signal(sig, stop) for sig in (signal.SIGINT, signal.SIGTERM)
+    }
+    if socket_path is not None:
+        print(f"Serving on unix:{socket_path}")
+    else:
+        print(f"Serving on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+        print(f"Draining {service.in_flight} in-flight request(s)...")
+    finally:
+        server.server_close()
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        if socket_path is not None and _is_socket(socket_path):
+            socket_path.unlink(missing_ok=True)
+    print("Server stopped.")
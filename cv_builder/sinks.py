@@ -0,0 +1,371 @@
+"""Output sinks: where the files of a build end up.
+
+``DirectorySink`` writes every file at its output path, as builds always
+have. ``TarSink`` and ``ZipSink`` append the files to one archive as they
+finish instead, which spares the file system thousands of small files and
+leaves one artifact to ship. Archive entries are named by their output
+path relative to the sink's ``base`` directory.
+
+Every sink records the id (the entry name without its suffix), SHA-256,
+size and build time of each file; archives end with a ``manifest.json``
+entry listing them. Archives are written to a temp file that replaces
+the target only when the sink is closed without an error.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO
+
+from .outputs import install_file, temp_file, write_chunks_if_changed
+
+# Archive kinds by file name suffix, longest suffixes first
+ARCHIVE_SUFFIXES = (
+    (".tar.gz", "gz"),
+    (".tgz", "gz"),
+    (".tar.zst", "zst"),
+    (".tzst", "zst"),
+    (".tar", "tar"),
+    (".zip", "zip"),
+)
+MANIFEST_NAME = "manifest.json"
+GZIP_LEVEL = 6
+# Documents are spooled before they are added to an archive (a tar header
+# holds the member size); larger ones spill to disk
+SPOOL_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class SinkEntry:
+    """One file written to a sink."""
+
+    id: str
+    name: str
+    sha256: str
+    size: int
+    seconds: float | None = None
+    source: str | None = None
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputSink(ABC):
+    """Destination of the files a build produces.
+
+    ``write`` stores a rendered document from its chunks and ``add_file``
+    an existing file such as a compiled PDF. Both take the file's output
+    path, which subclasses map to their storage. Sinks are context
+    managers and may be shared by threads.
+    """
+
+    def __init__(self, base: Path | None = None) -> None:
+        self.base = base
+        self._real_base = base.resolve() if base is not None else None
+        self.entries: list[SinkEntry] = []
+        self._sources: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def name_of(self, path: Path) -> str:
+        """Entry name of an output path: relative to ``base`` when below it."""
+        path = Path(path)
+        if self.base is not None:
+            # Compiled outputs come back as resolved paths
+            pairs = ((path, self.base), (path.resolve(), self._real_base))
+            for candidate, base in pairs:
+                try:
+                    return candidate.relative_to(base).as_posix()
+                except ValueError:
+                    pass
+        return path.as_posix()
+
+    def location(self, path: Path) -> str:
+        """Where an output path ends up, for messages."""
+        return str(path)
+
+    def write(
+        self, path: Path, chunks: Iterable[bytes], source: str | None = None
+    ) -> bool:
+        """Store a document from its chunks; returns whether it changed.
+
+        ``source`` (e.g. the data file) is recorded in the manifest.
+        """
+        digest = hashlib.sha256()
+        size = 0
+
+        def measured() -> Iterator[bytes]:
+            nonlocal size
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        start = time.perf_counter()
+        changed = self._write(Path(path), measured())
+        seconds = time.perf_counter() - start
+        self._record(path, digest.hexdigest(), size, seconds, source)
+        return changed
+
+    def add_file(
+        self,
+        path: Path,
+        src: Path,
+        source: str | None = None,
+        seconds: float | None = None,
+    ) -> None:
+        """Store the finished file ``src`` (which may be moved) as ``path``.
+
+        The source defaults to that of the document with the same id.
+        """
+        sha256, size = _file_sha256(src), Path(src).stat().st_size
+        self._add_file(Path(path), Path(src))
+        self._record(path, sha256, size, seconds, source)
+
+    def _record(self, path, sha256, size, seconds, source) -> None:
+        name = self.name_of(path)
+        entry_id = str(PurePosixPath(name).with_suffix(""))
+        with self._lock:
+            if source is None:
+                source = self._sources.get(entry_id)
+            else:
+                self._sources[entry_id] = source
+            self.entries.append(
+                SinkEntry(entry_id, name, sha256, size, seconds, source)
+            )
+
+    def manifest(self) -> dict:
+        """Ids, hashes, sizes and timings of everything written so far."""
+        with self._lock:
+            return {"entries": [asdict(entry) for entry in self.entries]}
+
+    @abstractmethod
+    def _write(self, path: Path, chunks: Iterable[bytes]) -> bool:
+        """Store a document; returns whether it changed."""
+
+    @abstractmethod
+    def _add_file(self, path: Path, src: Path) -> None:
+        """Store the finished file ``src`` as ``path``."""
+
+    def close(self, commit: bool = True) -> None:
+        """Finish the output; with ``commit`` False, discard what can be."""
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        self.close(commit=exc_type is None)
+
+
+class DirectorySink(OutputSink):
+    """Write files at their output paths (write-if-changed, atomic).
+
+    With ``manifest`` the manifest is also written to that file on close.
+    """
+
+    def __init__(self, base: Path | None = None, manifest: Path | None = None):
+        super().__init__(base)
+        self.manifest_file = manifest
+
+    def _write(self, path: Path, chunks: Iterable[bytes]) -> bool:
+        return write_chunks_if_changed(path, chunks)
+
+    def _add_file(self, path: Path, src: Path) -> None:
+        if src.resolve() != path.resolve():
+            install_file(src, path)
+
+    def close(self, commit: bool = True) -> None:
+        if commit and self.manifest_file is not None:
+            data = json.dumps(self.manifest(), indent=2) + "\n"
+            write_chunks_if_changed(self.manifest_file, [data.encode("utf-8")])
+
+
+class _ArchiveSink(OutputSink):
+    """Shared handling of the spooling and the temp file of an archive.
+
+    With ``keep_files``, documents passed to ``write`` are also left at
+    their output paths, e.g. for pdflatex to compile them.
+    """
+
+    def __init__(
+        self, path: Path, base: Path | None = None, keep_files: bool = False
+    ) -> None:
+        super().__init__(base)
+        self.path = Path(path)
+        self.keep_files = keep_files
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = temp_file(self.path.parent, self.path.name)
+        self._raw: IO[bytes] | None = os.fdopen(fd, "wb")
+        try:
+            self._open(self._raw)
+        except BaseException:
+            self._raw.close()
+            self._tmp.unlink(missing_ok=True)
+            raise
+
+    def name_of(self, path: Path) -> str:
+        name = super().name_of(path)
+        # Paths outside base keep only their file name
+        return Path(path).name if PurePosixPath(name).is_absolute() else name
+
+    def location(self, path: Path) -> str:
+        return f"{self.path}:{self.name_of(path)}"
+
+    def _write(self, path: Path, chunks: Iterable[bytes]) -> bool:
+        if self.keep_files:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            spool = open(path, "w+b")
+        else:
+            spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        with spool:
+            for chunk in chunks:
+                spool.write(chunk)
+            size = spool.tell()
+            spool.seek(0)
+            with self._lock:
+                self._add_stream(self.name_of(path), spool, size)
+        return True
+
+    def _add_file(self, path: Path, src: Path) -> None:
+        with open(src, "rb") as f, self._lock:
+            self._add_stream(self.name_of(path), f, os.fstat(f.fileno()).st_size)
+
+    @abstractmethod
+    def _open(self, raw: IO[bytes]) -> None:
+        """Start the archive on the temp file ``raw``."""
+
+    @abstractmethod
+    def _add_stream(self, name: str, f: IO[bytes], size: int) -> None:
+        """Append ``size`` bytes of ``f`` as entry ``name`` (lock held)."""
+
+    @abstractmethod
+    def _finish(self) -> None:
+        """Finish the archive; the temp file is flushed and closed after."""
+
+    def close(self, commit: bool = True) -> None:
+        if self._raw is None:
+            return
+        raw, self._raw = self._raw, None
+        committed = False
+        try:
+            if commit:
+                data = (json.dumps(self.manifest(), indent=2) + "\n").encode("utf-8")
+                with self._lock:
+                    self._add_stream(MANIFEST_NAME, io.BytesIO(data), len(data))
+            self._finish()
+            if commit:
+                raw.flush()
+                os.fsync(raw.fileno())
+                raw.close()
+                os.replace(self._tmp, self.path)
+                committed = True
+        finally:
+            raw.close()
+            if not committed:
+                self._tmp.unlink(missing_ok=True)
+
+
+def _zstd_writer(raw: IO[bytes]) -> IO[bytes]:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd archives need the zstandard package "
+            "(pip install 'cv-builder[zstd]')"
+        ) from None
+    return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+
+
+class TarSink(_ArchiveSink):
+    """Stream files into a tar archive, optionally gzip or zstd compressed."""
+
+    def __init__(
+        self,
+        path: Path,
+        base: Path | None = None,
+        compression: str | None = None,
+        keep_files: bool = False,
+    ) -> None:
+        if compression not in (None, "gz", "zst"):
+            raise ValueError(f"Unknown tar compression {compression!r}")
+        self.compression = compression
+        super().__init__(path, base, keep_files)
+
+    def _open(self, raw: IO[bytes]) -> None:
+        self._stream: IO[bytes] | None = None
+        if self.compression == "gz":
+            self._stream = gzip.GzipFile(
+                filename="", mode="wb", fileobj=raw, compresslevel=GZIP_LEVEL
+            )
+        elif self.compression == "zst":
+            self._stream = _zstd_writer(raw)
+        self._tar = tarfile.open(fileobj=self._stream or raw, mode="w|")
+
+    def _add_stream(self, name: str, f: IO[bytes], size: int) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._tar.addfile(info, f)
+
+    def _finish(self) -> None:
+        self._tar.close()
+        if self._stream is not None:
+            self._stream.close()
+
+
+class ZipSink(_ArchiveSink):
+    """Stream files into a zip archive (PDFs are stored, not deflated)."""
+
+    def _open(self, raw: IO[bytes]) -> None:
+        self._zip = zipfile.ZipFile(raw, "w")
+
+    def _add_stream(self, name: str, f: IO[bytes], size: int) -> None:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        info.compress_type = (
+            zipfile.ZIP_STORED if name.endswith(".pdf") else zipfile.ZIP_DEFLATED
+        )
+        info.file_size = size
+        with self._zip.open(info, "w") as member:
+            shutil.copyfileobj(f, member)
+
+    def _finish(self) -> None:
+        self._zip.close()
+
+
+def archive_kind(path: Path | str) -> str | None:
+    """``gz``, ``zst``, ``tar`` or ``zip`` for an archive name, else None."""
+    name = str(path).lower()
+    for suffix, kind in ARCHIVE_SUFFIXES:
+        if name.endswith(suffix):
+            return kind
+    return None
+
+
+def open_sink(
+    path: Path, base: Path | None = None, keep_files: bool = False
+) -> OutputSink:
+    """Sink for an output path: an archive by its suffix, else a directory."""
+    kind = archive_kind(path)
+    if kind == "zip":
+        return ZipSink(path, base, keep_files)
+    if kind is not None:
+        return TarSink(path, base, None if kind == "tar" else kind, keep_files)
+    return DirectorySink(base or Path(path))
@@ -0,0 +1,129 @@
+"""Precompiled LaTeX formats of template preambles.
+
+Every CV built from a template shares the same preamble (``article`` plus
+everything ``resume.sty`` loads). Dumping that preamble once into a format
+file with ``mylatexformat`` and compiling documents with ``-fmt`` skips the
+package loading on every run.
+"""
+
+import functools
+import hashlib
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+from .outputs import atomic_write, output_lock
+
+_BEGIN_DOCUMENT = r"\begin{document}"
+
+# Keys whose format could not be built in this process: don't retry them
+_FAILED: set[str] = set()
+_FAILED_LOCK = threading.Lock()
+
+
+@functools.cache
+def tex_engine_version(engine: str = "pdflatex") -> str | None:
+    """First line of ``<engine> --version``, or None if it is not installed."""
+    try:
+        completed = subprocess.run(
+            [engine, "--version"], capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return None
+    lines = completed.stdout.splitlines()
+    return lines[0].strip() if lines else None
+
+
+def preamble_of(tex: str) -> str | None:
+    """Everything before ``\\begin{document}``, or None if there is none."""
+    index = tex.find(_BEGIN_DOCUMENT)
+    return tex[:index] if index != -1 else None
+
+
+def format_key(preamble: str, template_dir: Path) -> str:
+    """Cache key of a format: preamble, template styles and engine version."""
+    digest = hashlib.sha256(preamble.encode("utf-8"))
+    for sty in sorted(template_dir.glob("*.sty")):
+        digest.update(sty.name.encode() + b"\0" + sty.read_bytes())
+    digest.update((tex_engine_version() or "").encode())
+    return digest.hexdigest()[:32]
+
+
+def _dump_format(preamble: str, template_dir: Path, fmt_file: Path) -> bool:
+    """Run ``pdflatex -ini`` with mylatexformat to dump a preamble format."""
+    env = {
+        **os.environ,
+        "TEXINPUTS": f"{template_dir.resolve()}{os.pathsep}"
+        + os.environ.get("TEXINPUTS", ""),
+    }
+    with tempfile.TemporaryDirectory(prefix="cv-build-fmt-") as workdir:
+        workdir = Path(workdir)
+        source = workdir / "preamble.tex"
+        source.write_text(
+            f"{preamble}{_BEGIN_DOCUMENT}\n\\end{{document}}\n", encoding="utf-8"
+        )
+        try:
+            completed = subprocess.run(
+                [
+                    "pdflatex",
+                    "-ini",
+                    "-interaction=nonstopmode",
+                    f"-jobname={fmt_file.stem}",
+                    "&pdflatex",
+                    "mylatexformat.ltx",
+                    source.name,
+                ],
+                capture_output=True,
+                text=True,
+                cwd=workdir,
+                env=env,
+            )
+        except FileNotFoundError:
+            return False
+        built = workdir / fmt_file.name
+        if completed.returncode != 0 or not built.exists():
+            return False
+        # Already under the formats directory lock: write directly
+        atomic_write(fmt_file, built.read_bytes())
+        return True
+
+
+def ensure_format(
+    tex_file: Path, template_dir: Path, formats_dir: Path
+) -> Path | None:
+    """Return a precompiled format for the preamble of ``tex_file``.
+
+    The format is built once per preamble, ``.sty`` content and engine
+    version and cached in ``formats_dir``. Returns None when the document
+    has no preamble or the format cannot be built (e.g. mylatexformat is
+    not installed); callers then compile normally.
+    """
+    preamble = preamble_of(tex_file.read_text(encoding="utf-8"))
+    if preamble is None:
+        return None
+    key = format_key(preamble, template_dir)
+    fmt_file = formats_dir / f"cv-{key}.fmt"
+    if fmt_file.exists():
+        return fmt_file
+    with _FAILED_LOCK:
+        if key in _FAILED:
+            return None
+
+    with output_lock(formats_dir):
+        # Another job may have built it while we waited for the lock
+        if fmt_file.exists():
+            return fmt_file
+        if _dump_format(preamble, template_dir, fmt_file):
+            return fmt_file
+    with _FAILED_LOCK:
+        _FAILED.add(key)
+    return None
+
+
+def format_env(fmt_file: Path, env: dict | None = None) -> dict:
+    """Environment letting pdflatex find ``fmt_file`` via ``-fmt=<stem>``."""
+    env = dict(os.environ if env is None else env)
+    env["TEXFORMATS"] = f"{fmt_file.parent}{os.pathsep}"
+    return env
@@ -0,0 +1,178 @@
+"""Per-stage build timings (--timings) and profiling (--profile)."""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Stages in pipeline order, for sorting the report
+STAGES = ("load", "validate", "render", "write", "compile")
+
+
+@dataclass
+class StageTiming:
+    """Wall and CPU seconds spent in one stage of one document."""
+
+    document: str
+    stage: str
+    wall: float
+    cpu: float | None
+
+
+class Timings:
+    """Thread-safe recorder of stage timings.
+
+    CPU time is the calling thread's (``time.thread_time``), so it stays
+    per-document with parallel workers. pdflatex runs in a child process;
+    its stage is recorded without CPU time.
+    """
+
+    def __init__(self) -> None:
+        self.records: list[StageTiming] = []
+        # Named counter groups reported alongside, e.g. cache statistics
+        self.counters: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self, stage: str, document: str, wall: float, cpu: float | None = None
+    ) -> None:
+        with self._lock:
+            self.records.append(StageTiming(str(document), stage, wall, cpu))
+
+    @contextmanager
+    def stage(self, stage: str, document: str, cpu: bool = True) -> Iterator[None]:
+        """Time the body of a ``with`` block as ``stage`` of ``document``."""
+        wall, thread_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(
+                stage,
+                document,
+                time.perf_counter() - wall,
+                time.thread_time() - thread_cpu if cpu else None,
+            )
+
+    def totals(self) -> dict[str, dict[str, float | None]]:
+        """Wall and CPU seconds per stage, summed over all documents."""
+        totals: dict[str, dict[str, float | None]] = {}
+        for record in self.records:
+            total = totals.setdefault(record.stage, {"wall": 0.0, "cpu": None})
+            total["wall"] += record.wall
+            if record.cpu is not None:
+                total["cpu"] = (total["cpu"] or 0.0) + record.cpu
+        return dict(sorted(totals.items(), key=lambda item: _stage_order(item[0])))
+
+    def to_json(self) -> dict:
+        return {
+            "stages": [asdict(record) for record in self.records],
+            "totals": self.totals(),
+            "counters": self.counters,
+        }
+
+    def table(self) -> str:
+        """Human readable report, one row per document and stage."""
+        rows = sorted(self.records, key=lambda r: (r.document, _stage_order(r.stage)))
+        width = max([len(r.document) for r in rows] + [len("document")])
+        header = f"{'document':<{width}}  {'stage':<9}{'wall ms':>10}{'cpu ms':>10}"
+        lines = [header]
+        for record in rows:
+            lines.append(
+                _row(record.document, record.stage, record.wall, record.cpu, width)
+            )
+        for stage, total in self.totals().items():
+            lines.append(_row("total", stage, total["wall"], total["cpu"], width))
+        for name, counters in self.counters.items():
+            values = ", ".join(
+                f"{key} {value:.1%}" if key.endswith("rate") else f"{key} {value}"
+                for key, value in counters.items()
+            )
+            lines.append(f"{name}: {values}")
+        return "\n".join(lines)
+
+    def report(self, destination: Path | str) -> None:
+        """Print the table (``-``) or write JSON to a file."""
+        if str(destination) == "-":
+            print(f"\n{self.table()}")
+        else:
+            Path(destination).write_text(json.dumps(self.to_json(), indent=2))
+            print(f"Timings written to {destination}")
+
+
+def _stage_order(stage: str) -> int:
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+
+def _row(
+    document: str, stage: str, wall: float, cpu: float | None, width: int
+) -> str:
+    cpu_text = "-" if cpu is None else f"{cpu * 1000:.2f}"
+    return f"{document:<{width}}  {stage:<9}{wall * 1000:>10.2f}{cpu_text:>10}"
+
+
+def timed(timings: Timings | None, stage: str, document: str, cpu: bool = True):
+    """``timings.stage(...)``, or a no-op context when not recording."""
+    if timings is None:
+        return nullcontext()
+    return timings.stage(stage, document, cpu)
+
+
+@contextmanager
+def timed_render(
+    timings: Timings | None, document: str, chunks: Iterator[bytes]
+) -> Iterator[Iterator[bytes]]:
+    """Split a streaming render + write into ``render`` and ``write`` stages.
+
+    Time spent producing the chunks counts as rendering; the rest of the
+    ``with`` block (the consumer writing them) counts as writing.
+    """
+    if timings is None:
+        yield chunks
+        return
+
+    spent = [0.0, 0.0]
+
+    def measured() -> Iterator[bytes]:
+        iterator = iter(chunks)
+        while True:
+            wall, cpu = time.perf_counter(), time.thread_time()
+            chunk = next(iterator, None)
+            spent[0] += time.perf_counter() - wall
+            spent[1] += time.thread_time() - cpu
+            if chunk is None:
+                return
+            yield chunk
+
+    wall, cpu = time.perf_counter(), time.thread_time()
+    yield measured()
+    total_wall = time.perf_counter() - wall
+    total_cpu = time.thread_time() - cpu
+    timings.add("render", document, spent[0], spent[1])
+    timings.add("write", document, total_wall - spent[0], total_cpu - spent[1])
+
+
+@contextmanager
+def profiled(path: Path) -> Iterator[None]:
+    """Profile the block with cProfile and track peak memory with tracemalloc.
+
+    The profile is dumped to ``path`` (view it with ``python -m pstats``),
+    even if the block exits with an error or ``sys.exit``.
+    """
+    import cProfile
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        profiler.dump_stats(path)
+        print(f"\nProfile written to {path} (view with: python -m pstats {path})")
+        print(f"Peak traced memory: {peak / (1024 * 1024):.1f} MiB")
@@ -0,0 +1,214 @@
+"""Precomputed view model of a CV for the resume layout.
+
+``build_view`` turns loaded CV data into immutable records that are
+already filtered on ``inResume``, already LaTeX-escaped and have their
+defaults filled in, so templates only loop over prepared values instead
+of filtering and escaping inside Jinja. Every field holds exactly what the
+template prints; fields the template prints unescaped keep their raw value
+(``*_raw`` where both forms are printed).
+
+Renders get the view of their data as ``view`` (see
+``core.render_context``), wrapped in a ``LazyView`` that builds it on first
+use: templates that never read it don't pay for it, and renders of the
+same data (several templates in one build) can share one. The per-field
+filters stay available for templates that don't use it.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from .core import cached_latex_escape, format_date_range
+
+# Personal links in header order, with the macro that prints each
+LINK_KINDS = ("linkedin", "github", "webpage")
+
+
+@dataclass(frozen=True)
+class Link:
+    kind: str
+    url: Any
+
+
+@dataclass(frozen=True)
+class Experience:
+    title: Any
+    dates: str
+    company: Any
+    location: Any
+    description: Any
+    responsibilities: tuple
+
+
+@dataclass(frozen=True)
+class Degree:
+    label: Any
+    courses: Any
+    thesis: Any
+
+
+@dataclass(frozen=True)
+class Education:
+    degree: Any
+    degree_raw: Any
+    institution: Any
+    location: Any
+    start_date: Any
+    end_date: Any
+    msc: Degree | None
+    bsc: Degree | None
+
+    @property
+    def has_details(self) -> bool:
+        return self.msc is not None or self.bsc is not None
+
+
+@dataclass(frozen=True)
+class Item:
+    """A name/value pair: a license, or a technical or personal skill."""
+
+    name: Any
+    value: Any
+
+
+@dataclass(frozen=True)
+class Project:
+    name: Any
+    url: Any
+    description: Any
+    technologies: Any
+
+
+@dataclass(frozen=True)
+class CVView:
+    name: Any
+    email: Any
+    location: Any
+    links: tuple
+    summary: Any
+    experience: tuple
+    education: tuple
+    licenses: tuple
+    skills_columns: Any
+    technical_skills: tuple
+    projects: tuple
+    personal_skills: tuple
+    footer: Any
+
+
+def _visible(items) -> list:
+    """Items shown in the resume (a missing ``inResume`` hides the item)."""
+    return [item for item in items or () if item.get("inResume")]
+
+
+def _degree(details: dict | None, key: str, default_label: str) -> Degree | None:
+    detail = (details or {}).get(key)
+    if not detail:
+        return None
+    return Degree(
+        label=detail.get("label") or default_label,
+        courses=cached_latex_escape(detail.get("courses", "")),
+        thesis=detail.get("thesis", ""),
+    )
+
+
+def _education(edu: dict) -> Education:
+    details = edu.get("details")
+    msc = _degree(details, "msc", "MSc")
+    bsc = _degree(details, "bsc", "BSc")
+    return Education(
+        degree=cached_latex_escape(edu.get("degree", "")),
+        degree_raw=edu.get("degree", ""),
+        institution=edu.get("institution", ""),
+        location=edu.get("location", ""),
+        start_date=edu.get("startDate", ""),
+        end_date=edu.get("endDate", ""),
+        msc=msc,
+        bsc=bsc,
+    )
+
+
+def build_view(cv: dict) -> CVView:
+    """Build the view of a CV."""
+    info = cv.get("personalInfo") or {}
+    summary = cv.get("summary")
+    footer = cv.get("footer") or {}
+    return CVView(
+        name=info.get("name", ""),
+        email=info.get("email", ""),
+        location=info.get("location", ""),
+        links=tuple(
+            Link(kind, info[kind].get("url", ""))
+            for kind in LINK_KINDS
+            if info.get(kind) and info[kind].get("inResume")
+        ),
+        summary=(
+            cached_latex_escape(summary.get("value", ""))
+            if summary and summary.get("inResume")
+            else None
+        ),
+        experience=tuple(
+            Experience(
+                title=cached_latex_escape(exp.get("title", "")),
+                dates=format_date_range(exp.get("startDate", ""), exp.get("endDate")),
+                company=cached_latex_escape(exp.get("company", "")),
+                location=cached_latex_escape(exp.get("location", "")),
+                description=cached_latex_escape(exp.get("description", "")),
+                responsibilities=tuple(
+                    cached_latex_escape(r["value"])
+                    for r in exp.get("responsibilities", [])
+                    if r.get("inResume", True)
+                ),
+            )
+            for exp in _visible(cv.get("experience"))
+        ),
+        education=tuple(_education(edu) for edu in _visible(cv.get("education"))),
+        licenses=tuple(
+            Item(cached_latex_escape(lic.get("name", "")), lic.get("year", ""))
+            for lic in _visible(cv.get("licenses"))
+        ),
+        skills_columns=cv.get("skillsColumns") or 2,
+        technical_skills=tuple(
+            Item(cached_latex_escape(name), cached_latex_escape(skill.get("value", "")))
+            for name, skill in (cv.get("technicalSkills") or {}).items()
+            if skill.get("inResume")
+        ),
+        projects=tuple(
+            Project(
+                name=project.get("name", ""),
+                url=project.get("url", ""),
+                description=cached_latex_escape(project.get("description", "")),
+                technologies=cached_latex_escape(project.get("technologies", "")),
+            )
+            for project in _visible(cv.get("projects"))
+        ),
+        personal_skills=tuple(
+            Item(name, skill.get("value", ""))
+            for name, skill in (cv.get("personalSkills") or {}).items()
+            if skill.get("inResume")
+        ),
+        footer=footer.get("value", "") if footer.get("inResume") else None,
+    )
+
+
+class LazyView:
+    """The view of a CV, built on first attribute access and then kept.
+
+    Attributes are those of ``CVView``. A view may be built twice when two
+    threads race for it; both results are equal.
+    """
+
+    def __init__(self, cv: dict) -> None:
+        self.cv = cv
+        self._view: CVView | None = None
+
+    def get(self) -> CVView:
+        """The built view."""
+        if self._view is None:
+            view = build_view(self.cv)
+            # Later lookups find the fields here, without __getattr__
+            self.__dict__.update(vars(view))
+            self._view = view
+        return self._view
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
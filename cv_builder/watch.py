@@ -0,0 +1,226 @@
+"""Watch mode: rebuild outputs in a warm process whenever their inputs change.
+
+Changes are picked up through ``watchfiles`` (inotify/FSEvents) when it is
+installed, otherwise by polling file stats. The Jinja2 environment and the
+schema validator stay cached between rebuilds; both reload themselves when
+the template or schema files change.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from .core import (
+    DEFAULT_MAX_PASSES,
+    build_batch,
+    compile_job,
+    describe_passes,
+)
+
+try:
+    import watchfiles
+except ImportError:  # optional: fall back to polling
+    watchfiles = None
+
+DEFAULT_DEBOUNCE = 0.1
+DEFAULT_POLL_INTERVAL = 0.2
+
+
+def template_inputs(template_dir: Path) -> list[Path]:
+    """Files of a template directory that affect every output."""
+    inputs = [template_dir / "template.tex.j2", template_dir / "schema.json"]
+    return inputs + sorted(template_dir.glob("*.sty"))
+
+
+def _snapshot(paths: list[Path]) -> dict[Path, tuple[int, int] | None]:
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            snapshot[path] = None
+    return snapshot
+
+
+def _poll_changes(
+    paths: list[Path],
+    debounce: float,
+    interval: float,
+    stop: threading.Event,
+) -> Iterator[set[Path]]:
+    before = _snapshot(paths)
+    pending: set[Path] = set()
+    last_change = 0.0
+    while not stop.is_set():
+        wait = min(interval, debounce) if pending else interval
+        if stop.wait(wait):
+            return
+        after = _snapshot(paths)
+        changed = {path for path in paths if after[path] != before[path]}
+        before = after
+        if changed:
+            pending |= changed
+            last_change = time.monotonic()
+        elif pending and time.monotonic() - last_change >= debounce:
+            yield pending
+            pending = set()
+
+
+def _inotify_changes(
+    paths: list[Path], debounce: float, stop: threading.Event
+) -> Iterator[set[Path]]:
+    watched = set(paths)
+    directories = sorted({path.parent for path in paths})
+    for changes in watchfiles.watch(
+        *directories,
+        debounce=int(debounce * 1000),
+        stop_event=stop,
+        recursive=False,
+    ):
+        changed = {Path(name).resolve() for _, name in changes} & watched
+        if changed:
+            yield changed
+
+
+def iter_changes(
+    paths: list[Path],
+    debounce: float = DEFAULT_DEBOUNCE,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    stop: threading.Event | None = None,
+    polling: bool = False,
+) -> Iterator[set[Path]]:
+    """Yield sets of changed files, once each burst of saves has settled.
+
+    A burst ends after ``debounce`` seconds without further changes. Uses
+    ``watchfiles`` unless it is missing or ``polling`` is set.
+    """
+    paths = [path.resolve() for path in paths]
+    stop = stop or threading.Event()
+    if watchfiles is not None and not polling:
+        yield from _inotify_changes(paths, debounce, stop)
+    else:
+        yield from _poll_changes(paths, debounce, interval, stop)
+
+
+class WatchSession:
+    """Rebuilds the outputs of a set of documents as their inputs change."""
+
+    def __init__(
+        self,
+        template_dir: Path,
+        documents: list[tuple[Path, Path]],
+        validate: bool = True,
+        compile: bool = False,
+        max_passes: int = DEFAULT_MAX_PASSES,
+        preamble_format: bool = False,
+        keep_log: bool = False,
+    ) -> None:
+        self.template_dir = template_dir
+        self.documents = [(data.resolve(), output) for data, output in documents]
+        self.validate = validate
+        self.compile = compile
+        self.max_passes = max_passes
+        self.preamble_format = preamble_format
+        self.keep_log = keep_log
+        self._compile_thread: threading.Thread | None = None
+        self._cancel = threading.Event()
+        self._pending: list[Path] = []
+
+    def watched_paths(self) -> list[Path]:
+        """Every file whose change triggers a rebuild."""
+        inputs = [data for data, _ in self.documents]
+        return inputs + template_inputs(self.template_dir)
+
+    def affected(self, changed: set[Path]) -> list[tuple[Path, Path]]:
+        """Documents that must be rebuilt after ``changed`` files changed."""
+        shared = {path.resolve() for path in template_inputs(self.template_dir)}
+        if changed & shared:
+            return list(self.documents)
+        return [doc for doc in self.documents if doc[0] in changed]
+
+    def rebuild(self, documents: list[tuple[Path, Path]]) -> list[Path]:
+        """Render ``documents``, then compile the changed ones in the background.
+
+        Returns the .tex files that were rewritten.
+        """
+        written = []
+        for result in build_batch(
+            self.template_dir,
+            [data for data, _ in documents],
+            validate=self.validate,
+            output_files=[output for _, output in documents],
+        ):
+            if not result.ok:
+                print(f"✗ {result.source}: {result.error}")
+            elif result.changed:
+                written.append(result.output)
+                print(f"✓ Rendered {result.output} ({result.seconds * 1000:.1f} ms)")
+            else:
+                print(f"✓ {result.output} unchanged")
+        if self.compile and written:
+            self.start_compile(written)
+        return written
+
+    def start_compile(self, tex_files: list[Path]) -> None:
+        """Compile ``tex_files``, cancelling any compile still running.
+
+        Documents the cancelled compile had not finished are compiled again.
+        """
+        self.cancel_compile()
+        self._pending = list(dict.fromkeys(self._pending + tex_files))
+        self._cancel = threading.Event()
+        self._compile_thread = threading.Thread(
+            target=self._compile, args=(self._cancel,), daemon=True
+        )
+        self._compile_thread.start()
+
+    def cancel_compile(self) -> None:
+        """Kill the running pdflatex, if any, and wait for it to exit."""
+        if self._compile_thread is not None:
+            self._cancel.set()
+            self._compile_thread.join()
+            self._compile_thread = None
+
+    def _compile(self, cancel: threading.Event) -> None:
+        while self._pending:
+            tex_file = self._pending[0]
+            result = compile_job(
+                tex_file,
+                self.template_dir,
+                self.max_passes,
+                self.preamble_format,
+                self.keep_log,
+                cancel,
+            )
+            if result.cancelled:
+                print(f"- {tex_file}: compile cancelled by a newer save")
+                return
+            self._pending.pop(0)
+            if result.ok:
+                print(
+                    f"✓ Compiled {result.pdf_file} "
+                    f"({result.seconds:.1f} s, {describe_passes(result)})"
+                )
+            else:
+                print(f"✗ {tex_file}: {result.error}")
+
+    def run(
+        self,
+        debounce: float = DEFAULT_DEBOUNCE,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        stop: threading.Event | None = None,
+        polling: bool = False,
+    ) -> None:
+        """Build everything once, then rebuild on every change until stopped."""
+        self.rebuild(self.documents)
+        try:
+            for changed in iter_changes(
+                self.watched_paths(), debounce, interval, stop, polling
+            ):
+                documents = self.affected(changed)
+                if documents:
+                    self.rebuild(documents)
+        finally:
+            self.cancel_compile()
@@ -1,11 +1,157 @@
 """Shared pytest fixtures for cv_builder tests."""
 
 import json
+import platform
+import statistics
+import sys
+import time
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from cv_builder.cli import main
+from cv_builder.core import clear_template_cache
+
+# =============================================================================
+# benchmark harness
+# =============================================================================
+_BENCH_RESULTS = pytest.StashKey[dict]()
+_BENCH_REGRESSIONS = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    # --bench-* rather than --benchmark-*, which pytest-benchmark registers
+    group = parser.getgroup("benchmark", "cv_builder micro-benchmarks")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run the tests marked 'benchmark' (skipped by default)",
+    )
+    group.addoption(
+        "--bench-save",
+        metavar="PATH",
+        help="Write benchmark results as JSON to PATH",
+    )
+    group.addoption(
+        "--bench-compare",
+        metavar="PATH",
+        help="Compare benchmark results with a baseline JSON file",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.2,
+        metavar="FRACTION",
+        help="Median slowdown flagged as a regression (default: 0.2 = 20%%)",
+    )
+
+
+def pytest_configure(config):
+    config.stash[_BENCH_RESULTS] = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def bench(request):
+    """Time a callable: ``bench(func, *args, rounds=5)`` returns its result.
+
+    Fast callables are looped so each round takes at least ~5 ms; the
+    per-call min and median over the rounds are recorded under the test id.
+    """
+
+    def run(func, *args, rounds: int = 5, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        first = time.perf_counter() - start
+        loops = max(1, int(0.005 / first)) if first > 0 else 1000
+
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func(*args, **kwargs)
+            timings.append((time.perf_counter() - start) / loops)
+        request.config.stash[_BENCH_RESULTS][request.node.nodeid] = {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "rounds": rounds,
+            "loops": loops,
+        }
+        return result
+
+    return run
+
+
+def _bench_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, result in sorted(results.items()):
+        before = baseline.get(name)
+        if before and result["median"] > before["median"] * (1 + threshold):
+            regressions.append((name, before["median"], result["median"]))
+    return regressions
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config.stash[_BENCH_RESULTS]
+    if not results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(results.items()):
+        write(f"{result['median'] * 1e3:12.3f} ms  {name}")
+
+    save = config.getoption("--bench-save")
+    if save:
+        payload = {
+            "python": sys.version.split()[0],
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        Path(save).write_text(json.dumps(payload, indent=2, sort_keys=True))
+        write(f"saved benchmark results to {save}")
+
+    compare = config.getoption("--bench-compare")
+    if compare:
+        threshold = config.getoption("--bench-threshold")
+        regressions = config.stash[_BENCH_REGRESSIONS]
+        for name, before, after in regressions:
+            write(
+                f"REGRESSION {name}: {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms "
+                f"(+{(after / before - 1) * 100:.0f}%)",
+                red=True,
+            )
+        if not regressions:
+            write(f"no regressions above {threshold:.0%} against {compare}")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Runs before the terminal summary, which reports the regressions
+    config = session.config
+    compare = config.getoption("--bench-compare", None)
+    results = config.stash.get(_BENCH_RESULTS, {})
+    if compare and results:
+        baseline = json.loads(Path(compare).read_text())["results"]
+        threshold = config.getoption("--bench-threshold")
+        regressions = _bench_regressions(results, baseline, threshold)
+        config.stash[_BENCH_REGRESSIONS] = regressions
+        if regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+# =============================================================================
+# fixtures
+# =============================================================================
+
 
 @pytest.fixture
 def sample_cv_data() -> dict:
@@ -146,17 +292,103 @@ def tmp_data_dir(tmp_path: Path, sample_cv_data: dict) -> Path:
     return data_dir
 
 
+@pytest.fixture
+def fresh_template_cache():
+    """Clear the cached Jinja environments before and after the test."""
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+@pytest.fixture
+def run_cli(tmp_template_dir: Path):
+    """Run ``cv-build`` with ``tmp_template_dir``'s parent as the package
+    templates directory: ``run_cli("batch", src, "-t", "test_template")``.
+    """
+
+    def run(*argv: str) -> None:
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main(list(argv))
+
+    return run
+
+
 @pytest.fixture
 def mock_pdflatex(monkeypatch):
-    """Mock subprocess.run for pdflatex calls."""
+    """Mock subprocess.run for pdflatex calls that write a PDF."""
     mock_run = MagicMock()
     mock_run.return_value.returncode = 0
     mock_run.return_value.stdout = "pdflatex output"
     mock_run.return_value.stderr = ""
+
+    def run(cmd, **kwargs):
+        out_dir = Path(cmd[cmd.index("-output-directory") + 1])
+        (out_dir / Path(cmd[-1]).with_suffix(".pdf").name).write_bytes(b"%PDF")
+        (out_dir / Path(cmd[-1]).with_suffix(".log").name).write_text("log")
+        return mock_run.return_value
+
+    mock_run.side_effect = run
     monkeypatch.setattr("subprocess.run", mock_run)
     return mock_run
 
 
+@pytest.fixture
+def fake_pdflatex(monkeypatch):
+    """Mock subprocess.run with a pdflatex that writes a PDF and .aux file."""
+
+    def run(cmd, **kwargs):
+        out_dir = Path(cmd[cmd.index("-output-directory") + 1])
+        stem = Path(cmd[-1]).stem
+        (out_dir / f"{stem}.aux").write_text("\\relax\n")
+        if "-draftmode" not in cmd:
+            (out_dir / f"{stem}.pdf").write_bytes(b"%PDF-1.5 " + stem.encode())
+        result = MagicMock()
+        result.returncode = 0
+        result.stdout = "pdflatex output"
+        result.stderr = ""
+        return result
+
+    mock_run = MagicMock(side_effect=run)
+    monkeypatch.setattr("subprocess.run", mock_run)
+    return mock_run
+
+
+@pytest.fixture
+def scripted_pdflatex(monkeypatch):
+    """Mock pdflatex whose successive passes print the given logs.
+
+    Call the returned function with one log per pass; a log containing
+    ``AUX:<text>`` also writes <text> to the job's .aux file.
+    """
+
+    def script(*logs):
+        logs = list(logs)
+
+        def run(cmd, **kwargs):
+            log = logs.pop(0) if logs else "done"
+            out_dir = Path(cmd[cmd.index("-output-directory") + 1])
+            stem = Path(cmd[-1]).stem
+            if "AUX:" in log:
+                aux = log.split("AUX:", 1)[1]
+                (out_dir / f"{stem}.aux").write_text(aux)
+            if "-draftmode" not in cmd:
+                (out_dir / f"{stem}.pdf").write_bytes(b"%PDF")
+            result = MagicMock()
+            result.returncode = 0
+            result.stdout = log
+            result.stderr = ""
+            return result
+
+        mock_run = MagicMock(side_effect=run)
+        monkeypatch.setattr("subprocess.run", mock_run)
+        return mock_run
+
+    return script
+
+
 @pytest.fixture
 def mock_pdflatex_failure(monkeypatch):
     """Mock subprocess.run for failed pdflatex calls."""
@@ -0,0 +1,241 @@
+"""Tests for cv_builder.aiocompile module."""
+
+import asyncio
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from cv_builder import aiocompile
+from cv_builder.aiocompile import LOG_TAIL_BYTES, compile_async, compile_many_async
+
+# Stand-in for pdflatex: behaviour is chosen by the document's first line.
+FAKE_PDFLATEX = """\
+import os, subprocess, sys, time
+args = sys.argv[1:]
+out_dir = args[args.index("-output-directory") + 1]
+tex = args[-1]
+stem = os.path.splitext(os.path.basename(tex))[0]
+mode = open(tex).readline().strip()
+print("This is fake pdfTeX", flush=True)
+if mode == "hang":
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    open(os.path.join(out_dir, "child.pid"), "w").write(str(child.pid))
+    open(os.environ["CHILD_PID_FILE"], "w").write(str(child.pid))
+    time.sleep(60)
+if mode == "fail":
+    print("! Undefined control sequence.")
+    sys.exit(1)
+if mode == "rerun" and not os.path.exists(os.path.join(out_dir, stem + ".aux")):
+    open(os.path.join(out_dir, stem + ".aux"), "w").write("x")
+    print("LaTeX Warning: Label(s) may have changed. Rerun to get cross-references")
+if mode == "slow":
+    time.sleep(0.2)
+if mode == "loud":
+    sys.stdout.write("overfull hbox\\n" * 20000 + "Output written\\n")
+if "-draftmode" not in args:
+    open(os.path.join(out_dir, stem + ".pdf"), "wb").write(b"%PDF")
+open(os.path.join(out_dir, stem + ".log"), "w").write("log")
+"""
+
+
+@pytest.fixture
+def fake_pdflatex_bin(tmp_path, monkeypatch) -> Path:
+    """Put an executable fake ``pdflatex`` first on PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pdflatex"
+    script.write_text(f"#!{sys.executable}\n{FAKE_PDFLATEX}")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("CHILD_PID_FILE", str(tmp_path / "child.pid"))
+    return bin_dir
+
+
+def _tex(tmp_path: Path, name: str, mode: str) -> Path:
+    tex_file = tmp_path / f"{name}.tex"
+    tex_file.write_text(f"{mode}\n")
+    return tex_file
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except OSError:
+        return True
+    return state != "Z"
+
+
+def _wait_dead(pid: int, seconds: float = 5.0) -> bool:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if not _alive(pid):
+            return True
+        time.sleep(0.02)
+    return False
+
+
+# =============================================================================
+# compile_async tests
+# =============================================================================
+@pytest.mark.unit
+class TestCompileAsync:
+    """Tests for compile_async."""
+
+    def test_compiles_pdf(self, tmp_path, tmp_template_dir, fake_pdflatex_bin):
+        """A successful compile installs the PDF next to the .tex."""
+        tex_file = _tex(tmp_path, "cv", "ok")
+        result = asyncio.run(compile_async(tex_file, tmp_template_dir))
+        assert result.ok
+        assert result.passes == 1
+        assert tex_file.with_suffix(".pdf").read_bytes() == b"%PDF"
+        assert not tex_file.with_suffix(".log").exists()
+
+    def test_reruns_when_asked(self, tmp_path, tmp_template_dir, fake_pdflatex_bin):
+        """A rerun request in the log triggers another pass."""
+        result = asyncio.run(
+            compile_async(_tex(tmp_path, "cv", "rerun"), tmp_template_dir)
+        )
+        assert result.ok
+        assert result.passes == 2
+        assert result.converged
+
+    def test_failure(self, tmp_path, tmp_template_dir, fake_pdflatex_bin):
+        """A failing pass reports the log."""
+        result = asyncio.run(
+            compile_async(_tex(tmp_path, "cv", "fail"), tmp_template_dir)
+        )
+        assert result.error == "Compilation failed"
+        assert "Undefined control sequence" in result.log
+
+    def test_streams_log_to_file(
+        self, tmp_path, tmp_template_dir, fake_pdflatex_bin
+    ):
+        """Console output of every pass is appended to log_file."""
+        log_file = tmp_path / "console.log"
+        result = asyncio.run(
+            compile_async(
+                _tex(tmp_path, "cv", "rerun"), tmp_template_dir, log_file=log_file
+            )
+        )
+        assert result.ok
+        assert log_file.read_text().count("This is fake pdfTeX") == 2
+        assert result.log == "This is fake pdfTeX\n"
+
+    def test_log_tail_is_bounded(
+        self, tmp_path, tmp_template_dir, fake_pdflatex_bin
+    ):
+        """Only the end of a long console output is kept in memory."""
+        log_file = tmp_path / "console.log"
+        result = asyncio.run(
+            compile_async(
+                _tex(tmp_path, "cv", "loud"), tmp_template_dir, log_file=log_file
+            )
+        )
+        assert result.ok
+        assert len(result.log) == LOG_TAIL_BYTES
+        assert result.log.endswith("Output written\n")
+        assert log_file.stat().st_size > LOG_TAIL_BYTES
+
+    def test_timeout_kills_process_group(
+        self, tmp_path, tmp_template_dir, fake_pdflatex_bin
+    ):
+        """On timeout pdflatex and its children are killed."""
+        start = time.monotonic()
+        result = asyncio.run(
+            compile_async(_tex(tmp_path, "cv", "hang"), tmp_template_dir, timeout=1)
+        )
+        assert time.monotonic() - start < 10
+        assert result.error == "Compilation timed out after 1s"
+        assert not result.ok
+        child = int((tmp_path / "child.pid").read_text())
+        assert _wait_dead(child)
+
+    def test_cancellation_kills_process(
+        self, tmp_path, tmp_template_dir, fake_pdflatex_bin
+    ):
+        """Cancelling the task kills pdflatex and propagates CancelledError."""
+        tex_file = _tex(tmp_path, "cv", "hang")
+        pid_file = tmp_path / "child.pid"
+
+        async def run():
+            task = asyncio.create_task(compile_async(tex_file, tmp_template_dir))
+            while not pid_file.exists() or not pid_file.read_text():
+                await asyncio.sleep(0.02)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run())
+        assert _wait_dead(int(pid_file.read_text()))
+
+    def test_pdflatex_not_found(self, tmp_path, tmp_template_dir, monkeypatch):
+        """A missing pdflatex is reported, not raised."""
+        monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+        tex_file = _tex(tmp_path, "cv", "ok")
+        result = asyncio.run(compile_async(tex_file, tmp_template_dir))
+        assert "pdflatex not found" in result.error
+
+
+# =============================================================================
+# compile_many_async tests
+# =============================================================================
+@pytest.mark.unit
+class TestCompileManyAsync:
+    """Tests for compile_many_async."""
+
+    def test_results_in_input_order(
+        self, tmp_path, tmp_template_dir, fake_pdflatex_bin
+    ):
+        """Results follow the input order and failures stay isolated."""
+        tex_files = [
+            _tex(tmp_path, "a", "slow"),
+            _tex(tmp_path, "b", "fail"),
+            _tex(tmp_path, "c", "ok"),
+        ]
+        results = asyncio.run(
+            compile_many_async(tex_files, tmp_template_dir, jobs=3)
+        )
+        assert [r.tex_file.name for r in results] == ["a.tex", "b.tex", "c.tex"]
+        assert [r.ok for r in results] == [True, False, True]
+
+    def test_unexpected_error_stays_per_document(
+        self, tmp_path, tmp_template_dir, fake_pdflatex_bin, monkeypatch
+    ):
+        """An exception in one job becomes that document's error result."""
+        tex_files = [_tex(tmp_path, "a", "ok"), tmp_path / "missing.tex"]
+
+        def no_format(tex_file, template_dir):
+            tex_file.read_bytes()  # FileNotFoundError for the missing one
+
+        monkeypatch.setattr(aiocompile, "cached_preamble_format", no_format)
+        results = asyncio.run(
+            compile_many_async(tex_files, tmp_template_dir, preamble_format=True)
+        )
+        assert [r.ok for r in results] == [True, False]
+        assert results[1].error.startswith("FileNotFoundError")
+
+    def test_semaphore_bounds_concurrency(
+        self, tmp_path, tmp_template_dir, fake_pdflatex_bin
+    ):
+        """With one job slot the compiles run one after another."""
+        tex_files = [_tex(tmp_path, f"doc{i}", "slow") for i in range(3)]
+
+        async def run():
+            semaphore = asyncio.Semaphore(1)
+            start = time.monotonic()
+            results = await compile_many_async(
+                tex_files, tmp_template_dir, semaphore=semaphore
+            )
+            return results, time.monotonic() - start
+
+        results, elapsed = asyncio.run(run())
+        assert all(r.ok for r in results)
+        assert elapsed >= 0.6
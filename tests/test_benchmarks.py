@@ -0,0 +1,131 @@
+"""Micro-benchmarks for the load, validate, escape and render hot paths.
+
+Skipped unless pytest runs with ``--benchmark``. Save results with
+``--bench-save FILE`` and flag regressions against a stored baseline
+with ``--bench-compare FILE [--bench-threshold 0.2]``.
+"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from cv_builder.cli import get_package_templates_dir
+from cv_builder.core import (
+    build_variant,
+    cached_latex_escape,
+    create_jinja_env,
+    get_validator,
+    latex_escape,
+    load_json,
+    validate_cv,
+)
+
+SIZES = [10, 100, 1_000, 10_000]
+LONG_TEXT = "Cut costs by 20% & shipped R&D_pipeline #1 " * 200
+HEAVY_LATEX = r"Python /latex{\&} SQL /latex{\textbf{x}} ~ " * 500
+TEMPLATE_DIR = get_package_templates_dir() / "resume"
+
+
+def synthetic_cv(
+    base: dict, entries: int, responsibilities: int = 5, latex: bool = False
+) -> dict:
+    """CV with ``entries`` experience entries built from ``base``."""
+    cv = copy.deepcopy(base)
+    template = base["experience"][0]
+    text = "Cut costs by 20% & shipped R&D_pipeline #{i} for $1M"
+    if latex:
+        text += r" /latex{\textbf{bold}} and /latex{\href{https://x.io}{link}}"
+    cv["experience"] = []
+    for i in range(entries):
+        entry = copy.deepcopy(template)
+        entry["title"] = f"Engineer {i}"
+        entry["responsibilities"] = [
+            {"value": text.replace("{i}", str(j)), "inResume": j % 4 != 3}
+            for j in range(responsibilities)
+        ]
+        cv["experience"].append(entry)
+    return cv
+
+
+pytestmark = pytest.mark.usefixtures("fresh_template_cache")
+
+
+# =============================================================================
+# load / validate benchmarks
+# =============================================================================
+@pytest.mark.benchmark
+class TestLoadValidateBenchmarks:
+    """Benchmarks for load_json and validate_cv."""
+
+    @pytest.mark.parametrize("entries", SIZES)
+    def test_load_json(self, bench, tmp_path: Path, sample_cv_data, entries):
+        data_file = tmp_path / "cv.json"
+        data_file.write_text(json.dumps(synthetic_cv(sample_cv_data, entries)))
+        cv_data = bench(load_json, data_file)
+        assert len(cv_data["experience"]) == entries
+
+    @pytest.mark.parametrize("entries", SIZES)
+    def test_validate_cv(self, bench, sample_cv_data, entries, capsys):
+        cv_data = synthetic_cv(sample_cv_data, entries)
+        validator = get_validator(TEMPLATE_DIR / "schema.json")
+        assert bench(validate_cv, cv_data, validator) is True
+
+
+# =============================================================================
+# latex_escape benchmarks
+# =============================================================================
+@pytest.mark.benchmark
+class TestLatexEscapeBenchmarks:
+    """Benchmarks for latex_escape."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param("Tech Corp & Partners", id="short"),
+            pytest.param(LONG_TEXT, id="long"),
+            pytest.param(HEAVY_LATEX, id="heavy"),
+        ],
+    )
+    def test_latex_escape(self, bench, text):
+        bench(latex_escape, text)
+
+    def test_cached_latex_escape_repeated(self, bench):
+        """A batch's worth of repeated short fields through the memo."""
+        fields = [f"Company {i % 50} & Partners" for i in range(1_000)]
+        bench(lambda: [cached_latex_escape(field) for field in fields])
+
+
+# =============================================================================
+# render benchmarks
+# =============================================================================
+@pytest.mark.benchmark
+class TestRenderBenchmarks:
+    """Benchmarks for create_jinja_env and build_variant."""
+
+    def test_create_jinja_env(self, bench):
+        """Environment creation plus a cold template compile."""
+        bench(
+            lambda: create_jinja_env(TEMPLATE_DIR).get_template("template.tex.j2")
+        )
+
+    @pytest.mark.parametrize("entries", SIZES)
+    def test_build_variant(self, bench, tmp_path, sample_cv_data, entries, capsys):
+        cv_data = synthetic_cv(sample_cv_data, entries)
+        rounds = 3 if entries >= 10_000 else 5
+        tex_file = bench(
+            build_variant, TEMPLATE_DIR, tmp_path, "resume", cv_data, rounds=rounds
+        )
+        assert f"Engineer {entries - 1}" in tex_file.read_text()
+
+    def test_build_variant_long_responsibilities(
+        self, bench, tmp_path, sample_cv_data, capsys
+    ):
+        cv_data = synthetic_cv(sample_cv_data, 10, responsibilities=1_000)
+        bench(build_variant, TEMPLATE_DIR, tmp_path, "resume", cv_data)
+
+    def test_build_variant_heavy_latex(self, bench, tmp_path, sample_cv_data, capsys):
+        cv_data = synthetic_cv(sample_cv_data, 100, responsibilities=20, latex=True)
+        tex_file = bench(build_variant, TEMPLATE_DIR, tmp_path, "resume", cv_data)
+        assert r"\textbf{bold}" in tex_file.read_text()
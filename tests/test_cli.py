@@ -6,7 +6,7 @@ from unittest.mock import patch
 
 import pytest
 
-from cv_builder.cli import get_package_templates_dir, main
+from cv_builder.cli import build_parser, get_package_templates_dir, main
 
 
 # =============================================================================
@@ -32,6 +32,43 @@ class TestGetPackageTemplatesDir:
         assert result.exists()
 
 
+# =============================================================================
+# start-up tests
+# =============================================================================
+@pytest.mark.unit
+class TestLazyImports:
+    """The CLI must start without loading heavy dependencies."""
+
+    def test_cli_import_skips_heavy_modules(self):
+        """Importing cv_builder.cli loads neither jinja2 nor jsonschema."""
+        import subprocess
+
+        code = (
+            "import sys, cv_builder.cli; "
+            "print(sorted(m for m in ('jinja2', 'jsonschema', 'subprocess', "
+            "'http.server') if m in sys.modules))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert completed.stdout.strip() == "[]"
+
+    def test_serve_defaults_match(self):
+        """The CLI's copy of the serve defaults stays in sync."""
+        from cv_builder import cli, serve
+
+        assert (cli.DEFAULT_HOST, cli.DEFAULT_PORT) == (
+            serve.DEFAULT_HOST,
+            serve.DEFAULT_PORT,
+        )
+
+    def test_bytecode_cache_still_exported(self):
+        """core.BoundedBytecodeCache resolves lazily to the bytecode module."""
+        from cv_builder import bytecode, core
+
+        assert core.BoundedBytecodeCache is bytecode.BoundedBytecodeCache
+
+
 # =============================================================================
 # main CLI tests
 # =============================================================================
@@ -293,3 +330,414 @@ class TestMainCli:
 
         captured = capsys.readouterr()
         assert "resume" in captured.out
+
+
+# =============================================================================
+# batch command tests
+# =============================================================================
+@pytest.mark.unit
+class TestBatchCli:
+    """Tests for the ``cv-build batch`` command."""
+
+    def test_batch_builds_directory(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsys
+    ):
+        """Every data file in the directory is built with a summary line."""
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "cv-build",
+                "batch",
+                str(tmp_data_dir),
+                "--template",
+                "test_template",
+            ],
+        )
+
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main()
+
+        captured = capsys.readouterr()
+        assert "✓" in captured.out
+        assert "Built 1/1 document(s)" in captured.out
+        assert "docs/s" in captured.out
+        assert (tmp_data_dir / "test_template.tex").exists()
+
+    def test_batch_failure_exits_with_error(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsys
+    ):
+        """A failing document makes the batch exit with code 1."""
+        (tmp_data_dir / "broken.json").write_text("{invalid")
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["cv-build", "batch", str(tmp_data_dir), "-t", "test_template"],
+        )
+
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert "✗" in captured.out
+        assert "1 failed" in captured.out
+
+    def test_batch_no_files_exits_with_error(self, monkeypatch, tmp_path, capsys):
+        """An empty source exits with code 1."""
+        monkeypatch.setattr(sys, "argv", ["cv-build", "batch", str(tmp_path)])
+
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        assert "No data files found" in capsys.readouterr().out
+
+    def test_batch_compile_uses_jobs(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, fake_pdflatex, capsys
+    ):
+        """--compile --jobs compiles every built document."""
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "cv-build",
+                "batch",
+                str(tmp_data_dir),
+                "-t",
+                "test_template",
+                "--compile",
+                "--jobs",
+                "2",
+            ],
+        )
+
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main()
+
+        captured = capsys.readouterr()
+        assert "✓ Compiled" in captured.out
+        assert (tmp_data_dir / "test_template.pdf").exists()
+
+    def test_batch_streams_to_stdout(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsysbinary
+    ):
+        """``-o -`` writes the documents to stdout and messages to stderr."""
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["cv-build", "batch", str(tmp_data_dir), "-t", "test_template", "-o", "-"],
+        )
+
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main()
+
+        captured = capsysbinary.readouterr()
+        assert b"Software Engineer at Tech Corp" in captured.out
+        assert b"Built 1/1 document(s)" in captured.err
+        assert b"-> stdout" in captured.err
+        assert not (tmp_data_dir / "test_template.tex").exists()
+
+    def test_batch_stream_rejects_compile(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsys
+    ):
+        """Streaming to stdout cannot be combined with --compile."""
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["cv-build", "batch", str(tmp_data_dir), "-o", "-", "--compile"],
+        )
+
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        assert "need an output directory" in capsys.readouterr().err
+
+    def test_options_before_batch_are_kept(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, fake_pdflatex, capsys
+    ):
+        """``cv-build --compile batch SRC`` compiles like ``batch SRC --compile``."""
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "cv-build",
+                "--compile",
+                "batch",
+                str(tmp_data_dir),
+                "-t",
+                "test_template",
+            ],
+        )
+
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main()
+
+        assert "✓ Compiled" in capsys.readouterr().out
+        assert (tmp_data_dir / "test_template.pdf").exists()
+
+    def test_batch_options_override_global(self):
+        args = build_parser().parse_args(
+            ["--force", "--max-passes", "5", "batch", "src", "--max-passes", "2"]
+        )
+        assert (args.force, args.compile, args.max_passes) == (True, False, 2)
+
+    @pytest.mark.parametrize(
+        "argv, expected",
+        [
+            (["--skip-validation", "serve"], (True, False, 3)),
+            (["--max-passes", "5", "--preamble-format", "serve"], (False, True, 5)),
+            (["--max-passes", "5", "serve", "--max-passes", "2"], (False, False, 2)),
+            (["serve", "--skip-validation"], (True, False, 3)),
+        ],
+    )
+    def test_options_before_serve_are_kept(self, argv, expected):
+        args = build_parser().parse_args(argv)
+        assert (args.skip_validation, args.preamble_format, args.max_passes) == (
+            expected
+        )
+
+    @pytest.mark.parametrize(
+        "option, value",
+        [
+            ("--timings", "-"),
+            ("--profile", Path("cv-build.prof")),
+        ],
+    )
+    def test_optional_value_leaves_subcommand(self, option, value):
+        """An option with an optional value does not take ``batch`` as it."""
+        args = build_parser().parse_args([option, "batch", "many"])
+        assert (args.command, args.source) == ("batch", "many")
+        assert getattr(args, option[2:]) == value
+
+    def test_cache_option_before_subcommand(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("CV_BUILDER_CACHE_DIR", str(tmp_path))
+        args = build_parser().parse_args(["--pdf-cache", "batch", "many"])
+        assert args.pdf_cache == tmp_path / "pdf"
+        assert args.source == "many"
+
+
+# =============================================================================
+# incremental build tests
+# =============================================================================
+@pytest.mark.unit
+class TestIncrementalCli:
+    """Tests for the build manifest flags (--force, --plan)."""
+
+    def _run(self, monkeypatch, tmp_template_dir, tmp_data_dir, *extra):
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "cv-build",
+                "--template",
+                "test_template",
+                "--data",
+                str(tmp_data_dir.parent),
+                *extra,
+            ],
+        )
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main()
+
+    def test_unchanged_build_is_skipped(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsys
+    ):
+        """A second build with unchanged inputs does nothing."""
+        self._run(monkeypatch, tmp_template_dir, tmp_data_dir)
+        capsys.readouterr()
+
+        self._run(monkeypatch, tmp_template_dir, tmp_data_dir)
+        captured = capsys.readouterr()
+        assert "is up to date" in captured.out
+        assert "Generated" not in captured.out
+
+    def test_force_rebuilds(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsys
+    ):
+        """--force rebuilds even when up to date."""
+        self._run(monkeypatch, tmp_template_dir, tmp_data_dir)
+        capsys.readouterr()
+
+        self._run(monkeypatch, tmp_template_dir, tmp_data_dir, "--force")
+        assert "Generated" in capsys.readouterr().out
+
+    def test_plan_does_not_build(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsys
+    ):
+        """--plan reports what would be rebuilt without writing anything."""
+        self._run(monkeypatch, tmp_template_dir, tmp_data_dir, "--plan")
+
+        captured = capsys.readouterr()
+        assert "Would rebuild" in captured.out
+        assert "not built before" in captured.out
+        assert not (tmp_data_dir / "test_template.tex").exists()
+
+    def test_batch_plan_counts(
+        self, monkeypatch, tmp_template_dir, tmp_data_dir, capsys
+    ):
+        """batch --dry-run summarises stale and current documents."""
+        self._run(monkeypatch, tmp_template_dir, tmp_data_dir)
+        (tmp_data_dir / "other.json").write_text(
+            (tmp_data_dir / "test_template.json").read_text()
+        )
+        capsys.readouterr()
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "cv-build",
+                "batch",
+                str(tmp_data_dir),
+                "-t",
+                "test_template",
+                "--dry-run",
+            ],
+        )
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main()
+
+        captured = capsys.readouterr()
+        assert "1 to rebuild, 1 up to date" in captured.out
+        assert not (tmp_data_dir / "other.tex").exists()
+
+
+# =============================================================================
+# multi-template build tests
+# =============================================================================
+@pytest.mark.unit
+class TestMultiTemplateCli:
+    """Tests for ``--template a,b`` and ``--all-templates``."""
+
+    @pytest.fixture
+    def two_templates(self, tmp_template_dir):
+        """A second template ``other`` sharing the first one's schema."""
+        import shutil
+
+        other = tmp_template_dir.parent / "other"
+        shutil.copytree(tmp_template_dir, other)
+        return tmp_template_dir.parent
+
+    @pytest.fixture
+    def data_file(self, tmp_path, sample_cv_data):
+        import json
+
+        path = tmp_path / "cv.json"
+        path.write_text(json.dumps(sample_cv_data), encoding="utf-8")
+        return path
+
+    def test_parses_and_validates_once(
+        self, two_templates, data_file, tmp_path, capsys, run_cli
+    ):
+        """One data file and one schema: parsed once, validated once."""
+        from cv_builder import cli
+
+        data_dir = tmp_path / "out"
+        with (
+            patch.object(cli, "load_json", wraps=cli.load_json) as load,
+            patch.object(cli, "validate_cv", wraps=cli.validate_cv) as validate,
+        ):
+            run_cli(
+                "--template",
+                "test_template,other",
+                "--data",
+                str(data_dir),
+                "--data-file",
+                str(data_file),
+            )
+
+        assert load.call_count == 1
+        assert validate.call_count == 1
+        assert (data_dir / "test_template" / "test_template.tex").exists()
+        assert (data_dir / "other" / "other.tex").exists()
+        assert "Done!" in capsys.readouterr().out
+
+    def test_distinct_schemas_validated_separately(
+        self, two_templates, data_file, tmp_path, run_cli
+    ):
+        """A template with a different schema validates the data again."""
+        from cv_builder import cli
+
+        schema = two_templates / "other" / "schema.json"
+        schema.write_text(schema.read_text().replace('"object"', '"object" '))
+        with patch.object(cli, "validate_cv", wraps=cli.validate_cv) as validate:
+            run_cli(
+                "-t",
+                "test_template,other",
+                "--data",
+                str(tmp_path / "out"),
+                "--data-file",
+                str(data_file),
+            )
+
+        assert validate.call_count == 2
+
+    def test_all_templates(self, two_templates, data_file, tmp_path, run_cli):
+        """--all-templates builds every template directory."""
+        data_dir = tmp_path / "out"
+        run_cli(
+            "--all-templates",
+            "--data",
+            str(data_dir),
+            "--data-file",
+            str(data_file),
+        )
+
+        assert sorted(p.name for p in data_dir.glob("*/*.tex")) == [
+            "other.tex",
+            "test_template.tex",
+        ]
+
+    @pytest.mark.parametrize(
+        "option", [["-t", "test_template,other"], ["--all-templates"]]
+    )
+    def test_batch_rejects_several_templates(
+        self, two_templates, tmp_data_dir, capsys, run_cli, option
+    ):
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli(*option, "batch", str(tmp_data_dir))
+        assert exc_info.value.code == 1
+        assert "one template at a time" in capsys.readouterr().out
+
+    def test_missing_template_fails_after_building_others(
+        self, two_templates, data_file, tmp_path, capsys, run_cli
+    ):
+        """A missing template exits 1 but the others are still built."""
+        data_dir = tmp_path / "out"
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli(
+                "-t",
+                "nope,other",
+                "--data",
+                str(data_dir),
+                "--data-file",
+                str(data_file),
+            )
+
+        assert exc_info.value.code == 1
+        assert "Template 'nope' not found" in capsys.readouterr().out
+        assert (data_dir / "other" / "other.tex").exists()
@@ -1,20 +1,45 @@
 """Tests for cv_builder.core module."""
 
 import json
+import os
+import sys
+import threading
 from pathlib import Path
 
 import pytest
 from jinja2 import TemplateNotFound
 
 from cv_builder.core import (
+    DEFAULT_ESCAPE_CACHE_SIZE,
+    BoundedBytecodeCache,
+    _run_pass,
+    build_batch,
     build_variant,
+    cached_latex_escape,
+    clear_escape_cache,
+    clear_template_cache,
+    collect_validation_errors,
+    compile_many,
     compile_pdf,
+    configure_escape_cache,
     create_jinja_env,
+    create_validator,
+    describe_passes,
+    disable_bytecode_cache,
+    enable_bytecode_cache,
+    escape_cache_stats,
     filter_by_resume,
+    find_data_files,
     format_date_range,
+    get_jinja_env,
     get_responsibilities,
+    get_validator,
+    iter_rendered,
     latex_escape,
     load_json,
+    load_template,
+    run_pdflatex,
+    stream_variant,
     validate_cv,
 )
 
@@ -125,6 +150,72 @@ class TestValidateCv:
         captured = capsys.readouterr()
         assert "Path:" in captured.out
 
+    def test_reports_every_error(self, capsys):
+        """All errors are reported in one pass, not just the first."""
+        schema = {
+            "type": "object",
+            "required": ["a", "b"],
+            "properties": {"c": {"type": "integer"}},
+        }
+        result = validate_cv({"c": "x"}, schema)
+        assert result is False
+        captured = capsys.readouterr()
+        assert "3 error(s)" in captured.out
+        assert "'a' is a required property" in captured.out
+        assert "'b' is a required property" in captured.out
+
+    def test_accepts_prebuilt_validator(self, sample_cv_data, valid_schema):
+        """A validator from create_validator can be passed instead of a schema."""
+        validator = create_validator(valid_schema)
+        assert validate_cv(sample_cv_data, validator) is True
+
+
+# =============================================================================
+# validator cache tests
+# =============================================================================
+@pytest.mark.unit
+class TestValidatorCache:
+    """Tests for create_validator, get_validator and error collection."""
+
+    def test_invalid_schema_rejected_once(self):
+        """The schema itself is checked when the validator is built."""
+        from jsonschema.exceptions import SchemaError
+
+        with pytest.raises(SchemaError):
+            create_validator({"type": "not-a-type"})
+
+    def test_format_checker_attached(self):
+        """format keywords are enforced."""
+        validator = create_validator({"type": "string", "format": "email"})
+        assert collect_validation_errors("not-an-email", validator)
+        assert not collect_validation_errors("a@example.com", validator)
+
+    def test_cached_by_path_and_mtime(self, tmp_template_dir: Path):
+        """The same validator is returned until schema.json changes."""
+        schema_file = tmp_template_dir / "schema.json"
+        validator = get_validator(schema_file)
+        assert get_validator(schema_file) is validator
+
+        schema_file.write_text('{"type": "object", "required": ["x"]}')
+        os.utime(schema_file, ns=(1, 1))
+        changed = get_validator(schema_file)
+        assert changed is not validator
+        assert collect_validation_errors({}, changed)
+
+    def test_errors_sorted_by_path(self):
+        """Errors come back in a stable, path-sorted order."""
+        validator = create_validator(
+            {
+                "type": "object",
+                "properties": {
+                    "b": {"type": "integer"},
+                    "a": {"type": "integer"},
+                },
+            }
+        )
+        errors = collect_validation_errors({"b": "x", "a": "y"}, validator)
+        assert [list(e.absolute_path) for e in errors] == [["a"], ["b"]]
+
 
 # =============================================================================
 # create_jinja_env tests
@@ -182,6 +273,68 @@ class TestCreateJinjaEnv:
         assert env.autoescape is False
 
 
+# =============================================================================
+# template cache tests
+# =============================================================================
+@pytest.mark.unit
+class TestTemplateCache:
+    """Tests for the process-wide environment and template cache."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_template_cache()
+        yield
+        disable_bytecode_cache()
+
+    def test_same_env_until_file_changes(self, tmp_template_dir: Path):
+        """The cached environment is reused until a file changes."""
+        env = get_jinja_env(tmp_template_dir)
+        assert get_jinja_env(tmp_template_dir) is env
+
+        template_file = tmp_template_dir / "template.tex.j2"
+        template_file.write_text("changed << cv.name >>", encoding="utf-8")
+        os.utime(template_file, ns=(1, 1))
+
+        assert get_jinja_env(tmp_template_dir) is not env
+
+    def test_compiled_template_is_reused(self, tmp_template_dir: Path):
+        """load_template returns the same compiled template object."""
+        assert load_template(tmp_template_dir) is load_template(tmp_template_dir)
+
+    def test_changed_template_is_recompiled(self, tmp_template_dir: Path):
+        """A modified template is picked up on the next load."""
+        template_file = tmp_template_dir / "template.tex.j2"
+        template_file.write_text("old", encoding="utf-8")
+        assert load_template(tmp_template_dir).render(cv={}) == "old"
+
+        template_file.write_text("new!", encoding="utf-8")
+        os.utime(template_file, ns=(2, 2))
+        assert load_template(tmp_template_dir).render(cv={}) == "new!"
+
+    def test_bytecode_cache_persists_templates(
+        self, tmp_template_dir: Path, tmp_path: Path
+    ):
+        """Enabling the bytecode cache writes compiled templates to disk."""
+        cache_dir = tmp_path / "bytecode"
+        enable_bytecode_cache(cache_dir)
+
+        load_template(tmp_template_dir)
+
+        assert len(list(cache_dir.glob("__cv_builder_*.cache"))) == 1
+
+    def test_bytecode_cache_evicts_oldest(self, tmp_path: Path):
+        """Entries above the size cap are evicted oldest first."""
+        cache = BoundedBytecodeCache(tmp_path, max_bytes=25)
+        for i, name in enumerate(["old", "mid", "new"]):
+            entry = tmp_path / f"__cv_builder_{name}.cache"
+            entry.write_bytes(b"x" * 10)
+            os.utime(entry, ns=(i * 10**9, i * 10**9))
+
+        assert cache.prune() == 1
+        remaining = sorted(p.name for p in tmp_path.glob("*.cache"))
+        assert remaining == ["__cv_builder_mid.cache", "__cv_builder_new.cache"]
+
+
 # =============================================================================
 # build_variant tests
 # =============================================================================
@@ -243,6 +396,181 @@ class TestBuildVariant:
         assert "Generated" in captured.out
 
 
+# =============================================================================
+# find_data_files tests
+# =============================================================================
+@pytest.mark.unit
+class TestFindDataFiles:
+    """Tests for find_data_files function."""
+
+    def test_single_file(self, tmp_path: Path):
+        """A file path resolves to itself."""
+        data_file = tmp_path / "cv.json"
+        data_file.write_text("{}")
+        assert find_data_files(data_file) == [data_file]
+
+    def test_directory_is_searched_recursively(self, tmp_path: Path):
+        """Directories are searched recursively, sorted, hidden files skipped."""
+        (tmp_path / "b").mkdir()
+        (tmp_path / "b" / "two.json").write_text("{}")
+        (tmp_path / "one.json").write_text("{}")
+        (tmp_path / ".hidden.json").write_text("{}")
+        (tmp_path / "notes.txt").write_text("")
+
+        result = find_data_files(tmp_path)
+        assert result == [tmp_path / "b" / "two.json", tmp_path / "one.json"]
+
+    def test_glob_pattern(self, tmp_path: Path):
+        """Glob patterns are expanded."""
+        for name in ("a.json", "b.json", "c.txt"):
+            (tmp_path / name).write_text("{}")
+        result = find_data_files(str(tmp_path / "*"))
+        assert [p.name for p in result] == ["a.json", "b.json"]
+
+    def test_no_match_returns_empty(self, tmp_path: Path):
+        assert find_data_files(str(tmp_path / "*.json")) == []
+
+
+# =============================================================================
+# build_batch tests
+# =============================================================================
+@pytest.mark.unit
+class TestBuildBatch:
+    """Tests for build_batch function."""
+
+    def _write_docs(self, directory: Path, cv_data: dict, count: int) -> list:
+        directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for i in range(count):
+            data = json.loads(json.dumps(cv_data))
+            data["experience"][0]["title"] = f"Engineer {i}"
+            path = directory / f"cv{i}.json"
+            path.write_text(json.dumps(data), encoding="utf-8")
+            files.append(path)
+        return files
+
+    def test_builds_every_document(
+        self, tmp_template_dir: Path, tmp_path: Path, sample_cv_data
+    ):
+        """Each data file is rendered next to itself."""
+        files = self._write_docs(tmp_path / "docs", sample_cv_data, 3)
+
+        results = list(build_batch(tmp_template_dir, files))
+
+        assert [r.ok for r in results] == [True, True, True]
+        for i, result in enumerate(results):
+            assert result.output == files[i].with_suffix(".tex")
+            assert f"Engineer {i}" in result.output.read_text()
+
+    def test_output_dir_mirrors_layout(
+        self, tmp_template_dir: Path, tmp_path: Path, sample_cv_data
+    ):
+        """With output_dir, outputs mirror the layout below the common parent."""
+        files = self._write_docs(tmp_path / "docs" / "a", sample_cv_data, 1)
+        files += self._write_docs(tmp_path / "docs" / "b", sample_cv_data, 1)
+        out = tmp_path / "out"
+
+        results = list(build_batch(tmp_template_dir, files, output_dir=out))
+
+        assert results[0].output == out / "a" / "cv0.tex"
+        assert results[1].output == out / "b" / "cv0.tex"
+        assert all(r.output.exists() for r in results)
+
+    def test_failures_do_not_stop_batch(
+        self, tmp_template_dir: Path, tmp_path: Path, sample_cv_data
+    ):
+        """Invalid and malformed documents are reported, others still build."""
+        files = self._write_docs(tmp_path / "docs", sample_cv_data, 1)
+        bad_json = tmp_path / "docs" / "bad.json"
+        bad_json.write_text("{invalid")
+        invalid = tmp_path / "docs" / "invalid.json"
+        invalid.write_text('{"personalInfo": {}}')
+
+        results = list(build_batch(tmp_template_dir, [bad_json, invalid] + files))
+
+        assert [r.ok for r in results] == [False, False, True]
+        assert "JSONDecodeError" in results[0].error
+        assert "experience" in results[1].error
+        assert results[1].output is None
+
+    def test_unchanged_output_not_rewritten(
+        self, tmp_template_dir: Path, tmp_path: Path, sample_cv_data
+    ):
+        """Re-rendering identical output leaves the file and its mtime alone."""
+        files = self._write_docs(tmp_path / "docs", sample_cv_data, 1)
+        first = list(build_batch(tmp_template_dir, files))[0]
+        os.utime(first.output, ns=(10**9, 10**9))
+
+        second = list(build_batch(tmp_template_dir, files))[0]
+
+        assert first.changed is True
+        assert second.changed is False
+        assert second.output.stat().st_mtime_ns == 10**9
+
+    def test_skip_validation(self, tmp_template_dir: Path, tmp_path: Path):
+        """validate=False renders data that does not match the schema."""
+        data_file = tmp_path / "min.json"
+        data_file.write_text('{"experience": []}')
+
+        results = list(build_batch(tmp_template_dir, [data_file], validate=False))
+        assert results[0].ok
+
+    def test_stream_writes_documents_in_order(
+        self, tmp_template_dir: Path, tmp_path: Path, sample_cv_data
+    ):
+        """With a stream, documents are written to it instead of files."""
+        import io
+
+        files = self._write_docs(tmp_path / "docs", sample_cv_data, 2)
+        stream = io.BytesIO()
+
+        results = list(build_batch(tmp_template_dir, files, stream=stream))
+
+        assert all(r.ok and r.output is None for r in results)
+        text = stream.getvalue().decode()
+        assert text.index("Engineer 0") < text.index("Engineer 1")
+        assert not list((tmp_path / "docs").glob("*.tex"))
+
+
+# =============================================================================
+# streaming render tests
+# =============================================================================
+@pytest.mark.unit
+class TestStreamingRender:
+    """Tests for iter_rendered and stream_variant."""
+
+    def test_chunks_match_render(self, tmp_template_dir: Path, sample_cv_data):
+        """Joined chunks are byte-identical to a full render."""
+        template = load_template(tmp_template_dir)
+        expected = template.render(cv=sample_cv_data).encode("utf-8")
+        for buffer_size in (1, 16, 1 << 16):
+            chunks = list(iter_rendered(template, sample_cv_data, buffer_size))
+            assert b"".join(chunks) == expected
+
+    def test_buffer_size_bounds_chunks(self, tmp_template_dir: Path, sample_cv_data):
+        """Small buffers yield several chunks; a large one yields one."""
+        template = load_template(tmp_template_dir)
+        assert len(list(iter_rendered(template, sample_cv_data, 8))) > 1
+        assert len(list(iter_rendered(template, sample_cv_data, 1 << 20))) == 1
+
+    def test_stream_flushes_each_chunk(self, tmp_template_dir: Path, sample_cv_data):
+        """Consumers see output as soon as each chunk is rendered."""
+        template = load_template(tmp_template_dir)
+        events = []
+
+        class Sink:
+            def write(self, data):
+                events.append(("write", len(data)))
+
+            def flush(self):
+                events.append(("flush", None))
+
+        written = stream_variant(template, sample_cv_data, Sink(), buffer_size=8)
+
+        assert written == sum(n for kind, n in events if kind == "write")
+        assert events[1::2] == [("flush", None)] * (len(events) // 2)
+
+
 # =============================================================================
 # compile_pdf tests
 # =============================================================================
@@ -262,17 +590,58 @@ class TestCompilePdf:
         assert result is True
         mock_pdflatex.assert_called_once()
 
-    def test_copies_sty_file(
+    def test_does_not_copy_sty_file(
         self, tmp_template_dir: Path, tmp_path: Path, mock_pdflatex
     ):
-        """Style file is copied to output directory."""
+        """Style files are found via TEXINPUTS instead of being copied."""
         tex_file = tmp_path / "test.tex"
         tex_file.write_text(r"\documentclass{article}")
 
         compile_pdf(tex_file, tmp_template_dir)
 
-        sty_file = tmp_path / "test_template.sty"
-        assert sty_file.exists()
+        assert not (tmp_path / "test_template.sty").exists()
+        texinputs = mock_pdflatex.call_args.kwargs["env"]["TEXINPUTS"]
+        assert texinputs.startswith(str(tmp_template_dir.resolve()))
+        assert texinputs.endswith(os.pathsep)
+
+    def test_only_pdf_lands_in_output_dir(
+        self, tmp_template_dir: Path, tmp_path: Path, fake_pdflatex
+    ):
+        """Intermediate files stay in the scratch directory."""
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        tex_file = output_dir / "test.tex"
+        tex_file.write_text(r"\documentclass{article}")
+
+        compile_pdf(tex_file, tmp_template_dir)
+
+        visible = sorted(p.name for p in output_dir.iterdir() if p.name[0] != ".")
+        assert visible == ["test.pdf", "test.tex"]
+
+    def test_keep_log(self, tmp_template_dir: Path, tmp_path: Path, mock_pdflatex):
+        """keep_log moves the pdflatex log next to the PDF."""
+        tex_file = tmp_path / "test.tex"
+        tex_file.write_text(r"\documentclass{article}")
+
+        compile_pdf(tex_file, tmp_template_dir, keep_log=True)
+
+        assert (tmp_path / "test.log").read_text() == "log"
+
+    def test_scratch_root_env_override(
+        self, tmp_template_dir: Path, tmp_path: Path, mock_pdflatex, monkeypatch
+    ):
+        """$CV_BUILDER_SCRATCH chooses where scratch directories are made."""
+        scratch = tmp_path / "scratch"
+        scratch.mkdir()
+        monkeypatch.setenv("CV_BUILDER_SCRATCH", str(scratch))
+        tex_file = tmp_path / "test.tex"
+        tex_file.write_text(r"\documentclass{article}")
+
+        compile_pdf(tex_file, tmp_template_dir)
+
+        cwd = Path(mock_pdflatex.call_args.kwargs["cwd"])
+        assert cwd.parent == scratch.resolve()
+        assert not cwd.exists()
 
     def test_compilation_failure_returns_false(
         self, tmp_template_dir: Path, tmp_path: Path, mock_pdflatex_failure, capsys
@@ -301,6 +670,214 @@ class TestCompilePdf:
         assert "pdflatex not found" in captured.out
 
 
+# =============================================================================
+# multi-pass compile driver tests
+# =============================================================================
+def _is_draft(call) -> bool:
+    return "-draftmode" in call.args[0]
+
+
+@pytest.mark.unit
+class TestCompileDriver:
+    """Tests for rerun detection in run_pdflatex."""
+
+    @pytest.fixture
+    def tex_file(self, tmp_path: Path) -> Path:
+        tex_file = tmp_path / "doc.tex"
+        tex_file.write_text(r"\documentclass{article}")
+        return tex_file
+
+    def test_single_pass_when_settled(
+        self, tex_file, tmp_template_dir, scripted_pdflatex
+    ):
+        """No rerun request means exactly one pass."""
+        mock_run = scripted_pdflatex("Output written on doc.pdf")
+
+        result = run_pdflatex(tex_file, tmp_template_dir)
+
+        assert result.passes == 1
+        assert result.converged
+        assert mock_run.call_count == 1
+
+    def test_rerun_message_triggers_second_pass(
+        self, tex_file, tmp_template_dir, scripted_pdflatex
+    ):
+        """'Rerun to get ...' in the log runs one more full pass."""
+        mock_run = scripted_pdflatex(
+            "Package rerunfilecheck Warning: Rerun to get outlines right",
+            "Output written on doc.pdf",
+        )
+
+        result = run_pdflatex(tex_file, tmp_template_dir)
+
+        assert result.passes == 2
+        assert not any(_is_draft(c) for c in mock_run.call_args_list)
+
+    def test_changed_aux_triggers_rerun(
+        self, tex_file, tmp_template_dir, tmp_path, scripted_pdflatex
+    ):
+        """A pre-existing .aux that changes means references moved."""
+        workdir = tmp_path / "work"
+        workdir.mkdir()
+        (workdir / "doc.aux").write_text("old")
+        scripted_pdflatex("AUX:new", "AUX:new")
+
+        result = run_pdflatex(tex_file, tmp_template_dir, workdir)
+
+        assert result.passes == 2
+
+    def test_unsettled_document_uses_draft_passes(
+        self, tex_file, tmp_template_dir, scripted_pdflatex
+    ):
+        """Intermediate passes use -draftmode, the final pass writes the PDF."""
+        rerun = "LaTeX Warning: Label(s) may have changed."
+        mock_run = scripted_pdflatex(rerun, rerun, rerun, "settled")
+
+        result = run_pdflatex(tex_file, tmp_template_dir, max_passes=5)
+
+        drafts = [_is_draft(c) for c in mock_run.call_args_list]
+        assert drafts == [False, False, True, True, False]
+        assert result.passes == 5
+        assert result.converged
+
+    @pytest.mark.parametrize(
+        "max_passes, drafts",
+        [
+            (3, [False, False, False]),
+            (4, [False, False, True, False]),
+        ],
+    )
+    def test_draft_passes_need_room(
+        self, tex_file, tmp_template_dir, scripted_pdflatex, max_passes, drafts
+    ):
+        """Drafts start at the third pass and never take the last one.
+
+        At the default limit of 3 every pass therefore writes the PDF.
+        """
+        rerun = "Rerun to get cross-references right."
+        mock_run = scripted_pdflatex(*[rerun] * 10)
+
+        run_pdflatex(tex_file, tmp_template_dir, max_passes=max_passes)
+
+        assert [_is_draft(c) for c in mock_run.call_args_list] == drafts
+
+    def test_max_passes_is_respected(
+        self, tex_file, tmp_template_dir, scripted_pdflatex
+    ):
+        """Never more than max_passes; the last one is never a draft."""
+        rerun = "Rerun to get cross-references right."
+        mock_run = scripted_pdflatex(*[rerun] * 10)
+
+        result = run_pdflatex(tex_file, tmp_template_dir, max_passes=3)
+
+        assert result.passes == 3
+        assert not result.converged
+        assert not _is_draft(mock_run.call_args_list[-1])
+        assert "stale" in describe_passes(result)
+
+    def test_max_passes_one_disables_reruns(
+        self, tex_file, tmp_template_dir, scripted_pdflatex
+    ):
+        scripted_pdflatex("Rerun to get outlines right")
+        result = run_pdflatex(tex_file, tmp_template_dir, max_passes=1)
+        assert result.passes == 1
+
+
+# =============================================================================
+# compile_many tests
+# =============================================================================
+@pytest.mark.unit
+class TestCompileMany:
+    """Tests for parallel compile_many."""
+
+    def _tex_files(self, tmp_path: Path, count: int) -> list:
+        files = []
+        for i in range(count):
+            tex_file = tmp_path / f"doc{i}.tex"
+            tex_file.write_text(r"\documentclass{article}")
+            files.append(tex_file)
+        return files
+
+    def test_compiles_every_file_in_order(
+        self, tmp_template_dir: Path, tmp_path: Path, fake_pdflatex
+    ):
+        """Results come back in input order with PDFs next to the sources."""
+        files = self._tex_files(tmp_path, 5)
+
+        results = list(compile_many(files, tmp_template_dir, jobs=3))
+
+        assert [r.tex_file for r in results] == [f.resolve() for f in files]
+        assert all(r.ok for r in results)
+        for tex_file in files:
+            assert tex_file.with_suffix(".pdf").read_bytes().endswith(
+                tex_file.stem.encode()
+            )
+
+    def test_each_job_uses_isolated_workdir(
+        self, tmp_template_dir: Path, tmp_path: Path, fake_pdflatex
+    ):
+        """Intermediate files never land next to the sources or collide."""
+        files = self._tex_files(tmp_path, 3)
+
+        list(compile_many(files, tmp_template_dir, jobs=3))
+
+        workdirs = {
+            call.kwargs["cwd"] for call in fake_pdflatex.call_args_list
+        }
+        assert len(workdirs) == 3
+        assert tmp_path.resolve() not in workdirs
+        assert not list(tmp_path.glob("*.aux"))
+        assert not list(tmp_path.glob("*.sty"))
+
+    def test_failures_reported_per_document(
+        self, tmp_template_dir: Path, tmp_path: Path, mock_pdflatex_failure
+    ):
+        """Failed compiles are reported with their log."""
+        files = self._tex_files(tmp_path, 2)
+
+        results = list(compile_many(files, tmp_template_dir, jobs=2))
+
+        assert [r.ok for r in results] == [False, False]
+        assert "File not found" in results[0].log
+
+    def test_pdflatex_not_found(
+        self, tmp_template_dir: Path, tmp_path: Path, mock_pdflatex_not_found
+    ):
+        """A missing pdflatex is reported as an error, not raised."""
+        results = list(compile_many(self._tex_files(tmp_path, 1), tmp_template_dir))
+        assert "pdflatex not found" in results[0].error
+
+    def test_unexpected_error_does_not_abort_batch(
+        self, tmp_template_dir: Path, tmp_path: Path, fake_pdflatex
+    ):
+        """An exception in one job becomes its error; the others still run."""
+        run = fake_pdflatex.side_effect
+
+        def flaky(cmd, **kwargs):
+            if Path(cmd[-1]).stem == "doc1":
+                raise UnicodeDecodeError("utf-8", b"\xc3", 0, 1, "truncated")
+            return run(cmd, **kwargs)
+
+        fake_pdflatex.side_effect = flaky
+        files = self._tex_files(tmp_path, 3)
+
+        results = list(compile_many(files, tmp_template_dir, jobs=2))
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].error.startswith("UnicodeDecodeError")
+
+    @pytest.mark.parametrize("cancel", [None, threading.Event()])
+    def test_split_utf8_in_output(self, tmp_path: Path, cancel):
+        """pdflatex output cut inside a UTF-8 sequence still decodes."""
+        command = [
+            sys.executable,
+            "-c",
+            "import sys; sys.stdout.buffer.write(b'caf\\xc3\\nxe9')",
+        ]
+        completed = _run_pass(command, tmp_path, dict(os.environ), cancel)
+        assert completed.stdout == "caf\ufffd\nxe9"
+
+
 # =============================================================================
 # latex_escape tests
 # =============================================================================
@@ -496,6 +1073,22 @@ class TestLatexEscapeEdgeCases:
         result = latex_escape(r"/latex{\cmd{a}{b}}")
         assert result == r"\cmd{a}{b}"
 
+    def test_nested_braces_any_depth(self):
+        """Raw LaTeX nesting is not limited to two levels."""
+        raw = r"\href{u}{\underline{\textbf{\emph{deep}}}}"
+        assert latex_escape(f"see /latex{{{raw}}} & more") == rf"see {raw} \& more"
+
+    def test_unbalanced_then_balanced_raw_latex(self):
+        """An unbalanced /latex{ is escaped, a later balanced one passes."""
+        result = latex_escape(r"/latex{ a & /latex{\&}")
+        assert result == r"/latex\{ a \& \&"
+
+    def test_adversarial_input_is_linear(self):
+        """Many unbalanced openings are handled without backtracking."""
+        text = "/latex{" * 20000 + "x"
+        result = latex_escape(text)
+        assert result == r"/latex\{" * 20000 + "x"
+
     def test_backslash_in_normal_text(self):
         """Backslash in normal text is preserved (not a special char)."""
         result = latex_escape(r"path\to\file")
@@ -516,3 +1109,63 @@ class TestLatexEscapeEdgeCases:
         """Non-string inputs return unchanged."""
         assert latex_escape(["a", "b"]) == ["a", "b"]
         assert latex_escape({"key": "val"}) == {"key": "val"}
+
+
+# =============================================================================
+# escape memo tests
+# =============================================================================
+@pytest.mark.unit
+class TestEscapeCache:
+    """Tests for cached_latex_escape and its counters."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_memo(self):
+        configure_escape_cache()
+        yield
+        configure_escape_cache()
+
+    def test_same_result_as_latex_escape(self):
+        for text in ["", "R&D 100%", r"SQL /latex{\&} NoSQL", "x" * 500]:
+            assert cached_latex_escape(text) == latex_escape(text)
+            assert cached_latex_escape(text) == latex_escape(text)
+
+    def test_counts_hits_and_misses(self):
+        cached_latex_escape("Tech Corp & Partners")
+        cached_latex_escape("Tech Corp & Partners")
+        cached_latex_escape("Berlin")
+        stats = escape_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+        assert stats["maxsize"] == DEFAULT_ESCAPE_CACHE_SIZE
+
+    def test_long_strings_bypass(self):
+        """Strings above max_length are escaped without being remembered."""
+        configure_escape_cache(max_length=10)
+        cached_latex_escape("a & b & c & d")
+        cached_latex_escape("a & b & c & d")
+        stats = escape_cache_stats()
+        assert (stats["bypassed"], stats["size"], stats["misses"]) == (2, 0, 0)
+
+    def test_size_zero_disables(self):
+        configure_escape_cache(0)
+        assert cached_latex_escape("R&D") == r"R\&D"
+        assert cached_latex_escape("R&D") == r"R\&D"
+        stats = escape_cache_stats()
+        assert (stats["hits"], stats["size"]) == (0, 0)
+
+    def test_non_strings_unchanged(self):
+        assert cached_latex_escape(None) is None
+        assert cached_latex_escape(["a&b"]) == ["a&b"]
+        assert escape_cache_stats()["misses"] == 0
+
+    def test_clear(self):
+        cached_latex_escape("R&D")
+        clear_escape_cache()
+        stats = escape_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (0, 0, 0)
+
+    def test_latex_filter_uses_memo(self):
+        template = create_jinja_env(Path(".")).from_string("<< x | latex >>")
+        assert template.render(x="R&D") == r"R\&D"
+        assert template.render(x="R&D") == r"R\&D"
+        assert escape_cache_stats()["hits"] >= 1
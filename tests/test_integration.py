@@ -13,6 +13,7 @@ from cv_builder.core import (
     build_variant,
     create_jinja_env,
     load_json,
+    render_variant,
     validate_cv,
 )
 
@@ -77,7 +78,7 @@ class TestJinjaEnvironmentIntegration:
         env = create_jinja_env(template_dir)
 
         template = env.get_template("template.tex.j2")
-        output = template.render(cv=sample_cv_data)
+        output = render_variant(template, sample_cv_data)
 
         # Basic sanity checks
         assert len(output) > 100
@@ -124,7 +125,7 @@ class TestJinjaEnvironmentIntegration:
             "footer": {"value": "", "inResume": False},
         }
 
-        output = template.render(cv=cv_data)
+        output = render_variant(template, cv_data)
 
         # Location field has | latex filter applied
         assert r"New York \& LA" in output
@@ -163,7 +164,7 @@ class TestJinjaEnvironmentIntegration:
             "footer": {"value": "", "inResume": False},
         }
 
-        output = template.render(cv=cv_data)
+        output = render_variant(template, cv_data)
 
         # Raw LaTeX should pass through as \& (not \\&)
         assert r"Python \& SQL" in output
@@ -0,0 +1,136 @@
+"""Tests for cv_builder.jsonio module."""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from cv_builder import jsonio
+from cv_builder.jsonio import json_backend, load_json, set_json_backend
+
+FAST_BACKENDS = [
+    pytest.param(
+        name,
+        marks=pytest.mark.skipif(
+            importlib.util.find_spec(name) is None, reason=f"{name} not installed"
+        ),
+    )
+    for name in ("orjson", "msgspec")
+]
+
+# Documents the fast parsers reject or read differently from the stdlib
+EDGE_CASES = {
+    "plain": b'{"name": "Ada", "tags": ["a", "b"], "n": 1.5, "x": null}',
+    "unicode": '{"name": "Zoë Ünal — 履歴書"}'.encode(),
+    "nan": b'{"score": NaN, "max": Infinity}',
+    "big int": b'{"id": 123456789012345678901234567890}',
+    "u64 overflow": b'{"id": 18446744073709551616, "neg": -9223372036854775809}',
+    "infinity literal": b'{"x": 1e400}',
+    "lone surrogate": b'{"x": "\\ud800"}',
+    "duplicate keys": b'{"a": 1, "a": 2}',
+    "crlf": b'{\r\n  "a": 1,\r\n  "b": "two"\r\n}\r\n',
+}
+
+INVALID = {
+    "truncated": b'{"a": 1',
+    "empty": b"",
+    "bom": b'\xef\xbb\xbf{"a": 1}',
+    "trailing data": b'{"a": 1} x',
+    "control char": b'{"a": "\x01"}',
+    "crlf error": b'{\r\n  "a": 1,\r\n  "b": oops\r\n}',
+}
+
+
+def _stdlib(path: Path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _error(func, path: Path):
+    with pytest.raises(json.JSONDecodeError) as exc_info:
+        func(path)
+    error = exc_info.value
+    return error.msg, error.lineno, error.colno, error.pos
+
+
+@pytest.fixture(autouse=True)
+def _restore_backend():
+    yield
+    jsonio._backend = None
+
+
+# =============================================================================
+# backend selection tests
+# =============================================================================
+@pytest.mark.unit
+class TestBackendSelection:
+    """Tests for set_json_backend and json_backend."""
+
+    def test_auto_prefers_installed_fast_backend(self):
+        """auto picks the first installed backend in BACKENDS order."""
+        name = set_json_backend("auto")
+        assert name in jsonio.BACKENDS
+        assert json_backend() == name
+
+    def test_force_stdlib(self):
+        assert set_json_backend("json") == "json"
+
+    def test_environment_variable(self, monkeypatch):
+        """CV_BUILDER_JSON_BACKEND chooses the backend on first use."""
+        monkeypatch.setenv("CV_BUILDER_JSON_BACKEND", "json")
+        jsonio._backend = None
+        assert json_backend() == "json"
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            set_json_backend("yaml")
+
+
+# =============================================================================
+# parity tests
+# =============================================================================
+@pytest.mark.unit
+class TestLoadJsonParity:
+    """Fast backends must match json.load in results and errors."""
+
+    @pytest.fixture(params=["json", *FAST_BACKENDS])
+    def backend(self, request):
+        set_json_backend(request.param)
+        return request.param
+
+    @pytest.fixture(params=[False, True], ids=["read", "mmap"])
+    def mapped(self, request, monkeypatch):
+        if request.param:
+            monkeypatch.setattr(jsonio, "MMAP_THRESHOLD", 1)
+        return request.param
+
+    @pytest.mark.parametrize("case", EDGE_CASES)
+    def test_same_result(self, backend, mapped, tmp_path, case):
+        path = tmp_path / "cv.json"
+        path.write_bytes(EDGE_CASES[case])
+        # Compare serialised: NaN != NaN, and 1e29 == 10**29 would hide a float
+        assert json.dumps(load_json(path)) == json.dumps(_stdlib(path))
+
+    @pytest.mark.parametrize("case", INVALID)
+    def test_same_error(self, backend, mapped, tmp_path, case):
+        path = tmp_path / "cv.json"
+        path.write_bytes(INVALID[case])
+        assert _error(load_json, path) == _error(_stdlib, path)
+
+    def test_missing_file(self, backend, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_json(tmp_path / "missing.json")
+
+    def test_invalid_utf8(self, backend, tmp_path):
+        path = tmp_path / "cv.json"
+        path.write_bytes(b'{"a": "\xff"}')
+        with pytest.raises(UnicodeDecodeError):
+            load_json(path)
+
+    def test_large_file_is_mapped(self, backend, tmp_path, sample_cv_data):
+        """A document above MMAP_THRESHOLD loads the same as a small one."""
+        cv = dict(sample_cv_data, padding="x" * jsonio.MMAP_THRESHOLD)
+        path = tmp_path / "cv.json"
+        path.write_text(json.dumps(cv), encoding="utf-8")
+        assert load_json(path) == cv
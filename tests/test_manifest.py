@@ -0,0 +1,163 @@
+"""Tests for cv_builder.manifest module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cv_builder.core import build_batch
+from cv_builder.manifest import MANIFEST_NAME, ManifestStore, file_digest
+
+
+@pytest.fixture
+def data_file(tmp_data_dir: Path) -> Path:
+    return tmp_data_dir / "test_template.json"
+
+
+@pytest.fixture
+def output_file(tmp_data_dir: Path) -> Path:
+    return tmp_data_dir / "test_template.tex"
+
+
+# =============================================================================
+# file_digest tests
+# =============================================================================
+@pytest.mark.unit
+class TestFileDigest:
+    """Tests for file_digest function."""
+
+    def test_same_bytes_same_digest(self, tmp_path: Path):
+        a, b = tmp_path / "a", tmp_path / "b"
+        a.write_bytes(b"same")
+        b.write_bytes(b"same")
+        assert file_digest(a) == file_digest(b)
+
+    def test_different_bytes_different_digest(self, tmp_path: Path):
+        a, b = tmp_path / "a", tmp_path / "b"
+        a.write_bytes(b"one")
+        b.write_bytes(b"two")
+        assert file_digest(a) != file_digest(b)
+
+
+# =============================================================================
+# ManifestStore tests
+# =============================================================================
+@pytest.mark.unit
+class TestManifestStore:
+    """Tests for ManifestStore."""
+
+    def _record(self, template_dir, data_file, output_file, **kwargs):
+        output_file.write_text("tex")
+        store = ManifestStore(template_dir, **kwargs)
+        store.record(data_file, output_file)
+        store.save()
+
+    def test_unknown_output_is_stale(self, tmp_template_dir, data_file, output_file):
+        store = ManifestStore(tmp_template_dir)
+        assert store.stale_reason(data_file, output_file) == "not built before"
+
+    def test_recorded_output_is_up_to_date(
+        self, tmp_template_dir, data_file, output_file
+    ):
+        self._record(tmp_template_dir, data_file, output_file)
+
+        store = ManifestStore(tmp_template_dir)
+        assert store.stale_reason(data_file, output_file) is None
+        assert (output_file.parent / MANIFEST_NAME).exists()
+
+    @pytest.mark.parametrize(
+        "change, reason",
+        [
+            ("data", "data changed"),
+            ("template", "template changed"),
+            ("schema", "schema changed"),
+            ("sty", "styles changed"),
+        ],
+    )
+    def test_changed_input_is_detected(
+        self, tmp_template_dir, data_file, output_file, change, reason
+    ):
+        self._record(tmp_template_dir, data_file, output_file)
+        target = {
+            "data": data_file,
+            "template": tmp_template_dir / "template.tex.j2",
+            "schema": tmp_template_dir / "schema.json",
+            "sty": tmp_template_dir / "test_template.sty",
+        }[change]
+        target.write_text(target.read_text() + " ")
+
+        store = ManifestStore(tmp_template_dir)
+        assert store.stale_reason(data_file, output_file) == reason
+
+    def test_version_change_is_detected(
+        self, tmp_template_dir, data_file, output_file, monkeypatch
+    ):
+        self._record(tmp_template_dir, data_file, output_file)
+        monkeypatch.setattr("cv_builder.manifest.__version__", "999")
+
+        store = ManifestStore(tmp_template_dir)
+        assert store.stale_reason(data_file, output_file) == (
+            "cv-builder version changed"
+        )
+
+    def test_missing_output_is_stale(self, tmp_template_dir, data_file, output_file):
+        self._record(tmp_template_dir, data_file, output_file)
+        output_file.unlink()
+
+        store = ManifestStore(tmp_template_dir)
+        assert store.stale_reason(data_file, output_file) == "output missing"
+
+    def test_pdf_required_until_recorded(
+        self, tmp_template_dir, data_file, output_file
+    ):
+        self._record(tmp_template_dir, data_file, output_file)
+        store = ManifestStore(tmp_template_dir, require_pdf=True)
+        assert store.stale_reason(data_file, output_file) == "PDF missing"
+
+        output_file.with_suffix(".pdf").write_bytes(b"%PDF")
+        store.record_pdf(output_file)
+        store.save()
+        store = ManifestStore(tmp_template_dir, require_pdf=True)
+        assert store.stale_reason(data_file, output_file) is None
+
+    def test_corrupt_manifest_rebuilds(
+        self, tmp_template_dir, data_file, output_file
+    ):
+        output_file.write_text("tex")
+        (output_file.parent / MANIFEST_NAME).write_text("{not json")
+
+        store = ManifestStore(tmp_template_dir)
+        assert store.stale_reason(data_file, output_file) == "not built before"
+
+
+@pytest.mark.unit
+class TestIncrementalBatch:
+    """build_batch with a manifest skips unchanged documents."""
+
+    def _run(self, template_dir, data_file, **kwargs):
+        store = ManifestStore(template_dir)
+        results = list(build_batch(template_dir, [data_file], manifest=store, **kwargs))
+        store.save()
+        return results[0]
+
+    def test_second_run_skips_unchanged(self, tmp_template_dir, data_file):
+        assert not self._run(tmp_template_dir, data_file).skipped
+
+        second = self._run(tmp_template_dir, data_file)
+        assert second.skipped
+        assert second.ok
+
+        forced = self._run(tmp_template_dir, data_file, force=True)
+        assert not forced.skipped
+        assert forced.reason == "forced"
+
+    def test_changed_document_is_rebuilt(self, tmp_template_dir, data_file):
+        self._run(tmp_template_dir, data_file)
+
+        data = json.loads(data_file.read_text())
+        data["experience"][0]["title"] = "Staff Engineer"
+        data_file.write_text(json.dumps(data))
+
+        result = self._run(tmp_template_dir, data_file)
+        assert result.reason == "data changed"
+        assert "Staff Engineer" in result.output.read_text()
@@ -0,0 +1,227 @@
+"""Tests for cv_builder.ndjson module."""
+
+import copy
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from cv_builder.ndjson import (
+    RejectLog,
+    build_ndjson,
+    is_ndjson,
+    iter_lines,
+    lookup,
+    output_name,
+)
+
+
+def _person(base: dict, name: str, title: str = "Engineer") -> dict:
+    cv = copy.deepcopy(base)
+    cv["personalInfo"]["name"] = name
+    cv["experience"][0]["title"] = title
+    return cv
+
+
+@pytest.fixture
+def export(tmp_path, sample_cv_data) -> Path:
+    """NDJSON export with good records, a blank line and three bad records."""
+    lines = [
+        json.dumps(_person(sample_cv_data, "Ada Lovelace", "Analyst")),
+        "",
+        json.dumps(_person(sample_cv_data, "Zoë Ünal")),
+        "{not json",
+        json.dumps({"personalInfo": {}, "experience": []}),
+        json.dumps({"personalInfo": {"name": "No Experience"}}),
+        json.dumps(_person(sample_cv_data, "Ada  Lovelace", "Second")),
+    ]
+    path = tmp_path / "hr.ndjson"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+# =============================================================================
+# helper tests
+# =============================================================================
+@pytest.mark.unit
+class TestHelpers:
+    """Tests for the NDJSON helpers."""
+
+    def test_is_ndjson(self, tmp_path):
+        for name in ("a.ndjson", "a.jsonl", "a.JSONL"):
+            (tmp_path / name).write_text("")
+            assert is_ndjson(tmp_path / name)
+        (tmp_path / "a.json").write_text("")
+        assert not is_ndjson(tmp_path / "a.json")
+        assert not is_ndjson(tmp_path / "missing.ndjson")
+
+    def test_iter_lines_numbers_and_skips_blank(self, tmp_path):
+        path = tmp_path / "a.ndjson"
+        path.write_bytes(b'{"a": 1}\r\n\n  \n{"b": 2}')
+        assert list(iter_lines(path)) == [(1, b'{"a": 1}'), (4, b'{"b": 2}')]
+
+    def test_lookup(self):
+        record = {"personalInfo": {"name": "Ada"}}
+        assert lookup(record, "personalInfo.name") == "Ada"
+        with pytest.raises(ValueError, match="missing name key"):
+            lookup(record, "personalInfo.email")
+        with pytest.raises(ValueError):
+            lookup(record, "personalInfo.name.first")
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("Ada Lovelace", "ada-lovelace"),
+            ("Zoë Ünal", "zoe-unal"),
+            ("../../etc/passwd", "etc-passwd"),
+            (42, "42"),
+            ("履歴書", ""),
+        ],
+    )
+    def test_output_name(self, value, expected):
+        assert output_name(value) == expected
+
+    def test_reject_log_created_lazily(self, tmp_path):
+        path = tmp_path / "rejects.ndjson"
+        with RejectLog(path) as rejects:
+            assert not path.exists()
+            rejects.add(3, "ValueError: bad", b"{oops")
+        assert rejects.count == 1
+        entry = json.loads(path.read_text())
+        assert entry == {"line": 3, "error": "ValueError: bad", "record": "{oops"}
+
+    def test_reject_log_drops_earlier_rejects(self, tmp_path):
+        path = tmp_path / "rejects.ndjson"
+        path.write_text('{"line": 1}\n{"line": 2}\n')
+        with RejectLog(path) as rejects:
+            pass
+        assert rejects.count == 0
+        assert not path.exists()
+
+
+# =============================================================================
+# build_ndjson tests
+# =============================================================================
+@pytest.mark.unit
+class TestBuildNdjson:
+    """Tests for build_ndjson."""
+
+    def test_builds_named_outputs_and_rejects(
+        self, tmp_template_dir, export, tmp_path, capsys
+    ):
+        """Good records are rendered, bad ones rejected with line numbers."""
+        out = tmp_path / "out"
+        with RejectLog(tmp_path / "rejects.ndjson") as rejects:
+            results = list(
+                build_ndjson(tmp_template_dir, export, out, rejects=rejects)
+            )
+
+        assert [r.line for r in results] == [1, 3, 4, 5, 6, 7]
+        assert [r.ok for r in results] == [True, True, False, False, False, True]
+        assert [r.output.name for r in results if r.ok] == [
+            "ada-lovelace.tex",
+            "zoe-unal.tex",
+            "ada-lovelace-2.tex",
+        ]
+        assert "Analyst at Tech Corp" in (out / "ada-lovelace.tex").read_text()
+        assert "Second at Tech Corp" in (out / "ada-lovelace-2.tex").read_text()
+
+        entries = [
+            json.loads(line)
+            for line in (tmp_path / "rejects.ndjson").read_text().splitlines()
+        ]
+        assert [e["line"] for e in entries] == [4, 5, 6]
+        assert "JSONDecodeError" in entries[0]["error"]
+        assert entries[0]["record"] == "{not json"
+        assert "missing name key 'personalInfo.name'" in entries[1]["error"]
+        assert "experience" in entries[2]["error"]
+
+    def test_default_output_dir(self, tmp_template_dir, export, capsys):
+        """Outputs default to a directory named after the export."""
+        results = list(build_ndjson(tmp_template_dir, export, validate=False))
+        assert results[0].output == export.parent / "hr" / "ada-lovelace.tex"
+
+    def test_custom_name_key(self, tmp_template_dir, tmp_path, sample_cv_data):
+        path = tmp_path / "a.jsonl"
+        path.write_text(json.dumps(dict(sample_cv_data, id="emp-0042")) + "\n")
+        (result,) = build_ndjson(tmp_template_dir, path, name_key="id")
+        assert result.output.name == "emp-0042.tex"
+
+    def test_stream(self, tmp_template_dir, export):
+        """With a stream the records are concatenated; no files are named."""
+        stream = io.BytesIO()
+        results = list(build_ndjson(tmp_template_dir, export, stream=stream))
+        assert all(r.output is None for r in results)
+        text = stream.getvalue().decode()
+        assert text.index("Analyst") < text.index("Second")
+
+    def test_results_are_lazy(self, tmp_template_dir, export, tmp_path):
+        """Records are built one at a time as results are consumed."""
+        out = tmp_path / "out"
+        results = build_ndjson(tmp_template_dir, export, out)
+        first = next(results)
+        assert first.ok
+        assert sorted(p.name for p in out.iterdir() if p.suffix == ".tex") == [
+            "ada-lovelace.tex"
+        ]
+
+
+# =============================================================================
+# CLI integration tests
+# =============================================================================
+@pytest.mark.integration
+class TestNdjsonCli:
+    """Tests for ``cv-build batch export.ndjson``."""
+
+    def test_batch_ndjson(self, export, tmp_path, capsys, run_cli):
+        """Rejects are reported and make the run exit with status 1."""
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli(
+                "batch",
+                str(export),
+                "-t",
+                "test_template",
+                "-o",
+                str(tmp_path / "out"),
+                "--reject",
+                str(tmp_path / "bad.ndjson"),
+            )
+        assert exc_info.value.code == 1
+        out = capsys.readouterr().out
+        assert f"✓ {export}:1 -> {tmp_path / 'out' / 'ada-lovelace.tex'}" in out
+        assert f"✗ {export}:4: JSONDecodeError" in out
+        assert f"3 record(s) rejected, see {tmp_path / 'bad.ndjson'}" in out
+        assert "Built 3/6 document(s)" in out
+        assert len((tmp_path / "bad.ndjson").read_text().splitlines()) == 3
+
+    def test_default_reject_file(self, tmp_path, sample_cv_data, capsys, run_cli):
+        export = tmp_path / "hr.jsonl"
+        export.write_text(json.dumps(sample_cv_data) + "\n[]\n")
+        with pytest.raises(SystemExit):
+            run_cli("batch", str(export), "-t", "test_template")
+        assert (tmp_path / "hr.rejects.ndjson").exists()
+        assert (tmp_path / "hr" / "john-doe.tex").exists()
+
+    def test_clean_rerun_clears_rejects(
+        self, tmp_path, sample_cv_data, capsys, run_cli
+    ):
+        export = tmp_path / "hr.jsonl"
+        export.write_text(json.dumps(sample_cv_data) + "\n[]\n")
+        with pytest.raises(SystemExit):
+            run_cli("batch", str(export), "-t", "test_template")
+        export.write_text(json.dumps(sample_cv_data) + "\n")
+        run_cli("batch", str(export), "-t", "test_template")
+        assert not (tmp_path / "hr.rejects.ndjson").exists()
+        assert "Built 1/1 document(s)" in capsys.readouterr().out
+
+    def test_plan_rejected(self, export, capsys, run_cli):
+        with pytest.raises(SystemExit):
+            run_cli(
+                "batch",
+                str(export),
+                "-t",
+                "test_template",
+                "--plan",
+            )
+        assert "need JSON data files" in capsys.readouterr().out
@@ -0,0 +1,193 @@
+"""Tests for cv_builder.outputs module."""
+
+import os
+import stat
+import threading
+from pathlib import Path
+
+import pytest
+
+from cv_builder.outputs import (
+    LOCK_NAME,
+    atomic_write,
+    install_file,
+    output_lock,
+    same_content,
+    write_chunks_if_changed,
+    write_if_changed,
+)
+
+
+# =============================================================================
+# write_if_changed tests
+# =============================================================================
+@pytest.mark.unit
+class TestWriteIfChanged:
+    """Tests for write_if_changed function."""
+
+    def test_creates_missing_file(self, tmp_path: Path):
+        target = tmp_path / "sub" / "out.tex"
+        assert write_if_changed(target, "content") is True
+        assert target.read_text() == "content"
+
+    def test_identical_content_keeps_mtime(self, tmp_path: Path):
+        """Unchanged bytes are not rewritten, so the mtime is preserved."""
+        target = tmp_path / "out.tex"
+        target.write_text("same")
+        os.utime(target, ns=(10**9, 10**9))
+
+        assert write_if_changed(target, "same") is False
+        assert target.stat().st_mtime_ns == 10**9
+
+    def test_changed_content_is_written(self, tmp_path: Path):
+        target = tmp_path / "out.tex"
+        target.write_text("old!")  # same size, different bytes
+        assert write_if_changed(target, "new!") is True
+        assert target.read_text() == "new!"
+
+    def test_no_temp_files_left(self, tmp_path: Path):
+        write_if_changed(tmp_path / "out.tex", "x")
+        names = {p.name for p in tmp_path.iterdir()}
+        assert names == {"out.tex", LOCK_NAME}
+
+    def test_new_file_has_regular_permissions(self, tmp_path: Path):
+        """Files are not left with mkstemp's private 0600 mode."""
+        target = tmp_path / "out.tex"
+        write_if_changed(target, "x")
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(target.stat().st_mode) == 0o666 & ~umask
+
+    def test_umask_applies_at_write_time(self, tmp_path: Path):
+        """The umask in effect when writing counts, not the one at import."""
+        umask = os.umask(0o077)
+        try:
+            write_chunks_if_changed(tmp_path / "out.tex", [b"x"])
+        finally:
+            os.umask(umask)
+        assert stat.S_IMODE((tmp_path / "out.tex").stat().st_mode) == 0o600
+
+    def test_utf8_encoding(self, tmp_path: Path):
+        target = tmp_path / "out.tex"
+        write_if_changed(target, "José")
+        assert target.read_bytes() == "José".encode("utf-8")
+
+
+@pytest.mark.unit
+class TestWriteChunksIfChanged:
+    """Tests for write_chunks_if_changed function."""
+
+    def test_writes_chunks(self, tmp_path: Path):
+        target = tmp_path / "out" / "cv.tex"
+        assert write_chunks_if_changed(target, [b"ab", b"", b"cd"]) is True
+        assert target.read_bytes() == b"abcd"
+
+    def test_same_content_in_other_chunks_not_rewritten(self, tmp_path: Path):
+        target = tmp_path / "cv.tex"
+        target.write_bytes(b"abcd")
+        os.utime(target, ns=(10**9, 10**9))
+        assert write_chunks_if_changed(target, iter([b"a", b"bcd"])) is False
+        assert target.stat().st_mtime_ns == 10**9
+        assert sorted(os.listdir(tmp_path)) == [LOCK_NAME, "cv.tex"]
+
+    def test_failing_producer_keeps_old_file(self, tmp_path: Path):
+        target = tmp_path / "cv.tex"
+        target.write_bytes(b"old")
+
+        def chunks():
+            yield b"new"
+            raise RuntimeError("render failed")
+
+        with pytest.raises(RuntimeError):
+            write_chunks_if_changed(target, chunks())
+        assert target.read_bytes() == b"old"
+        assert sorted(os.listdir(tmp_path)) == [LOCK_NAME, "cv.tex"]
+
+
+@pytest.mark.unit
+class TestAtomicWrite:
+    """Tests for atomic_write and same_content."""
+
+    def test_failed_write_keeps_old_file(self, tmp_path: Path, monkeypatch):
+        """A crash before the rename leaves the previous file intact."""
+        target = tmp_path / "out.tex"
+        target.write_text("old")
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail)
+        with pytest.raises(OSError):
+            atomic_write(target, b"new")
+
+        assert target.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.tex"]
+
+    def test_same_content(self, tmp_path: Path):
+        target = tmp_path / "f"
+        target.write_bytes(b"abc")
+        assert same_content(target, b"abc")
+        assert not same_content(target, b"abd")
+        assert not same_content(target, b"abcd")
+        assert not same_content(tmp_path / "missing", b"abc")
+
+
+@pytest.mark.unit
+class TestInstallFile:
+    """Tests for install_file function."""
+
+    def test_moves_file_into_place(self, tmp_path: Path):
+        src = tmp_path / "build" / "doc.pdf"
+        src.parent.mkdir()
+        src.write_bytes(b"%PDF")
+        dest = tmp_path / "out" / "doc.pdf"
+
+        install_file(src, dest)
+
+        assert dest.read_bytes() == b"%PDF"
+        assert not src.exists()
+
+    def test_cross_device_falls_back_to_copy(self, tmp_path: Path, monkeypatch):
+        src = tmp_path / "doc.pdf"
+        src.write_bytes(b"%PDF")
+        dest = tmp_path / "out" / "doc.pdf"
+        real_replace = os.replace
+
+        def replace(a, b):
+            if Path(a) == src:
+                raise OSError(18, "Invalid cross-device link")
+            return real_replace(a, b)
+
+        monkeypatch.setattr(os, "replace", replace)
+        install_file(src, dest)
+
+        assert dest.read_bytes() == b"%PDF"
+        assert not src.exists()
+
+
+@pytest.mark.unit
+class TestOutputLock:
+    """Tests for output_lock context manager."""
+
+    def test_creates_lock_file(self, tmp_path: Path):
+        with output_lock(tmp_path):
+            assert (tmp_path / LOCK_NAME).exists()
+
+    def test_serialises_writers(self, tmp_path: Path):
+        """Concurrent read-modify-write cycles under the lock lose no update."""
+        counter = tmp_path / "counter"
+        counter.write_text("0")
+
+        def bump():
+            for _ in range(50):
+                with output_lock(tmp_path):
+                    value = int(counter.read_text())
+                    counter.write_text(str(value + 1))
+
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.read_text() == "200"
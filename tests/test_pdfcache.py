@@ -0,0 +1,254 @@
+"""Tests for cv_builder.pdfcache module."""
+
+import os
+
+import pytest
+
+from cv_builder import pdfcache
+from cv_builder.cli import main
+from cv_builder.core import (
+    compile_many,
+    describe_passes,
+    disable_pdf_cache,
+    enable_pdf_cache,
+)
+from cv_builder.pdfcache import PdfCache, pdf_key
+
+
+@pytest.fixture(autouse=True)
+def _engine(monkeypatch):
+    """A fixed engine version, and no PDF cache left behind."""
+    monkeypatch.setattr(pdfcache, "tex_engine_version", lambda engine: "pdfTeX 3.14")
+    yield
+    disable_pdf_cache()
+
+
+@pytest.fixture
+def tex_file(tmp_template_dir, tmp_path):
+    path = tmp_path / "out" / "cv.tex"
+    path.parent.mkdir()
+    path.write_text("\\documentclass{article}\n")
+    return path
+
+
+def _age(path, seconds):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+# =============================================================================
+# pdf_key tests
+# =============================================================================
+@pytest.mark.unit
+class TestPdfKey:
+    """Tests for pdf_key."""
+
+    def test_stable(self, tex_file, tmp_template_dir):
+        assert pdf_key(tex_file, tmp_template_dir) == pdf_key(
+            tex_file, tmp_template_dir
+        )
+
+    def test_changes_with_tex(self, tex_file, tmp_template_dir):
+        before = pdf_key(tex_file, tmp_template_dir)
+        tex_file.write_text("\\documentclass{report}\n")
+        assert pdf_key(tex_file, tmp_template_dir) != before
+
+    def test_changes_with_styles(self, tex_file, tmp_template_dir):
+        before = pdf_key(tex_file, tmp_template_dir)
+        (tmp_template_dir / "extra.sty").write_text("% more\n")
+        assert pdf_key(tex_file, tmp_template_dir) != before
+
+    def test_changes_with_engine(self, tex_file, tmp_template_dir, monkeypatch):
+        before = pdf_key(tex_file, tmp_template_dir)
+        monkeypatch.setattr(pdfcache, "tex_engine_version", lambda engine: "new")
+        assert pdf_key(tex_file, tmp_template_dir) != before
+
+
+# =============================================================================
+# PdfCache tests
+# =============================================================================
+@pytest.mark.unit
+class TestPdfCache:
+    """Tests for PdfCache."""
+
+    def test_miss_then_hit(self, tmp_path):
+        cache = PdfCache(tmp_path / "cache")
+        dest = tmp_path / "out" / "cv.pdf"
+        assert not cache.get("ab" * 32, dest)
+        pdf = tmp_path / "built.pdf"
+        pdf.write_bytes(b"%PDF-1.5")
+        cache.put("ab" * 32, pdf)
+        assert cache.get("ab" * 32, dest)
+        assert dest.read_bytes() == b"%PDF-1.5"
+        assert os.path.samefile(dest, cache.entry("ab" * 32))  # hardlinked
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_hit_keeps_linked_outputs_mtime(self, tmp_path):
+        """Recording a hit must not touch outputs hardlinked to the entry."""
+        cache = PdfCache(tmp_path / "cache")
+        pdf = tmp_path / "built.pdf"
+        pdf.write_bytes(b"%PDF")
+        cache.put("ab" * 32, pdf)
+        first = tmp_path / "first.pdf"
+        cache.get("ab" * 32, first)
+        _age(first, 60)
+        before = (pdf.stat().st_mtime_ns, first.stat().st_mtime_ns)
+        cache.get("ab" * 32, tmp_path / "second.pdf")
+        assert (pdf.stat().st_mtime_ns, first.stat().st_mtime_ns) == before
+
+    def test_unmarked_entries_use_their_mtime(self, tmp_path):
+        cache = PdfCache(tmp_path / "cache", max_bytes=10**6)
+        for age, key in enumerate(["aa" * 32, "bb" * 32]):
+            pdf = tmp_path / f"{key}.pdf"
+            pdf.write_bytes(b"x" * 100)
+            cache.put(key, pdf)
+            cache.used_marker(key).unlink()
+            _age(cache.entry(key), 20 - age * 10)
+        assert cache.prune(max_bytes=100) == (1, 100)
+        assert cache.entry("bb" * 32).exists()
+
+    def test_copies_without_hardlinks(self, tmp_path, monkeypatch):
+        cache = PdfCache(tmp_path / "cache")
+        pdf = tmp_path / "built.pdf"
+        pdf.write_bytes(b"%PDF")
+
+        def no_link(src, dst):
+            raise OSError("cross-device link")
+
+        monkeypatch.setattr(os, "link", no_link)
+        cache.put("cd" * 32, pdf)
+        dest = tmp_path / "cv.pdf"
+        assert cache.get("cd" * 32, dest)
+        assert dest.read_bytes() == b"%PDF"
+        assert not os.path.samefile(dest, cache.entry("cd" * 32))
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        cache = PdfCache(tmp_path / "cache", max_bytes=10**6)
+        for age, key in enumerate(["aa" * 32, "bb" * 32, "cc" * 32]):
+            pdf = tmp_path / f"{key}.pdf"
+            pdf.write_bytes(b"x" * 100)
+            cache.put(key, pdf)
+            _age(cache.used_marker(key), 30 - age * 10)
+        cache.get("aa" * 32, tmp_path / "hit.pdf")  # now the most recent
+        assert cache.prune(max_bytes=200) == (1, 100)
+        assert not cache.entry("bb" * 32).exists()
+        assert not cache.used_marker("bb" * 32).exists()
+        assert cache.entry("aa" * 32).exists() and cache.entry("cc" * 32).exists()
+
+    def test_put_prunes_to_cap(self, tmp_path):
+        cache = PdfCache(tmp_path / "cache", max_bytes=150)
+        for key in ("aa" * 32, "bb" * 32):
+            pdf = tmp_path / f"{key}.pdf"
+            pdf.write_bytes(b"x" * 100)
+            cache.put(key, pdf)
+            _age(cache.used_marker(key), 10 if key == "aa" * 32 else 0)
+        assert cache.stats()["entries"] == 1
+        assert cache.entry("bb" * 32).exists()
+
+    def test_unwritable_cache_is_skipped(self, tmp_path, monkeypatch):
+        cache = PdfCache(tmp_path / "cache")
+        pdf = tmp_path / "built.pdf"
+        pdf.write_bytes(b"%PDF")
+
+        def fail(src, dest):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(pdfcache, "_link_or_copy", fail)
+        cache.put("ab" * 32, pdf)
+        assert not cache.entry("ab" * 32).exists()
+
+    def test_stats_and_clear(self, tmp_path):
+        cache = PdfCache(tmp_path / "cache", max_bytes=1000)
+        pdf = tmp_path / "built.pdf"
+        pdf.write_bytes(b"x" * 10)
+        cache.put("aa" * 32, pdf)
+        cache.put("bb" * 32, pdf)
+        stats = cache.stats()
+        assert (stats["entries"], stats["bytes"], stats["max_bytes"]) == (2, 20, 1000)
+        assert cache.clear() == 2
+        assert cache.stats()["entries"] == 0
+
+
+# =============================================================================
+# compile integration tests
+# =============================================================================
+@pytest.mark.unit
+class TestCompileWithCache:
+    """Compiles look up and fill the PDF cache when it is enabled."""
+
+    def test_second_compile_is_cached(
+        self, tex_file, tmp_template_dir, tmp_path, fake_pdflatex
+    ):
+        cache = enable_pdf_cache(tmp_path / "cache")
+        (first,) = compile_many([tex_file], tmp_template_dir)
+        calls = fake_pdflatex.call_count
+        tex_file.with_suffix(".pdf").unlink()
+
+        (second,) = compile_many([tex_file], tmp_template_dir)
+        assert first.ok and not first.cached
+        assert second.ok and second.cached
+        assert describe_passes(second) == "cached"
+        assert fake_pdflatex.call_count == calls
+        assert second.pdf_file.read_bytes() == b"%PDF-1.5 cv"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_changed_document_recompiles(
+        self, tex_file, tmp_template_dir, tmp_path, fake_pdflatex
+    ):
+        enable_pdf_cache(tmp_path / "cache")
+        next(compile_many([tex_file], tmp_template_dir))
+        tex_file.write_text("\\documentclass{report}\n")
+        (result,) = compile_many([tex_file], tmp_template_dir)
+        assert result.ok and not result.cached
+
+    def test_unconverged_not_cached(
+        self, tex_file, tmp_template_dir, tmp_path, scripted_pdflatex
+    ):
+        cache = enable_pdf_cache(tmp_path / "cache")
+        scripted_pdflatex("Rerun to get cross-references right.")
+        (result,) = compile_many([tex_file], tmp_template_dir, max_passes=1)
+        assert result.ok and not result.converged
+        assert cache.stats()["entries"] == 0
+
+
+# =============================================================================
+# CLI integration tests
+# =============================================================================
+@pytest.mark.integration
+class TestCacheCli:
+    """Tests for ``--pdf-cache`` and ``cv-build cache``."""
+
+    def test_batch_reuses_pdfs(
+        self, tmp_data_dir, tmp_path, fake_pdflatex, capsys, run_cli
+    ):
+        argv = [
+            "batch",
+            str(tmp_data_dir),
+            "-t",
+            "test_template",
+            "--compile",
+            "--force",
+            "--pdf-cache",
+            str(tmp_path / "cache"),
+        ]
+        run_cli(*argv)
+        calls = fake_pdflatex.call_count
+        run_cli(*argv)
+        assert fake_pdflatex.call_count == calls
+        assert "cached)" in capsys.readouterr().out
+
+    def test_stats_prune_clear(self, tmp_path, capsys):
+        cache = PdfCache(tmp_path / "cache")
+        pdf = tmp_path / "built.pdf"
+        pdf.write_bytes(b"x" * 1024)
+        cache.put("aa" * 32, pdf)
+        cache.put("bb" * 32, pdf)
+        directory = str(tmp_path / "cache")
+
+        main(["cache", "stats", "--dir", directory])
+        assert "2 PDF(s)" in capsys.readouterr().out
+        main(["cache", "prune", "--dir", directory, "--max-size", "0"])
+        assert "✓ Pruned 2 PDF(s)" in capsys.readouterr().out
+        cache.put("aa" * 32, pdf)
+        main(["cache", "clear", "--dir", directory])
+        assert "✓ Removed 1 PDF(s)" in capsys.readouterr().out
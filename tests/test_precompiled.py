@@ -0,0 +1,108 @@
+"""Tests for cv_builder.precompiled module."""
+
+import os
+
+import pytest
+from jinja2 import ChoiceLoader, FileSystemLoader, TemplateSyntaxError
+
+from cv_builder.core import clear_template_cache, create_jinja_env, load_template
+from cv_builder.precompiled import (
+    clean_compiled,
+    compiled_paths,
+    fresh_artifact,
+    precompile_template,
+)
+
+pytestmark = pytest.mark.usefixtures("fresh_template_cache")
+
+
+def _age(path, seconds=10):
+    """Make ``path`` older than the files written after it."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+# =============================================================================
+# precompile_template tests
+# =============================================================================
+@pytest.mark.unit
+class TestPrecompileTemplate:
+    """Tests for precompile_template and the loader it feeds."""
+
+    @pytest.mark.parametrize("zip", [False, True], ids=["modules", "zip"])
+    def test_renders_like_source(self, tmp_template_dir, sample_cv_data, zip):
+        expected = load_template(tmp_template_dir).render(cv=sample_cv_data)
+        target = precompile_template(tmp_template_dir, zip=zip)
+        assert target == compiled_paths(tmp_template_dir)[zip]
+        assert target.exists()
+        clear_template_cache()
+        template = load_template(tmp_template_dir)
+        assert isinstance(template.environment.loader, ChoiceLoader)
+        assert template.render(cv=sample_cv_data) == expected
+
+    def test_compiled_template_is_used(self, tmp_template_dir):
+        """A fresh artifact is loaded instead of compiling the source."""
+        source = tmp_template_dir / "template.tex.j2"
+        source.write_text("compiled")
+        _age(source)
+        precompile_template(tmp_template_dir)
+        source.write_text("edited")
+        _age(source)  # an edit the mtime check cannot see
+        assert load_template(tmp_template_dir).render(cv={}) == "compiled"
+
+    def test_stale_artifact_ignored(self, tmp_template_dir):
+        source = tmp_template_dir / "template.tex.j2"
+        _age(source)
+        precompile_template(tmp_template_dir, zip=True)
+        artifact = compiled_paths(tmp_template_dir)[1]
+        _age(artifact, 20)
+        assert fresh_artifact(tmp_template_dir) is None
+        env = create_jinja_env(tmp_template_dir)
+        assert isinstance(env.loader, FileSystemLoader)
+
+    def test_replaces_other_artifact(self, tmp_template_dir):
+        precompile_template(tmp_template_dir, zip=True)
+        precompile_template(tmp_template_dir)
+        modules, archive = compiled_paths(tmp_template_dir)
+        assert modules.is_dir() and not archive.exists()
+
+    def test_syntax_error_raised(self, tmp_template_dir):
+        (tmp_template_dir / "template.tex.j2").write_text("<% if %>")
+        with pytest.raises(TemplateSyntaxError):
+            precompile_template(tmp_template_dir)
+
+    def test_clean(self, tmp_template_dir):
+        target = precompile_template(tmp_template_dir)
+        assert clean_compiled(tmp_template_dir) == [target]
+        assert clean_compiled(tmp_template_dir) == []
+        assert fresh_artifact(tmp_template_dir) is None
+
+
+# =============================================================================
+# CLI integration tests
+# =============================================================================
+@pytest.mark.integration
+class TestPrecompileCli:
+    """Tests for ``cv-build precompile``."""
+
+    def test_compiles_every_template(self, tmp_template_dir, capsys, run_cli):
+        other = tmp_template_dir.parent / "other"
+        other.mkdir()
+        (other / "template.tex.j2").write_text("<< cv.name >>")
+        run_cli("precompile", "--zip")
+        out = capsys.readouterr().out
+        assert "✓ Compiled other" in out
+        assert "✓ Compiled test_template" in out
+        assert compiled_paths(other)[1].exists()
+
+    def test_clean(self, tmp_template_dir, capsys, run_cli):
+        run_cli("precompile", "-t", "test_template")
+        run_cli("precompile", "--clean")
+        assert "✓ Removed" in capsys.readouterr().out
+        assert fresh_artifact(tmp_template_dir) is None
+
+    def test_unknown_template(self, capsys, run_cli):
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli("precompile", "-t", "missing")
+        assert exc_info.value.code == 1
+        assert "✗ Template not found: missing" in capsys.readouterr().out
@@ -0,0 +1,277 @@
+"""Tests for cv_builder.serve module."""
+
+import http.client
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from cv_builder.serve import RenderService, drain, make_server
+
+pytestmark = pytest.mark.usefixtures("fresh_template_cache")
+
+
+@pytest.fixture
+def service(tmp_template_dir: Path) -> RenderService:
+    return RenderService(tmp_template_dir.parent, workers=2)
+
+
+@pytest.fixture
+def server(service):
+    """A running TCP server on a free port."""
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    if not service.draining:
+        drain(server)
+    thread.join()
+    server.server_close()
+
+
+def _request(server, method, path, body=None, headers=None):
+    host, port = server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    return response.status, response.getheader("Content-Type"), response.read()
+
+
+# =============================================================================
+# RenderService tests
+# =============================================================================
+@pytest.mark.unit
+class TestRenderService:
+    """Tests for RenderService without a socket."""
+
+    def test_renders_tex(self, service, sample_cv_data):
+        """Valid data renders to LaTeX."""
+        status, content_type, payload = service.render(
+            "test_template", json.dumps(sample_cv_data).encode()
+        )
+        assert status == 200
+        assert content_type.startswith("application/x-tex")
+        assert "Software Engineer at Tech Corp" in payload.decode()
+
+    def test_unknown_template(self, service):
+        """Unknown templates are a 404."""
+        status, _, payload = service.render("missing", b"{}")
+        assert status == 404
+        assert "missing" in json.loads(payload)["error"]
+
+    def test_path_traversal_rejected(self, service):
+        """Template names cannot escape the templates directory."""
+        status, _, _ = service.render("../test_template", b"{}")
+        assert status == 404
+
+    def test_invalid_json(self, service):
+        """Malformed bodies are a 400."""
+        status, _, payload = service.render("test_template", b"{oops")
+        assert status == 400
+        assert "Invalid JSON" in json.loads(payload)["error"]
+
+    def test_validation_errors(self, service):
+        """Schema violations are a 422 listing every error."""
+        status, _, payload = service.render("test_template", b"{}")
+        body = json.loads(payload)
+        assert status == 422
+        assert len(body["errors"]) == 2
+
+    def test_skip_validation(self, tmp_template_dir):
+        """Validation can be disabled."""
+        service = RenderService(tmp_template_dir.parent, validate=False)
+        status, _, _ = service.render("test_template", b"{}")
+        assert status == 200
+
+    @pytest.mark.parametrize("body", [b"[1, 2]", b"5", b"null"])
+    def test_non_object_rejected(self, tmp_template_dir, body):
+        """CV data must be an object, even without validation."""
+        service = RenderService(tmp_template_dir.parent, validate=False)
+        status, _, payload = service.render("test_template", body)
+        assert status == 422
+        assert "JSON object" in json.loads(payload)["error"]
+
+    def test_render_error_is_500(self, service, sample_cv_data, monkeypatch):
+        """Template errors come back as a 500, not a dropped connection."""
+
+        def broken(template, cv_data):
+            raise TypeError("'int' object is not iterable")
+
+        monkeypatch.setattr("cv_builder.serve.render_variant", broken)
+        status, _, payload = service.render(
+            "test_template", json.dumps(sample_cv_data).encode()
+        )
+        assert status == 500
+        assert json.loads(payload)["error"].startswith("TypeError")
+        assert service.in_flight == 0
+
+    def test_renders_pdf(self, service, sample_cv_data, mock_pdflatex):
+        """format=pdf compiles and returns the PDF bytes."""
+        status, content_type, payload = service.render(
+            "test_template", json.dumps(sample_cv_data).encode(), pdf=True
+        )
+        assert status == 200
+        assert content_type == "application/pdf"
+        assert payload == b"%PDF"
+
+    def test_compile_failure(self, service, sample_cv_data, mock_pdflatex_failure):
+        """A failed compile is a 500 with the log tail."""
+        status, _, payload = service.render(
+            "test_template", json.dumps(sample_cv_data).encode(), pdf=True
+        )
+        assert status == 500
+        assert json.loads(payload)["error"] == "Compilation failed"
+
+    def test_worker_limit(self, tmp_template_dir, sample_cv_data, monkeypatch):
+        """No more than ``workers`` renders run at the same time."""
+        service = RenderService(tmp_template_dir.parent, workers=2)
+        active = peak = 0
+        lock = threading.Lock()
+        original = service._render
+
+        def slow_render(*args):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return original(*args)
+
+        monkeypatch.setattr(service, "_render", slow_render)
+        body = json.dumps(sample_cv_data).encode()
+        threads = [
+            threading.Thread(target=service.render, args=("test_template", body))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert peak == 2
+
+
+# =============================================================================
+# HTTP server tests
+# =============================================================================
+@pytest.mark.integration
+class TestServer:
+    """Tests for the HTTP front end."""
+
+    def test_health(self, server):
+        """/health reports status, workers and templates."""
+        status, content_type, payload = _request(server, "GET", "/health")
+        body = json.loads(payload)
+        assert status == 200
+        assert content_type == "application/json"
+        assert body["status"] == "ok"
+        assert body["workers"] == 2
+        assert body["templates"] == ["test_template"]
+
+    def test_post_render(self, server, sample_cv_data):
+        """POST /render/<template> returns the rendered LaTeX."""
+        status, _, payload = _request(
+            server, "POST", "/render/test_template", json.dumps(sample_cv_data)
+        )
+        assert status == 200
+        assert b"Software Engineer at Tech Corp" in payload
+
+    def test_unknown_path(self, server):
+        """Other paths are a 404."""
+        assert _request(server, "GET", "/nope")[0] == 404
+        assert _request(server, "POST", "/nope", "{}")[0] == 404
+
+    @pytest.mark.parametrize("length", ["abc", "-1"])
+    def test_bad_content_length(self, server, length):
+        """A bad or negative Content-Length is a 400."""
+        status, _, payload = _request(
+            server,
+            "POST",
+            "/render/test_template",
+            "{}",
+            headers={"Content-Length": length},
+        )
+        assert status == 400
+        assert "Content-Length" in json.loads(payload)["error"]
+
+    def test_render_error_response(self, server, service, tmp_template_dir):
+        """Template errors reach the client as a JSON 500."""
+        (tmp_template_dir / "template.tex.j2").write_text("<< cv.x.y >>")
+        service.validate = False
+        status, _, payload = _request(server, "POST", "/render/test_template", "{}")
+        assert status == 500
+        assert "UndefinedError" in json.loads(payload)["error"]
+
+    def test_drain_waits_for_in_flight(self, server, service, monkeypatch):
+        """Shutting down lets a running request finish."""
+        started = threading.Event()
+        original = service._render
+
+        def slow_render(*args):
+            started.set()
+            time.sleep(0.2)
+            return original(*args)
+
+        monkeypatch.setattr(service, "_render", slow_render)
+        service.validate = False
+        results = []
+        client = threading.Thread(
+            target=lambda: results.append(
+                _request(server, "POST", "/render/test_template", "{}")
+            )
+        )
+        client.start()
+        started.wait(5)
+        drain(server)
+        server.server_close()
+        client.join(5)
+
+        assert results[0][0] == 200
+        assert service.in_flight == 0
+        assert service.health()[0] == 503
+
+    def test_unix_socket(self, service, tmp_path):
+        """The server can listen on a Unix socket."""
+        socket_path = tmp_path / "cv.sock"
+        server = make_server(service, socket_path=socket_path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(str(socket_path))
+            conn = http.client.HTTPConnection("localhost")
+            conn.sock = sock
+            conn.request("GET", "/health")
+            assert json.loads(conn.getresponse().read())["status"] == "ok"
+        finally:
+            drain(server)
+            thread.join()
+            server.server_close()
+
+    def test_replaces_stale_socket(self, service, tmp_path):
+        socket_path = tmp_path / "cv.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(socket_path))
+        stale.close()
+        make_server(service, socket_path=socket_path).server_close()
+
+    def test_keeps_other_files(self, service, tmp_path):
+        """A mistyped --socket never deletes the file it names."""
+        data_file = tmp_path / "resume.json"
+        data_file.write_text("{}")
+        with pytest.raises(FileExistsError, match="not a socket"):
+            make_server(service, socket_path=data_file)
+        assert data_file.read_text() == "{}"
+
+    def test_cli_reports_other_files(self, tmp_path, capsys, run_cli):
+        data_file = tmp_path / "resume.json"
+        data_file.write_text("{}")
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli("serve", "--socket", str(data_file))
+        assert exc_info.value.code == 1
+        assert "✗" in capsys.readouterr().out
+        assert data_file.read_text() == "{}"
@@ -0,0 +1,270 @@
+"""Tests for cv_builder.sinks module."""
+
+import hashlib
+import importlib.util
+import io
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from cv_builder.core import build_batch, build_variant, compile_many
+from cv_builder.sinks import (
+    MANIFEST_NAME,
+    DirectorySink,
+    OutputSink,
+    TarSink,
+    ZipSink,
+    archive_kind,
+    open_sink,
+)
+
+HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+
+
+def _members(archive: Path) -> dict[str, bytes]:
+    """Names and contents of the members of a tar or zip archive."""
+    if archive.suffix == ".zip":
+        with zipfile.ZipFile(archive) as zf:
+            return {name: zf.read(name) for name in zf.namelist()}
+    if archive.name.endswith(".zst"):
+        import zstandard
+
+        data = zstandard.ZstdDecompressor().stream_reader(archive.open("rb")).read()
+        tf = tarfile.open(fileobj=io.BytesIO(data))
+    else:
+        tf = tarfile.open(archive)
+    with tf:
+        return {m.name: tf.extractfile(m).read() for m in tf.getmembers()}
+
+
+ARCHIVES = [
+    "out.tar",
+    "out.tar.gz",
+    "out.zip",
+    pytest.param(
+        "out.tar.zst",
+        marks=pytest.mark.skipif(not HAS_ZSTD, reason="zstandard not installed"),
+    ),
+]
+
+
+# =============================================================================
+# sink tests
+# =============================================================================
+@pytest.mark.unit
+class TestArchiveSinks:
+    """Tests for TarSink and ZipSink."""
+
+    @pytest.mark.parametrize("name", ARCHIVES)
+    def test_entries_and_manifest(self, tmp_path, name):
+        base = tmp_path / "build"
+        with open_sink(tmp_path / name, base) as sink:
+            sink.write(base / "a" / "cv.tex", [b"hello ", b"world"], source="a.json")
+            pdf = tmp_path / "cv.pdf"
+            pdf.write_bytes(b"%PDF")
+            sink.add_file(base / "a" / "cv.pdf", pdf, seconds=1.5)
+
+        members = _members(tmp_path / name)
+        assert members["a/cv.tex"] == b"hello world"
+        assert members["a/cv.pdf"] == b"%PDF"
+        entries = json.loads(members[MANIFEST_NAME])["entries"]
+        assert [e["name"] for e in entries] == ["a/cv.tex", "a/cv.pdf"]
+        assert {e["id"] for e in entries} == {"a/cv"}
+        assert [e["source"] for e in entries] == ["a.json", "a.json"]
+        assert entries[0]["sha256"] == hashlib.sha256(b"hello world").hexdigest()
+        assert entries[0]["size"] == 11
+        assert entries[0]["seconds"] >= 0
+        assert entries[1]["seconds"] == 1.5
+
+    def test_nothing_written_on_error(self, tmp_path):
+        """An archive only replaces its target when closed without error."""
+        target = tmp_path / "out.tar.gz"
+        with pytest.raises(RuntimeError):
+            with TarSink(target, tmp_path, "gz") as sink:
+                sink.write(tmp_path / "a.tex", [b"x"])
+                raise RuntimeError("boom")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_render_leaves_no_member(self, tmp_path):
+        def chunks():
+            yield b"partial"
+            raise ValueError("render failed")
+
+        with ZipSink(tmp_path / "out.zip", tmp_path) as sink:
+            with pytest.raises(ValueError):
+                sink.write(tmp_path / "bad.tex", chunks())
+            sink.write(tmp_path / "good.tex", [b"ok"])
+        assert sorted(_members(tmp_path / "out.zip")) == ["good.tex", MANIFEST_NAME]
+
+    def test_keep_files(self, tmp_path):
+        """With keep_files, documents also stay on disk (e.g. to compile)."""
+        with TarSink(tmp_path / "out.tar", tmp_path, keep_files=True) as sink:
+            sink.write(tmp_path / "a" / "cv.tex", [b"tex"])
+        assert (tmp_path / "a" / "cv.tex").read_bytes() == b"tex"
+
+    def test_names_outside_base(self, tmp_path):
+        sink = ZipSink(tmp_path / "out.zip", tmp_path / "build")
+        assert sink.name_of(tmp_path / "build" / "x" / "cv.tex") == "x/cv.tex"
+        assert sink.name_of(Path("/elsewhere/cv.tex")) == "cv.tex"
+        assert sink.location(tmp_path / "build" / "cv.tex") == (
+            f"{tmp_path / 'out.zip'}:cv.tex"
+        )
+        sink.close()
+
+    def test_incomplete_sink_cannot_be_created(self, tmp_path):
+        """Sinks must implement the storage methods of their base class."""
+
+        class Partial(OutputSink):
+            def _write(self, path, chunks):
+                return True
+
+        with pytest.raises(TypeError, match="_add_file"):
+            Partial(tmp_path)
+
+    @pytest.mark.skipif(HAS_ZSTD, reason="zstandard installed")
+    def test_zstd_needs_zstandard(self, tmp_path):
+        with pytest.raises(ImportError, match="zstandard"):
+            TarSink(tmp_path / "out.tar.zst", compression="zst")
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize(
+        "name, kind",
+        [
+            ("a.tar", "tar"),
+            ("a.TAR.GZ", "gz"),
+            ("a.tgz", "gz"),
+            ("a.tar.zst", "zst"),
+            ("a.zip", "zip"),
+            ("out", None),
+            ("a.gz", None),
+        ],
+    )
+    def test_archive_kind(self, name, kind):
+        assert archive_kind(name) == kind
+
+
+@pytest.mark.unit
+class TestDirectorySink:
+    """Tests for DirectorySink."""
+
+    def test_writes_at_output_paths(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        with DirectorySink(tmp_path, manifest=manifest) as sink:
+            assert sink.write(tmp_path / "a" / "cv.tex", [b"tex"]) is True
+            assert sink.write(tmp_path / "a" / "cv.tex", [b"tex"]) is False
+        assert (tmp_path / "a" / "cv.tex").read_bytes() == b"tex"
+        entries = json.loads(manifest.read_text())["entries"]
+        assert [e["name"] for e in entries] == ["a/cv.tex", "a/cv.tex"]
+
+    def test_add_file_moves(self, tmp_path):
+        src = tmp_path / "scratch.pdf"
+        src.write_bytes(b"%PDF")
+        sink = DirectorySink(tmp_path)
+        sink.add_file(tmp_path / "out" / "cv.pdf", src)
+        assert (tmp_path / "out" / "cv.pdf").read_bytes() == b"%PDF"
+        assert not src.exists()
+
+    def test_open_sink_directory(self, tmp_path):
+        assert isinstance(open_sink(tmp_path / "out"), DirectorySink)
+
+
+# =============================================================================
+# pipeline tests
+# =============================================================================
+@pytest.mark.unit
+class TestPipelineSinks:
+    """build_variant, build_batch and compile_many with a sink."""
+
+    def test_build_variant(
+        self, tmp_template_dir, tmp_path, sample_cv_data, capsys
+    ):
+        with ZipSink(tmp_path / "out.zip", tmp_path) as sink:
+            output = build_variant(
+                tmp_template_dir, tmp_path, "cv", sample_cv_data, sink=sink
+            )
+        assert not output.exists()
+        assert b"Software Engineer" in _members(tmp_path / "out.zip")["cv.tex"]
+        assert "out.zip:cv.tex" in capsys.readouterr().out
+
+    def test_batch_and_compile(
+        self, tmp_template_dir, tmp_data_dir, tmp_path, fake_pdflatex
+    ):
+        """Compiled PDFs join the .tex files they came from in the archive."""
+        build = tmp_path / "build"
+        data_file = tmp_data_dir / "test_template.json"
+        with TarSink(tmp_path / "out.tar", build, keep_files=True) as sink:
+            (result,) = build_batch(
+                tmp_template_dir, [data_file], output_dir=build, sink=sink
+            )
+            (compiled,) = compile_many([result.output], tmp_template_dir, sink=sink)
+        assert compiled.ok
+        members = _members(tmp_path / "out.tar")
+        assert sorted(members) == [
+            MANIFEST_NAME,
+            "test_template.pdf",
+            "test_template.tex",
+        ]
+        entries = json.loads(members[MANIFEST_NAME])["entries"]
+        assert entries[1]["source"] == str(data_file)
+        assert entries[1]["seconds"] == compiled.seconds
+
+
+# =============================================================================
+# CLI integration tests
+# =============================================================================
+@pytest.mark.integration
+class TestArchiveCli:
+    """Tests for ``cv-build batch -o out.tar.gz``."""
+
+    @pytest.mark.parametrize("name", ["out.tar.gz", "out.zip"])
+    def test_batch_to_archive(self, tmp_data_dir, tmp_path, name, capsys, run_cli):
+        archive = tmp_path / name
+        run_cli(
+            "batch",
+            str(tmp_data_dir),
+            "-t",
+            "test_template",
+            "-o",
+            str(archive),
+        )
+        out = capsys.readouterr().out
+        assert f"-> {archive}:test_template.tex" in out
+        assert f"✓ Wrote 1 file(s) and a manifest to {archive}" in out
+        assert sorted(_members(archive)) == [MANIFEST_NAME, "test_template.tex"]
+        assert not (tmp_data_dir / ".cv-build-manifest.json").exists()
+
+    def test_compile_into_archive(
+        self, tmp_data_dir, tmp_path, fake_pdflatex, capsys, run_cli
+    ):
+        archive = tmp_path / "out.zip"
+        run_cli(
+            "batch",
+            str(tmp_data_dir),
+            "-t",
+            "test_template",
+            "-o",
+            str(archive),
+            "--compile",
+        )
+        assert f"✓ Compiled {archive}:test_template.pdf" in capsys.readouterr().out
+        assert sorted(_members(archive)) == [
+            MANIFEST_NAME,
+            "test_template.pdf",
+            "test_template.tex",
+        ]
+
+    def test_plan_rejected(self, tmp_data_dir, tmp_path, capsys, run_cli):
+        with pytest.raises(SystemExit):
+            run_cli(
+                "batch",
+                str(tmp_data_dir),
+                "-t",
+                "test_template",
+                "-o",
+                str(tmp_path / "out.tar"),
+                "--plan",
+            )
+        assert "not an archive" in capsys.readouterr().out
@@ -0,0 +1,149 @@
+"""Tests for cv_builder.texformat module."""
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from cv_builder import texformat
+from cv_builder.core import run_pdflatex
+from cv_builder.texformat import ensure_format, format_key, preamble_of
+
+PREAMBLE = "\\documentclass{article}\n\\usepackage{resume}\n"
+DOCUMENT = PREAMBLE + "\\begin{document}\nHi\n\\end{document}\n"
+
+
+@pytest.fixture(autouse=True)
+def _reset_state(monkeypatch):
+    monkeypatch.setattr(texformat, "_FAILED", set())
+    monkeypatch.setattr(texformat, "tex_engine_version", lambda: "pdfTeX 3.14")
+
+
+@pytest.fixture
+def tex_file(tmp_path: Path) -> Path:
+    tex_file = tmp_path / "doc.tex"
+    tex_file.write_text(DOCUMENT)
+    return tex_file
+
+
+def _fake_ini(succeed: bool = True):
+    """Mock subprocess.run for ``pdflatex -ini`` dumping a format."""
+
+    def run(cmd, **kwargs):
+        jobname = next(a for a in cmd if a.startswith("-jobname="))[9:]
+        if succeed:
+            (Path(kwargs["cwd"]) / f"{jobname}.fmt").write_bytes(b"FMT")
+        result = MagicMock()
+        result.returncode = 0 if succeed else 1
+        result.stdout = ""
+        return result
+
+    return MagicMock(side_effect=run)
+
+
+# =============================================================================
+# preamble / key tests
+# =============================================================================
+@pytest.mark.unit
+class TestFormatKey:
+    """Tests for preamble_of and format_key."""
+
+    def test_preamble_of(self):
+        assert preamble_of(DOCUMENT) == PREAMBLE
+        assert preamble_of("no document") is None
+
+    def test_key_depends_on_sty(self, tmp_template_dir: Path):
+        key = format_key("pre", tmp_template_dir)
+        (tmp_template_dir / "test_template.sty").write_text("% changed")
+        assert format_key("pre", tmp_template_dir) != key
+
+    def test_key_depends_on_engine(self, tmp_template_dir: Path, monkeypatch):
+        key = format_key("pre", tmp_template_dir)
+        monkeypatch.setattr(texformat, "tex_engine_version", lambda: "other")
+        assert format_key("pre", tmp_template_dir) != key
+
+
+# =============================================================================
+# ensure_format tests
+# =============================================================================
+@pytest.mark.unit
+class TestEnsureFormat:
+    """Tests for ensure_format function."""
+
+    def test_builds_once_and_caches(
+        self, tex_file, tmp_template_dir, tmp_path, monkeypatch
+    ):
+        mock_run = _fake_ini()
+        monkeypatch.setattr("subprocess.run", mock_run)
+        formats = tmp_path / "formats"
+
+        fmt = ensure_format(tex_file, tmp_template_dir, formats)
+        again = ensure_format(tex_file, tmp_template_dir, formats)
+
+        assert fmt == again
+        assert fmt.read_bytes() == b"FMT"
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args.args[0]
+        assert "-ini" in cmd and "mylatexformat.ltx" in cmd
+
+    def test_failure_returns_none_and_is_remembered(
+        self, tex_file, tmp_template_dir, tmp_path, monkeypatch
+    ):
+        mock_run = _fake_ini(succeed=False)
+        monkeypatch.setattr("subprocess.run", mock_run)
+
+        assert ensure_format(tex_file, tmp_template_dir, tmp_path) is None
+        assert ensure_format(tex_file, tmp_template_dir, tmp_path) is None
+        assert mock_run.call_count == 1
+
+    def test_no_preamble(self, tmp_path, tmp_template_dir):
+        tex_file = tmp_path / "plain.tex"
+        tex_file.write_text("plain text")
+        assert ensure_format(tex_file, tmp_template_dir, tmp_path) is None
+
+
+# =============================================================================
+# run_pdflatex with a format
+# =============================================================================
+@pytest.mark.unit
+class TestCompileWithFormat:
+    """run_pdflatex uses -fmt and falls back to a normal compile."""
+
+    def test_passes_fmt_and_texformats(
+        self, tex_file, tmp_template_dir, tmp_path, mock_pdflatex
+    ):
+        fmt = tmp_path / "formats" / "cv-abc.fmt"
+
+        result = run_pdflatex(tex_file, tmp_template_dir, fmt_file=fmt)
+
+        assert result.ok and result.used_format
+        call = mock_pdflatex.call_args
+        assert "-fmt=cv-abc" in call.args[0]
+        assert call.kwargs["env"]["TEXFORMATS"].startswith(str(fmt.parent))
+
+    def test_failure_falls_back_to_normal_compile(
+        self, tex_file, tmp_template_dir, tmp_path, monkeypatch
+    ):
+        def run(cmd, **kwargs):
+            result = MagicMock()
+            result.returncode = 1 if any(a.startswith("-fmt=") for a in cmd) else 0
+            result.stdout = "output"
+            if result.returncode == 0:
+                (Path(kwargs["cwd"]) / "doc.pdf").write_bytes(b"%PDF")
+            return result
+
+        mock_run = MagicMock(side_effect=run)
+        monkeypatch.setattr("subprocess.run", mock_run)
+
+        start = time.perf_counter()
+        result = run_pdflatex(
+            tex_file, tmp_template_dir, fmt_file=tmp_path / "cv-abc.fmt"
+        )
+        elapsed = time.perf_counter() - start
+
+        assert result.ok
+        assert not result.used_format
+        assert mock_run.call_count == 2
+        assert result.passes == 2
+        assert result.seconds <= elapsed  # the fallback's time counted once
@@ -0,0 +1,228 @@
+"""Tests for cv_builder.timings module."""
+
+import json
+import pstats
+import sys
+import time
+
+import pytest
+
+from cv_builder.timings import Timings, profiled, timed, timed_render
+
+
+# =============================================================================
+# Timings tests
+# =============================================================================
+@pytest.mark.unit
+class TestTimings:
+    """Tests for the Timings recorder."""
+
+    def test_stage_records_wall_and_cpu(self):
+        """A stage records wall time and the thread's CPU time."""
+        timings = Timings()
+        with timings.stage("load", "cv.tex"):
+            time.sleep(0.02)
+        (record,) = timings.records
+        assert (record.document, record.stage) == ("cv.tex", "load")
+        assert record.wall >= 0.02
+        assert record.cpu is not None and record.cpu < record.wall
+
+    def test_stage_without_cpu(self):
+        """cpu=False records wall time only (for child processes)."""
+        timings = Timings()
+        with timings.stage("compile", "cv.tex", cpu=False):
+            pass
+        assert timings.records[0].cpu is None
+
+    def test_stage_recorded_on_error(self):
+        """A failing stage is still recorded."""
+        timings = Timings()
+        with pytest.raises(ValueError):
+            with timings.stage("load", "cv.tex"):
+                raise ValueError
+        assert len(timings.records) == 1
+
+    def test_totals_in_pipeline_order(self):
+        """Totals sum per stage and follow the pipeline order."""
+        timings = Timings()
+        timings.add("compile", "a.tex", 2.0)
+        timings.add("load", "a.tex", 0.5, 0.25)
+        timings.add("load", "b.tex", 0.5, 0.25)
+        totals = timings.totals()
+        assert list(totals) == ["load", "compile"]
+        assert totals["load"] == {"wall": 1.0, "cpu": 0.5}
+        assert totals["compile"] == {"wall": 2.0, "cpu": None}
+
+    def test_table(self):
+        """The table has a row per document and stage plus totals."""
+        timings = Timings()
+        timings.add("write", "b.tex", 0.001, 0.001)
+        timings.add("load", "a.tex", 0.002, 0.001)
+        timings.add("compile", "a.tex", 1.5)
+        lines = timings.table().splitlines()
+        assert lines[0].split() == ["document", "stage", "wall", "ms", "cpu", "ms"]
+        assert lines[1].split() == ["a.tex", "load", "2.00", "1.00"]
+        assert lines[2].split() == ["a.tex", "compile", "1500.00", "-"]
+        assert lines[3].split() == ["b.tex", "write", "1.00", "1.00"]
+        assert [line.split()[:2] for line in lines[4:]] == [
+            ["total", "load"],
+            ["total", "write"],
+            ["total", "compile"],
+        ]
+
+    def test_report_json(self, tmp_path, capsys):
+        """A file destination gets JSON with stages and totals."""
+        timings = Timings()
+        timings.add("render", "a.tex", 0.5, 0.5)
+        path = tmp_path / "timings.json"
+        timings.report(path)
+        report = json.loads(path.read_text())
+        assert report["stages"] == [
+            {"document": "a.tex", "stage": "render", "wall": 0.5, "cpu": 0.5}
+        ]
+        assert report["totals"] == {"render": {"wall": 0.5, "cpu": 0.5}}
+        assert "Timings written to" in capsys.readouterr().out
+
+    def test_timed_without_recorder(self):
+        """timed() is a no-op without a recorder."""
+        with timed(None, "load", "a.tex"):
+            pass
+
+
+# =============================================================================
+# timed_render tests
+# =============================================================================
+@pytest.mark.unit
+class TestTimedRender:
+    """Tests for splitting a streaming render into render and write."""
+
+    def test_splits_render_and_write(self):
+        """Producing chunks is render time; consuming them is write time."""
+
+        def chunks():
+            for _ in range(2):
+                time.sleep(0.02)
+                yield b"x"
+
+        timings = Timings()
+        with timed_render(timings, "a.tex", chunks()) as measured:
+            for _ in measured:
+                time.sleep(0.04)
+        render, write = timings.records
+        assert (render.stage, write.stage) == ("render", "write")
+        assert 0.04 <= render.wall < 0.08
+        assert write.wall >= 0.08
+
+    def test_passthrough_without_recorder(self):
+        """Without a recorder the chunks are passed through untouched."""
+        chunks = iter([b"a", b"b"])
+        with timed_render(None, "a.tex", chunks) as measured:
+            assert measured is chunks
+
+
+# =============================================================================
+# profiled tests
+# =============================================================================
+@pytest.mark.unit
+class TestProfiled:
+    """Tests for the cProfile/tracemalloc wrapper."""
+
+    def test_dumps_profile_and_peak(self, tmp_path, capsys):
+        """The profile is loadable with pstats and the peak is reported."""
+        path = tmp_path / "run.prof"
+        with profiled(path):
+            sorted(str(i) for i in range(10_000))
+        assert pstats.Stats(str(path)).total_calls > 0
+        out = capsys.readouterr().out
+        assert f"Profile written to {path}" in out
+        assert "Peak traced memory:" in out
+
+    def test_dumps_on_exit(self, tmp_path, capsys):
+        """The profile is written even if the run exits early."""
+        path = tmp_path / "run.prof"
+        with pytest.raises(SystemExit):
+            with profiled(path):
+                sys.exit(1)
+        assert path.exists()
+
+
+# =============================================================================
+# CLI integration tests
+# =============================================================================
+@pytest.mark.integration
+class TestTimingsCli:
+    """Tests for ``--timings`` and ``--profile``."""
+
+    def test_batch_timings_table(self, tmp_data_dir, capsys, run_cli):
+        """Batch timings cover every stage of every document."""
+        run_cli(
+            "batch",
+            str(tmp_data_dir),
+            "-t",
+            "test_template",
+            "--timings",
+        )
+        out = capsys.readouterr().out
+        document = str(tmp_data_dir / "test_template.tex")
+        stages = [
+            line.split()[1] for line in out.splitlines() if line.startswith(document)
+        ]
+        assert stages == ["load", "validate", "render", "write"]
+        assert "total" in out
+        assert "escape cache: hits" in out
+
+    def test_archive_timings_name_entries(
+        self, tmp_data_dir, tmp_path, capsys, run_cli
+    ):
+        """With an archive output, documents are named by their entry."""
+        archive = tmp_path / "out.tar"
+        run_cli(
+            "batch",
+            str(tmp_data_dir),
+            "-t",
+            "test_template",
+            "-o",
+            str(archive),
+            "--timings",
+        )
+        out = capsys.readouterr().out
+        document = f"{archive}:test_template.tex"
+        stages = [
+            line.split()[1] for line in out.splitlines() if line.startswith(document)
+        ]
+        assert stages == ["load", "validate", "render", "write"]
+        assert "cv-build-" not in out
+
+    def test_build_timings_json(self, tmp_path, sample_cv_data, capsys, run_cli):
+        """A single build writes JSON timings to the given file."""
+        data_dir = tmp_path / "data"
+        (data_dir / "test_template").mkdir(parents=True)
+        (data_dir / "test_template" / "test_template.json").write_text(
+            json.dumps(sample_cv_data)
+        )
+        report = tmp_path / "timings.json"
+        run_cli(
+            "--template",
+            "test_template",
+            "--data",
+            str(data_dir),
+            "--skip-validation",
+            "--timings",
+            str(report),
+        )
+        stages = [s["stage"] for s in json.loads(report.read_text())["stages"]]
+        assert stages == ["load", "render", "write"]
+
+    def test_batch_profile(self, tmp_data_dir, tmp_path, capsys, run_cli):
+        """--profile FILE dumps a cProfile of the run."""
+        path = tmp_path / "batch.prof"
+        run_cli(
+            "batch",
+            str(tmp_data_dir),
+            "-t",
+            "test_template",
+            "--profile",
+            str(path),
+        )
+        assert pstats.Stats(str(path)).total_calls > 0
+        assert "Peak traced memory:" in capsys.readouterr().out
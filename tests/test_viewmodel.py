@@ -0,0 +1,351 @@
+"""Tests for cv_builder.viewmodel module."""
+
+import copy
+import json
+from unittest.mock import patch
+
+import pytest
+
+from cv_builder import viewmodel
+from cv_builder.cli import get_package_templates_dir, main
+from cv_builder.core import create_jinja_env, load_template, render_variant
+from cv_builder.viewmodel import LazyView, build_view
+
+SPECIAL = r"R&D 100% #1 $5 a_b {x} ~ ^ \ /latex{\textbf{b}}"
+
+# The resume template as it was before the view model: filters and
+# escapes inside Jinja. The view-model template must match it byte for byte.
+LEGACY_TEMPLATE = r"""\documentclass[letterpaper,11pt]{article}
+
+%-----------------------------------------------
+% import resume.sty with necessary packages,
+% document definition and custom commands
+\usepackage{resume}
+
+%-----------------------------------------------
+% CV starts here
+\begin{document}
+
+%----------HEADING----------
+<% set info_items = [] %>
+<% set _ = info_items.append("\\emailInfo{" ~ cv.personalInfo.email ~ "}") %>
+<% set _ = info_items.append("\\locationInfo{" ~ cv.personalInfo.location ~ "}") %>
+<% set social_links = [] %>
+<% if cv.personalInfo.linkedin.inResume %>
+<% set _ = social_links.append("\\linkedinLink{" ~ cv.personalInfo.linkedin.url ~ "}") %>
+<% endif %>
+<% if cv.personalInfo.github.inResume %>
+<% set _ = social_links.append("\\githubLink{" ~ cv.personalInfo.github.url ~ "}") %>
+<% endif %>
+<% if cv.personalInfo.webpage and cv.personalInfo.webpage.inResume %>
+<% set _ = social_links.append("\\webpageLink{" ~ cv.personalInfo.webpage.url ~ "}") %>
+<% endif %>
+\resumeHeader
+  {<< cv.personalInfo.name >>}
+  {<< info_items | join(" | ") >>}
+  {<< social_links | join(" ") >>\\}
+
+%-----------SUMMARY-----------
+<% if cv.summary and cv.summary.inResume %>
+\resumeSummary{<< cv.summary.value | latex >>}
+<% endif %>
+
+%-----------EXPERIENCE-----------
+\section{Experience}
+\begin{sectionElementsList}
+<% for exp in cv.experience if exp.inResume %>
+  \experienceElement
+  {<< exp.title | latex >>}{<< exp | date_range >>}
+  {<< exp.company | latex >>}{<< exp.location | latex >>}
+  {<< exp.description | latex >>}
+  {<% set responsibilities = exp | get_resp %><% if responsibilities %><% for resp in responsibilities %>{<< resp | latex >>}<% if not loop.last %>,<% endif %><% endfor %><% endif %>}
+<% endfor %>
+\end{sectionElementsList}
+
+%-----------EDUCATION-----------
+\section{Education}
+\begin{sectionElementsList}
+<% for edu in cv.education if edu.inResume %>
+<% if edu.details and (edu.details.msc or edu.details.bsc) %>
+  \educationElementWithDetails
+    {<< edu.degree | latex >>}{<< edu.location >>}
+    {<< edu.institution >>}{<< edu.startDate >> -- << edu.endDate >>}
+    {<% if edu.details.msc %>\degreeDetail{<% if edu.details.msc.label %><< edu.details.msc.label >><% else %>MSc<% endif %>}{<< edu.details.msc.courses | latex >>}{<< edu.details.msc.thesis >>}<% endif %>}
+    {<% if edu.details.bsc %>\degreeDetail{<% if edu.details.bsc.label %><< edu.details.bsc.label >><% else %>BSc<% endif %>}{<< edu.details.bsc.courses | latex >>}{<< edu.details.bsc.thesis >>}<% endif %>}
+<% else %>
+  \experienceElement
+    {<< edu.institution >>}{<< edu.location >>}
+    {<< edu.degree >>}{<< edu.startDate >> -- << edu.endDate >>}
+    {}{}
+<% endif %>
+<% endfor %>
+\end{sectionElementsList}
+
+%-----------LICENSES-----------
+<% set visible_licenses = cv.licenses | selectattr('inResume') | list %>
+<% if visible_licenses %>
+\section{Licenses}
+\begin{sectionElementsList}
+  \skillsElement{1}{
+<% for license in visible_licenses %>
+    \skillsItem{<< license.name | latex >>}{<< license.year >>}
+<% endfor %>
+  }
+\end{sectionElementsList}
+<% endif %>
+
+%-----------TECH SKILLS-----------
+\section{Technical Skills}
+\begin{sectionElementsList}
+  \skillsElement{<% if cv.skillsColumns %><< cv.skillsColumns >><% else %>2<% endif %>}{
+<% for skill_name, skill in cv.technicalSkills.items() if skill.inResume %>
+    \skillsItem{<< skill_name | latex >>}{<< skill.value | latex >>}
+<% endfor %>
+  }
+\end{sectionElementsList}
+
+%-----------PROJECTS-----------
+\section{Projects}
+\begin{sectionElementsList}
+<% for project in cv.projects if project.inResume %>
+  \projectElement{
+    \href{<< project.url >>}{<< project.name >>}
+    }{
+    << project.description | latex >>
+  }{<< project.technologies | latex >>}
+<% endfor %>
+\end{sectionElementsList}
+
+%-----------PERSONAL SKILLS-----------
+\section{Personal skills}
+\begin{sectionElementsList}
+  \skillsElement{1}{
+<% for skill_name, skill in cv.personalSkills.items() if skill.inResume %>
+    \skillsItem{<< skill_name >>}{<< skill.value >>}
+<% endfor %>
+  }
+\end{sectionElementsList}
+
+%-----------FOOTER TEXT-----------
+<% if cv.footer.inResume %>
+\resumeFooter{<< cv.footer.value >>}
+<% endif %>
+
+%-------------------------------------------
+\end{document}
+"""
+
+DATA_FILE = (
+    get_package_templates_dir().parent.parent / "data" / "resume" / "resume.json"
+)
+
+
+def _append_special(node):
+    """Append LaTeX special characters to every string value."""
+    if isinstance(node, dict):
+        return {
+            k: v if k == "inResume" else _append_special(v) for k, v in node.items()
+        }
+    if isinstance(node, list):
+        return [_append_special(v) for v in node]
+    if isinstance(node, str):
+        return f"{node} {SPECIAL}"
+    return node
+
+
+def _flipped(cv: dict) -> dict:
+    """Every inResume flag inverted."""
+    cv = copy.deepcopy(cv)
+    for section in ("experience", "education", "licenses", "projects"):
+        for item in cv[section]:
+            item["inResume"] = not item.get("inResume", True)
+    for section in ("technicalSkills", "personalSkills"):
+        for item in cv[section].values():
+            item["inResume"] = not item["inResume"]
+    for key in ("summary", "footer"):
+        cv[key]["inResume"] = not cv[key]["inResume"]
+    for key in ("linkedin", "github", "webpage"):
+        if key in cv["personalInfo"]:
+            link = cv["personalInfo"][key]
+            link["inResume"] = not link["inResume"]
+    return cv
+
+
+def _sparse(cv: dict) -> dict:
+    """Optional fields removed and lists emptied."""
+    cv = copy.deepcopy(cv)
+    for key in ("summary", "skillsColumns"):
+        cv.pop(key, None)
+    cv["personalInfo"].pop("webpage", None)
+    cv["licenses"] = []
+    cv["experience"][0]["endDate"] = None
+    cv["experience"][0]["responsibilities"] = []
+    return cv
+
+
+def _details(cv: dict) -> dict:
+    """Every education detail layout, labels and defaults."""
+    cv = copy.deepcopy(cv)
+    for edu in cv["education"]:
+        edu["details"] = {
+            "msc": {"courses": "A & B", "thesis": "T_1"},
+            "bsc": {"label": "BEng", "courses": "C", "thesis": "U"},
+        }
+    base = {"location": "L", "startDate": "2001", "endDate": "2002"}
+    cv["education"] += [
+        dict(base, degree="D & E", institution="I_1", details={}, inResume=True),
+        dict(
+            base,
+            degree="D2",
+            institution="I2",
+            details={"bsc": {"courses": "X"}},
+            inResume=True,
+        ),
+    ]
+    cv["licenses"].append({"name": "Lic & 2", "year": 2020, "inResume": True})
+    cv["skillsColumns"] = 3
+    cv["summary"]["value"] = ""
+    cv["experience"][0]["responsibilities"].append({"value": "no flag & default"})
+    return cv
+
+
+# =============================================================================
+# legacy parity tests
+# =============================================================================
+@pytest.mark.integration
+class TestLegacyParity:
+    """The view-model template renders exactly what the filter template did."""
+
+    @pytest.fixture
+    def legacy(self, tmp_path):
+        (tmp_path / "template.tex.j2").write_text(LEGACY_TEMPLATE, encoding="utf-8")
+        return create_jinja_env(tmp_path).get_template("template.tex.j2")
+
+    @pytest.mark.parametrize(
+        "variant", [lambda cv: cv, _append_special, _flipped, _sparse, _details]
+    )
+    def test_byte_identical(self, legacy, variant):
+        if not DATA_FILE.exists():
+            pytest.skip("data/resume/resume.json not found")
+        cv = variant(json.loads(DATA_FILE.read_text(encoding="utf-8")))
+        template = load_template(get_package_templates_dir() / "resume")
+        assert render_variant(template, cv) == legacy.render(cv=cv)
+
+    def test_sample_data(self, legacy, sample_cv_data):
+        template = load_template(get_package_templates_dir() / "resume")
+        cv = dict(
+            sample_cv_data,
+            education=[],
+            licenses=[],
+            technicalSkills={},
+            projects=[],
+            personalSkills={},
+            footer={"value": "Bye", "inResume": True},
+        )
+        assert render_variant(template, cv) == legacy.render(cv=cv)
+
+
+# =============================================================================
+# build_view tests
+# =============================================================================
+@pytest.mark.unit
+class TestBuildView:
+    """Tests for build_view."""
+
+    def test_filters_and_escapes(self, sample_cv_data):
+        cv = copy.deepcopy(sample_cv_data)
+        cv["experience"][0]["company"] = "R&D"
+        cv["experience"].append(dict(cv["experience"][0], inResume=False))
+        view = build_view(cv)
+        (exp,) = view.experience
+        assert exp.company == r"R\&D"
+        assert exp.dates == "Jan 2020 -- Present"
+        assert exp.responsibilities == ("Write code",)
+
+    def test_links_in_header_order(self, sample_cv_data):
+        cv = copy.deepcopy(sample_cv_data)
+        cv["personalInfo"]["webpage"] = {"url": "https://x.io", "inResume": True}
+        cv["personalInfo"]["linkedin"]["inResume"] = False
+        view = build_view(cv)
+        assert [link.kind for link in view.links] == ["github", "webpage"]
+
+    def test_defaults(self, sample_cv_data):
+        view = build_view(sample_cv_data)
+        assert view.skills_columns == 2
+        assert view.summary is None
+        assert view.footer is None
+
+    def test_immutable(self, sample_cv_data):
+        import dataclasses
+
+        view = build_view(sample_cv_data)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            view.name = "Mallory"
+        assert isinstance(view.experience, tuple)
+
+
+# =============================================================================
+# LazyView tests
+# =============================================================================
+@pytest.mark.unit
+class TestLazyView:
+    """Tests for LazyView and the ``view`` render variable."""
+
+    @pytest.fixture
+    def builds(self, monkeypatch):
+        """Data of every view built."""
+        built = []
+        original = viewmodel.build_view
+
+        def counting(cv):
+            built.append(cv)
+            return original(cv)
+
+        monkeypatch.setattr(viewmodel, "build_view", counting)
+        return built
+
+    def test_built_once_on_first_use(self, sample_cv_data, builds):
+        view = LazyView(sample_cv_data)
+        assert builds == []
+        assert view.name == "John Doe"
+        assert view.get().experience == build_view(sample_cv_data).experience
+        assert len(builds) == 1
+
+    def test_unused_view_is_never_built(self, tmp_path, builds):
+        """Templates that don't read ``view`` accept data of any layout."""
+        (tmp_path / "template.tex.j2").write_text("<< cv.experience >>")
+        template = create_jinja_env(tmp_path).get_template("template.tex.j2")
+        assert render_variant(template, {"experience": "none"}) == "none"
+        assert builds == []
+
+    def test_shared_between_renders(self, sample_cv_data, builds):
+        template = load_template(get_package_templates_dir() / "resume")
+        view = LazyView(sample_cv_data)
+        first = render_variant(template, sample_cv_data, view)
+        assert render_variant(template, sample_cv_data, view) == first
+        assert len(builds) == 1
+
+    def test_templates_share_a_view(self, tmp_path, sample_cv_data, builds):
+        """One build of several templates builds the data's view once."""
+        templates = tmp_path / "templates"
+        for name in ("one", "two"):
+            (templates / name).mkdir(parents=True)
+            (templates / name / "template.tex.j2").write_text("<< view.name >>")
+        data_file = tmp_path / "cv.json"
+        data_file.write_text(json.dumps(sample_cv_data))
+        with patch(
+            "cv_builder.cli.get_package_templates_dir", return_value=templates
+        ):
+            main(
+                [
+                    "-t",
+                    "one,two",
+                    "--data",
+                    str(tmp_path / "data"),
+                    "--data-file",
+                    str(data_file),
+                    "--skip-validation",
+                ]
+            )
+        assert (tmp_path / "data" / "two" / "two.tex").read_text() == "John Doe"
+        assert len(builds) == 1
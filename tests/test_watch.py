@@ -0,0 +1,295 @@
+"""Tests for cv_builder.watch module."""
+
+import json
+import subprocess
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from cv_builder import watch
+from cv_builder.cli import main
+from cv_builder.core import CompileResult, run_pdflatex
+from cv_builder.watch import WatchSession, iter_changes
+
+pytestmark = pytest.mark.usefixtures("fresh_template_cache")
+
+
+@pytest.fixture
+def documents(tmp_path: Path, sample_cv_data: dict) -> list[tuple[Path, Path]]:
+    """Two data files with their .tex outputs."""
+    docs = []
+    for name in ("alice", "bob"):
+        data_file = tmp_path / "data" / f"{name}.json"
+        data_file.parent.mkdir(exist_ok=True)
+        data_file.write_text(json.dumps(sample_cv_data), encoding="utf-8")
+        docs.append((data_file, tmp_path / "out" / f"{name}.tex"))
+    return docs
+
+
+def _touch(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+
+
+# =============================================================================
+# iter_changes tests
+# =============================================================================
+@pytest.mark.unit
+class TestIterChanges:
+    """Tests for the polling change detector."""
+
+    def test_debounces_burst_of_saves(self, tmp_path):
+        """Several quick saves to several files arrive as one change set."""
+        first, second = tmp_path / "a.json", tmp_path / "b.json"
+        _touch(first, "1")
+        _touch(second, "1")
+        stop = threading.Event()
+
+        def edit():
+            time.sleep(0.05)
+            _touch(first, "22")
+            _touch(second, "22")
+            _touch(first, "333")
+
+        threading.Thread(target=edit).start()
+        changes = iter_changes(
+            [first, second], debounce=0.05, interval=0.01, stop=stop, polling=True
+        )
+        assert next(changes) == {first.resolve(), second.resolve()}
+        stop.set()
+
+    def test_detects_deleted_file(self, tmp_path):
+        """Removing a watched file counts as a change."""
+        path = tmp_path / "a.json"
+        _touch(path, "1")
+        threading.Timer(0.05, path.unlink).start()
+        changes = iter_changes([path], debounce=0.02, interval=0.01, polling=True)
+        assert next(changes) == {path.resolve()}
+
+    def test_stops_on_event(self, tmp_path):
+        """Setting the stop event ends the iteration."""
+        path = tmp_path / "a.json"
+        _touch(path, "1")
+        stop = threading.Event()
+        threading.Timer(0.05, stop.set).start()
+        assert list(iter_changes([path], interval=0.01, stop=stop, polling=True)) == []
+
+
+# =============================================================================
+# WatchSession tests
+# =============================================================================
+@pytest.mark.unit
+class TestWatchSession:
+    """Tests for WatchSession."""
+
+    def test_data_change_affects_one_document(self, tmp_template_dir, documents):
+        """Only the document whose data changed is rebuilt."""
+        session = WatchSession(tmp_template_dir, documents)
+        changed = {documents[1][0].resolve()}
+        assert session.affected(changed) == [session.documents[1]]
+
+    def test_template_change_affects_all(self, tmp_template_dir, documents):
+        """Template, schema and .sty changes rebuild every document."""
+        session = WatchSession(tmp_template_dir, documents)
+        for name in ("template.tex.j2", "schema.json", "test_template.sty"):
+            changed = {(tmp_template_dir / name).resolve()}
+            assert session.affected(changed) == session.documents
+
+    def test_unrelated_change_affects_nothing(
+        self, tmp_template_dir, documents, tmp_path
+    ):
+        """Files outside the inputs do not trigger rebuilds."""
+        session = WatchSession(tmp_template_dir, documents)
+        assert session.affected({(tmp_path / "notes.txt").resolve()}) == []
+
+    def test_watched_paths(self, tmp_template_dir, documents):
+        """Data files and template inputs are watched."""
+        session = WatchSession(tmp_template_dir, documents)
+        names = {path.name for path in session.watched_paths()}
+        assert names == {
+            "alice.json",
+            "bob.json",
+            "template.tex.j2",
+            "schema.json",
+            "test_template.sty",
+        }
+
+    def test_rebuild_reports_unchanged(self, tmp_template_dir, documents, capsys):
+        """A second rebuild of the same inputs rewrites nothing."""
+        session = WatchSession(tmp_template_dir, documents)
+        assert len(session.rebuild(documents)) == 2
+        assert session.rebuild(documents) == []
+        assert "unchanged" in capsys.readouterr().out
+
+    def test_invalid_data_keeps_watching(self, tmp_template_dir, documents, capsys):
+        """Broken data is reported without stopping the session."""
+        _touch(documents[0][0], "{not json")
+        session = WatchSession(tmp_template_dir, documents)
+        written = session.rebuild(documents)
+        assert written == [documents[1][1]]
+        assert "✗" in capsys.readouterr().out
+
+    def test_run_rebuilds_on_change(self, tmp_template_dir, documents):
+        """The session renders once, then again after a data change."""
+        session = WatchSession(tmp_template_dir, documents)
+        stop = threading.Event()
+        rebuilt = []
+        original = session.rebuild
+
+        def rebuild(docs):
+            rebuilt.append([data.name for data, _ in docs])
+            result = original(docs)
+            if len(rebuilt) == 2:
+                stop.set()
+            return result
+
+        session.rebuild = rebuild
+        data = json.loads(documents[0][0].read_text())
+        data["experience"][0]["title"] = "Principal Engineer"
+
+        def edit():
+            time.sleep(0.3)
+            _touch(documents[0][0], json.dumps(data))
+
+        threading.Thread(target=edit).start()
+        session.run(debounce=0.02, interval=0.01, stop=stop, polling=True)
+
+        assert rebuilt == [["alice.json", "bob.json"], ["alice.json"]]
+        assert "Principal Engineer" in documents[0][1].read_text()
+
+    def test_newer_save_cancels_compile(
+        self, tmp_template_dir, documents, monkeypatch
+    ):
+        """A new compile cancels the running one and requeues its document."""
+        calls = []
+        started = threading.Event()
+
+        def fake_compile(tex_file, template_dir, max_passes, fmt, keep_log, cancel):
+            calls.append(tex_file.name)
+            if len(calls) == 1:
+                started.set()
+                cancel.wait(5)
+                return CompileResult(tex_file=tex_file, cancelled=True)
+            return CompileResult(tex_file=tex_file, pdf_file=tex_file)
+
+        monkeypatch.setattr(watch, "compile_job", fake_compile)
+        session = WatchSession(tmp_template_dir, documents, compile=True)
+        session.start_compile([Path("alice.tex")])
+        started.wait(5)
+        session.start_compile([Path("bob.tex")])
+        session._compile_thread.join(5)
+
+        assert calls == ["alice.tex", "alice.tex", "bob.tex"]
+
+
+# =============================================================================
+# Cancellable pdflatex tests
+# =============================================================================
+class _FakePopen:
+    """Popen stand-in for a pdflatex run that never finishes on its own."""
+
+    instances: list["_FakePopen"] = []
+
+    def __init__(self, cmd, **kwargs):
+        self.killed = False
+        self.returncode = None
+        _FakePopen.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def communicate(self, timeout=None):
+        if not self.killed and timeout is not None:
+            raise subprocess.TimeoutExpired("pdflatex", timeout)
+        return "", ""
+
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+
+
+@pytest.mark.unit
+class TestCancelCompile:
+    """Tests for run_pdflatex's cancel event."""
+
+    def test_cancel_kills_pdflatex(self, tmp_path, tmp_template_dir, monkeypatch):
+        """Setting the event kills the process and reports a cancellation."""
+        _FakePopen.instances = []
+        monkeypatch.setattr(subprocess, "Popen", _FakePopen)
+        tex_file = tmp_path / "cv.tex"
+        tex_file.write_text("x")
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+
+        result = run_pdflatex(tex_file, tmp_template_dir, cancel=cancel)
+
+        assert result.cancelled
+        assert not result.ok
+        assert _FakePopen.instances[0].killed
+        assert not tex_file.with_suffix(".pdf").exists()
+
+    def test_uncancelled_run_completes(
+        self, tmp_path, tmp_template_dir, monkeypatch
+    ):
+        """With an unset event the compile finishes normally."""
+
+        class Finishing(_FakePopen):
+            def __init__(self, cmd, **kwargs):
+                super().__init__(cmd, **kwargs)
+                out_dir = Path(cmd[cmd.index("-output-directory") + 1])
+                (out_dir / "cv.pdf").write_bytes(b"%PDF")
+                self.returncode = 0
+
+            def communicate(self, timeout=None):
+                return "", ""
+
+        monkeypatch.setattr(subprocess, "Popen", Finishing)
+        tex_file = tmp_path / "cv.tex"
+        tex_file.write_text("x")
+
+        result = run_pdflatex(tex_file, tmp_template_dir, cancel=threading.Event())
+
+        assert result.ok
+        assert tex_file.with_suffix(".pdf").read_bytes() == b"%PDF"
+
+
+# =============================================================================
+# CLI tests
+# =============================================================================
+@pytest.mark.unit
+class TestWatchCli:
+    """Tests for ``cv-build --watch``."""
+
+    def test_watch_flag_starts_session(
+        self, tmp_template_dir, tmp_data_dir, monkeypatch, capsys
+    ):
+        """--watch runs a session for the data file and stops on Ctrl+C."""
+        sessions = []
+
+        def run(self):
+            sessions.append(self)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(WatchSession, "run", run)
+        with patch(
+            "cv_builder.cli.get_package_templates_dir",
+            return_value=tmp_template_dir.parent,
+        ):
+            main(
+                [
+                    "--template",
+                    "test_template",
+                    "--data",
+                    str(tmp_data_dir.parent),
+                    "--watch",
+                ]
+            )
+
+        (session,) = sessions
+        assert [d.name for d, _ in session.documents] == ["test_template.json"]
+        assert "Stopped watching" in capsys.readouterr().out